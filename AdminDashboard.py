@@ -1,66 +1,30 @@
+import os
 import sys
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QApplication, QFrame
+    QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QApplication, QFrame,
+    QComboBox
 )
 from PyQt6.QtGui import QFont, QIcon, QPixmap
 from PyQt6.QtCore import Qt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import mysql.connector
-from db import kuha_databse
-
-
-class SalesBarGraph(FigureCanvas):
-    def __init__(self):
-        self.fig = Figure(facecolor="#121212")
-        super().__init__(self.fig)
-        self.ax = self.fig.add_subplot(111)
-        self.fig.subplots_adjust(bottom=0.25)
-        self.load_data()
-
-    def load_data(self):
-        """Fetch total sales per menu item from database."""
-        try:
-            db = kuha_databse()
-            cursor = db.cursor()
-
-            query = """
-                SELECT m.name, SUM(oi.quantity * m.price) AS total_sales
-                FROM order_items oi
-                JOIN menu_items m ON oi.item_id = m.item_id
-                JOIN orders o ON oi.order_id = o.order_id
-                WHERE o.status != 'Cancelled'
-                GROUP BY m.name
-                ORDER BY total_sales DESC
-            """
-            cursor.execute(query)
-            results = cursor.fetchall()
-
-            if results:
-                items = [row[0] for row in results]
-                totals = [float(row[1]) for row in results]
-
-                self.ax.bar(items, totals, color="#4CAF50")
-                self.ax.set_facecolor("#1E1E1E")
-                self.ax.set_title("Total Sales per Menu Item", color="white", fontsize=16, pad=20)
-                self.ax.set_xlabel("Menu Items", color="white", fontsize=12)
-                self.ax.set_ylabel("Total Sales (₱)", color="white", fontsize=12)
-                self.ax.tick_params(axis='x', rotation=25, colors='white')
-                self.ax.tick_params(axis='y', colors='white')
-
-                for spine in self.ax.spines.values():
-                    spine.set_color("white")
-
-                self.fig.tight_layout()
-            else:
-                self.ax.text(0.5, 0.5, "No sales data found",
-                            color="white", ha="center", va="center", fontsize=14)
-
-            cursor.close()
-            db.close()
-
-        except mysql.connector.Error as err:
-            print("Database Error:", err)
+from sales_analytics import RANGES, HOURLY_DAYS
+from dashboard_service import dashboard_service
+from charts import SalesBarChart, SalesTrendChart
+from main_window import logo_pixmap, navigate, logout
+
+# FOODIE_CHARTS=matplotlib draws the dashboard with matplotlib instead
+CHART_RENDERER = os.environ.get("FOODIE_CHARTS", "native")
+
+# Headline figures: shown as KPI cards and selectable for the trend chart
+KPIS = (("revenue", "Revenue"), ("orders", "Orders"), ("average_ticket", "Average Ticket"))
+
+
+def chart_classes():
+    """(bar chart, trend chart) classes for the configured renderer."""
+    if CHART_RENDERER == "matplotlib":
+        # Imported only here so the default dashboard never loads matplotlib
+        from mpl_charts import SalesBarGraph, SalesTrendGraph
+        return SalesBarGraph, SalesTrendGraph
+    return SalesBarChart, SalesTrendChart
 
 
 class AdminDashboard(QWidget):
@@ -68,10 +32,7 @@ class AdminDashboard(QWidget):
         super().__init__()
         self.user_data = user_data
         self.setWindowTitle("Admin Dashboard")
-        self.setGeometry(0, 0, 1920, 1080)
-        self.showMaximized()
         self.setStyleSheet("background-color: #121212;")
-        self.setWindowIcon(QIcon('Logo (2).png'))
 
         # === Main Layout ===
         main_layout = QHBoxLayout(self)
@@ -88,9 +49,7 @@ class AdminDashboard(QWidget):
 
         # Logo
         logo = QLabel()
-        pixmap = QPixmap("Logo (2).png")
-        pixmap = pixmap.scaled(210, 190, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        logo.setPixmap(pixmap)
+        logo.setPixmap(logo_pixmap(210, 190))
         logo.setAlignment(Qt.AlignmentFlag.AlignCenter)
         sidebar.addWidget(logo)
 
@@ -181,28 +140,132 @@ class AdminDashboard(QWidget):
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         content_layout.addWidget(title)
 
-        # Add the Bar Graph
-        chart = SalesBarGraph()
-        content_layout.addWidget(chart)
+        # === Range and granularity ===
+        control_style = """
+            QComboBox {
+                background-color: #2C2C2C;
+                color: white;
+                border-radius: 8px;
+                padding: 8px 12px;
+                font-size: 16px;
+            }
+        """
+        controls = QHBoxLayout()
+        self.range_select = QComboBox()
+        for label, days in RANGES.items():
+            self.range_select.addItem(label, days)
+        self.range_select.setCurrentIndex(1)
+        self.range_select.setStyleSheet(control_style)
+        self.range_select.currentIndexChanged.connect(self.load_analytics)
+
+        self.granularity_select = QComboBox()
+        for label, freq in (("Hourly", "hour"), ("Daily", "day"), ("Weekly", "week")):
+            self.granularity_select.addItem(label, freq)
+        self.granularity_select.setCurrentIndex(1)
+        self.granularity_select.setStyleSheet(control_style)
+        self.granularity_select.currentIndexChanged.connect(self.update_views)
+
+        self.metric_select = QComboBox()
+        for key, caption in KPIS:
+            self.metric_select.addItem(caption, key)
+        self.metric_select.setStyleSheet(control_style)
+        self.metric_select.currentIndexChanged.connect(self.update_views)
+
+        controls.addWidget(self.range_select)
+        controls.addWidget(self.granularity_select)
+        controls.addWidget(self.metric_select)
+        controls.addStretch()
+        content_layout.addLayout(controls)
+
+        # === KPIs ===
+        kpi_layout = QHBoxLayout()
+        self.kpi_labels = {}
+        for key, caption in KPIS:
+            label = QLabel(f"{caption}\n—")
+            label.setFont(QFont("Arial", 18, QFont.Weight.Bold))
+            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            label.setStyleSheet("color: white; background-color: #1E1E1E; border-radius: 12px; padding: 15px;")
+            kpi_layout.addWidget(label)
+            self.kpi_labels[key] = (label, caption)
+        content_layout.addLayout(kpi_layout)
+
+        # Add the Graphs
+        bar_chart_class, trend_chart_class = chart_classes()
+        self.trend_chart = trend_chart_class()
+        content_layout.addWidget(self.trend_chart)
+        self.chart = bar_chart_class()
+        content_layout.addWidget(self.chart)
+
+        self.snapshot = None
+        self.service = dashboard_service()
+        self.service.snapshot_ready.connect(self.on_snapshot)
+        self.service.refresh_failed.connect(self.on_load_failed)
+        self.load_analytics()
 
         main_layout.addWidget(content_area)
     
+    def refresh(self):
+        self.load_analytics()
+
+    # Refresh on the service timer only while this page is on screen
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.service.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.service.stop()
+
+    # --- Analytics ---
+    def load_analytics(self):
+        """Show the last snapshot for the selected range right away; the
+        service recomputes it in the background when it is stale."""
+        self.snapshot = self.service.request(self.range_select.currentData())
+        if self.snapshot is None:
+            self.chart.show_message("Loading sales data...")
+            self.trend_chart.show_message("Loading sales data...")
+        self.update_views()
+
+    def on_snapshot(self, snapshot):
+        if snapshot.key == self.range_select.currentData():
+            self.snapshot = snapshot
+            self.update_views()
+
+    def update_views(self):
+        snapshot = self.snapshot
+        if snapshot is None:
+            return
+        freq = self.granularity_select.currentData()
+        kpis = snapshot.kpis
+        values = {
+            "revenue": f"₱{kpis['revenue']:,.2f}",
+            "orders": f"{kpis['orders']:,}",
+            "average_ticket": f"₱{kpis['average_ticket']:,.2f}",
+        }
+        for key, (label, caption) in self.kpi_labels.items():
+            label.setText(f"{caption}\n{values[key]}")
+
+        if freq in snapshot.trends:
+            buckets, series = snapshot.trends[freq]
+            metric = self.metric_select.currentData()
+            self.trend_chart.plot_trend(buckets, series[metric], freq, self.metric_select.currentText())
+        else:
+            self.trend_chart.show_message(f"The hourly view covers ranges of up to {HOURLY_DAYS} days")
+        self.chart.plot_sales(snapshot.items)
+
+    def on_load_failed(self, err):
+        print("Database Error:", err)
+        if self.snapshot is None:
+            self.chart.show_message("Could not load sales data")
+            self.trend_chart.show_message("")
+
     def logout(self):
-        from login import Login
-        self.login = Login()
-        self.login.showMaximized()
-        self.close()
+        logout(self)
     
     def open_manage_orders(self):
-        from ManageOrders import ManageOrders
-        self.manage_orders = ManageOrders(self.user_data)
-        self.manage_orders.showMaximized()
-        self.close()
+        navigate(self, "manage_orders")
     
     def open_manage_menu(self):
-        from ManageMenu import ManageMenu
-        self.manage_menu = ManageMenu(self.user_data)
-        self.manage_menu.showMaximized()
-        self.close()
+        navigate(self, "manage_menu")
     
 
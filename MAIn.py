@@ -1,11 +1,10 @@
 import sys
-from mysql.connector import Error
 from PyQt6.QtWidgets import (
-    QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout
+    QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QMessageBox
 )
 from PyQt6.QtGui import QFont, QPixmap, QCursor, QIcon
 from PyQt6.QtCore import Qt
-from db import kuha_databse
+from main_window import logo_pixmap, navigate
 
 
 class WelcomePage(QWidget):
@@ -13,9 +12,6 @@ class WelcomePage(QWidget):
         super().__init__()
         self.user_data = user_data
         self.setWindowTitle("Food Ordering System")
-        self.setGeometry(0, 0, 1920, 1080)
-        self.showMaximized()
-        self.setWindowIcon(QIcon('Logo (2).png'))
 
         # --- Full Dark Background ---
         self.setStyleSheet("background-color: #2C0B0E;")  # deep red-black
@@ -43,9 +39,7 @@ class WelcomePage(QWidget):
 
         # Logo
         logo = QLabel()
-        pixmap = QPixmap("Logo (2).png")
-        pixmap = pixmap.scaled(300, 300, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        logo.setPixmap(pixmap)
+        logo.setPixmap(logo_pixmap(300, 300))
 
         # Title Texts
         title_layout = QVBoxLayout()
@@ -129,20 +123,26 @@ class WelcomePage(QWidget):
         self.setLayout(main_layout)
 
     def open_login(self):
-        from login import Login
-        self.login_window = Login()
-        self.login_window.showMaximized()
-        self.close()
+        navigate(self, "login")
 
     def open_register(self):
-        from register import Register
-        self.register_window = Register()
-        self.register_window.showMaximized()
-        self.close()
+        navigate(self, "register")
 
 
 if __name__ == "__main__":
+    from main_window import MainWindow
+    from db import Error
+    import migrations
     app = QApplication(sys.argv)
-    window = WelcomePage()
-    window.show()
+
+    # --- Bring the database schema up to date before any page queries it ---
+    try:
+        migrations.check_at_startup()
+    except Error as err:
+        QMessageBox.critical(None, "Database Error", f"Could not update the database:\n{err}")
+        sys.exit(1)
+
+    window = MainWindow()
+    window.show_page("welcome")
+    window.showMaximized()
     sys.exit(app.exec())
@@ -1,13 +1,160 @@
 import sys
+from bisect import bisect_left
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout,
-    QTableWidget, QTableWidgetItem, QMessageBox, QHeaderView,
-    QDialog, QFormLayout, QLineEdit, QDoubleSpinBox, QComboBox, QDialogButtonBox
+    QTableView, QMessageBox, QHeaderView, QStyledItemDelegate, QStyle,
+    QDialog, QFormLayout, QLineEdit, QDoubleSpinBox, QComboBox, QDialogButtonBox,
+    QFileDialog
 )
-from PyQt6.QtGui import QFont, QIcon, QPixmap
-from PyQt6.QtCore import Qt
-import mysql.connector
-from db import kuha_databse
+from PyQt6.QtGui import QFont, QIcon, QPixmap, QColor, QPainter
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect, QEvent, pyqtSignal
+from services import menu_service
+from workers import run_query
+from main_window import logo_pixmap, navigate, logout
+
+MENU_CATEGORIES = ["Drinks", "Snacks", "Meals", "Desserts"]
+
+
+class MenuTableModel(QAbstractTableModel):
+    """Holds (item_id, name, category, price) rows for the menu table."""
+
+    HEADERS = ["ID", "Name", "Category", "Price", "Actions"]
+    ACTIONS_COLUMN = 4
+    ItemRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self):
+        super().__init__()
+        self.items = []
+        self.ids = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self.items[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole and column < self.ACTIONS_COLUMN:
+            if column == 3:
+                return f"{float(item[3]):.2f}"
+            return str(item[column])
+        if role == self.ItemRole:
+            return item
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def set_items(self, items):
+        self.beginResetModel()
+        self.items = list(items)
+        self.ids = [item[0] for item in self.items]
+        self.endResetModel()
+
+    # Rows stay sorted by item_id (as the cache returns them), so a single
+    # changed row is found by bisection and patched without a reset
+    def find_row(self, item_id):
+        row = bisect_left(self.ids, item_id)
+        return row if row < len(self.ids) and self.ids[row] == item_id else None
+
+    def item(self, item_id):
+        row = self.find_row(item_id)
+        return None if row is None else self.items[row]
+
+    def upsert_item(self, item):
+        row = self.find_row(item[0])
+        if row is not None:
+            self.items[row] = item
+            self.dataChanged.emit(self.index(row, 0), self.index(row, self.ACTIONS_COLUMN - 1))
+            return
+        row = bisect_left(self.ids, item[0])
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.items.insert(row, item)
+        self.ids.insert(row, item[0])
+        self.endInsertRows()
+
+    def upsert_items(self, items):
+        for item in items:
+            self.upsert_item(item)
+
+    def remove_items(self, item_ids):
+        for item_id in item_ids:
+            self.remove_item(item_id)
+
+    def remove_item(self, item_id):
+        row = self.find_row(item_id)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.items[row]
+        del self.ids[row]
+        self.endRemoveRows()
+
+
+class MenuActionsDelegate(QStyledItemDelegate):
+    """Paints the Edit/Delete buttons of a row and reports clicks on them."""
+
+    edit_clicked = pyqtSignal(object)
+    delete_clicked = pyqtSignal(object)
+
+    BUTTON_SIZE = (110, 40)
+    SPACING = 20
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.button_font = QFont("Arial", 10, QFont.Weight.Bold)
+
+    def button_rects(self, rect):
+        width, height = self.BUTTON_SIZE
+        width = min(width, (rect.width() - 3 * self.SPACING) // 2)
+        left = rect.center().x() - width - self.SPACING // 2
+        top = rect.center().y() - height // 2
+        edit = QRect(left, top, width, height)
+        delete = QRect(left + width + self.SPACING, top, width, height)
+        return edit, delete
+
+    def paint(self, painter, option, index):
+        if index.column() != MenuTableModel.ACTIONS_COLUMN:
+            super().paint(painter, option, index)
+            return
+
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        edit, delete = self.button_rects(option.rect)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(self.button_font)
+        for rect, color, hover_color, text_color, text in (
+            (edit, "#FFC107", "#FFD54F", "black", "✏️ Edit"),
+            (delete, "#F44336", "#E53935", "white", "🗑️ Delete"),
+        ):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(hover_color if hovered else color))
+            painter.drawRoundedRect(rect, 10, 10)
+            painter.setPen(QColor(text_color))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (index.column() == MenuTableModel.ACTIONS_COLUMN
+                and event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton):
+            item = index.data(MenuTableModel.ItemRole)
+            edit, delete = self.button_rects(option.rect)
+            pos = event.position().toPoint()
+            if edit.contains(pos):
+                self.edit_clicked.emit(item[0])
+                return True
+            if delete.contains(pos):
+                self.delete_clicked.emit(item[0])
+                return True
+        return super().editorEvent(event, model, option, index)
 
 
 class ManageMenu(QWidget):
@@ -15,10 +162,7 @@ class ManageMenu(QWidget):
         super().__init__()
         self.user_data = user_data
         self.setWindowTitle("Manage Menu")
-        self.setGeometry(0, 0, 1920, 1080)
-        self.showMaximized()
         self.setStyleSheet("background-color: #121212; color: white;")
-        self.setWindowIcon(QIcon('Logo (2).png'))
         
         main_layout = QHBoxLayout(self)
         main_layout.setSpacing(0)
@@ -34,9 +178,7 @@ class ManageMenu(QWidget):
 
         # Logo
         logo = QLabel()
-        pixmap = QPixmap("Logo (2).png")
-        pixmap = pixmap.scaled(210, 190, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        logo.setPixmap(pixmap)
+        logo.setPixmap(logo_pixmap(210, 190))
         logo.setAlignment(Qt.AlignmentFlag.AlignCenter)
         sidebar.addWidget(logo)
 
@@ -130,14 +272,52 @@ class ManageMenu(QWidget):
         add_btn.setStyleSheet(self.button_style("#4CAF50"))
         add_btn.clicked.connect(self.add_item)
 
+        import_btn = QPushButton("📥 Import")
+        import_btn.setStyleSheet(self.button_style("#2196F3"))
+        import_btn.clicked.connect(self.import_items)
+
+        export_btn = QPushButton("📤 Export")
+        export_btn.setStyleSheet(self.button_style("#607D8B"))
+        export_btn.clicked.connect(self.export_items)
+
         btn_layout.addWidget(add_btn)
+        btn_layout.addWidget(import_btn)
+        btn_layout.addWidget(export_btn)
         content_layout.addLayout(btn_layout)
 
+        # Bulk actions on the selected rows (or a whole category)
+        bulk_layout = QHBoxLayout()
+        price_btn = QPushButton("💲 Adjust Prices")
+        price_btn.setStyleSheet(self.button_style("#FF9800"))
+        price_btn.clicked.connect(self.bulk_price)
+
+        category_btn = QPushButton("🏷️ Change Category")
+        category_btn.setStyleSheet(self.button_style("#9C27B0"))
+        category_btn.clicked.connect(self.bulk_category)
+
+        bulk_delete_btn = QPushButton("🗑️ Delete Selected")
+        bulk_delete_btn.setStyleSheet(self.button_style("#F44336"))
+        bulk_delete_btn.clicked.connect(self.bulk_delete)
+
+        bulk_layout.addWidget(price_btn)
+        bulk_layout.addWidget(category_btn)
+        bulk_layout.addWidget(bulk_delete_btn)
+        content_layout.addLayout(bulk_layout)
+
         # Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
+        self.menu_model = MenuTableModel()
+        self.actions_delegate = MenuActionsDelegate(self)
+        self.actions_delegate.edit_clicked.connect(self.edit_item)
+        self.actions_delegate.delete_clicked.connect(self.delete_item)
+
+        self.table = QTableView()
+        self.table.setModel(self.menu_model)
+        self.table.setItemDelegateForColumn(MenuTableModel.ACTIONS_COLUMN, self.actions_delegate)
+        self.table.setMouseTracking(True)
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableView.SelectionMode.ExtendedSelection)
         self.table.verticalHeader().setDefaultSectionSize(70)
-        self.table.setHorizontalHeaderLabels(["ID", "Name", "Category", "Price", "Actions"])
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.table.setStyleSheet("""
             QHeaderView::section {
@@ -146,18 +326,24 @@ class ManageMenu(QWidget):
                 font-weight: bold;
                 padding: 10px;
             }
-            QTableWidget {
+            QTableView {
                 background-color: #1E1E1E;
                 color: white;
                 font-size: 16px;
                 gridline-color: #333;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #333;
             }
         """)
         self.table.setFixedHeight(700)
         content_layout.addWidget(self.table)
+
+        self.status_label = QLabel("")
+        self.status_label.setFont(QFont("Arial", 16))
+        self.status_label.setStyleSheet("color: #AAAAAA;")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        content_layout.addWidget(self.status_label)
         
         main_layout.addWidget(sidebar_container, 1)
         main_layout.addLayout(content_layout, 3)
@@ -179,127 +365,58 @@ class ManageMenu(QWidget):
             }}
         """
 
+    def refresh(self):
+        self.load_menu_items()
+
     def load_menu_items(self):
         """Load menu items from the database."""
-        try:
-            db = kuha_databse()
-            cursor = db.cursor()
-
-            cursor.execute("SELECT item_id, name, category, price FROM menu_items")
-            results = cursor.fetchall()
-            self.table.setRowCount(0)
-
-            for row_number, row_data in enumerate(results):
-                self.table.insertRow(row_number)
-                for col, data in enumerate(row_data):
-                    self.table.setItem(row_number, col, QTableWidgetItem(str(data)))
-
-                # Add Action Buttons (fixed visibility and size)
-                edit_btn = QPushButton("✏️ Edit")
-                edit_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #FFC107;
-                        color: black;
-                        font-weight: bold;
-                        font-size: 10px;
-                        border-radius: 10px;
-                        padding: 10px 25px;
-                        min-width: 40px;
-                        min-height: 15px;
-                    }
-                    QPushButton:hover {
-                        background-color: #FFD54F;
-                    }
-                """)
-                edit_btn.clicked.connect(lambda _, id=row_data[0]: self.edit_item(id))
-
-                delete_btn = QPushButton("🗑️ Delete")
-                delete_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #F44336;
-                        color: white;
-                        font-weight: bold;
-                        font-size: 10px;
-                        border-radius: 10px;
-                        padding: 10px 25px;
-                        min-width: 40px;
-                        min-height: 15px;
-                    }
-                    QPushButton:hover {
-                        background-color: #E53935;
-                    }
-                """)
-                delete_btn.clicked.connect(lambda _, id=row_data[0]: self.delete_item(id))
-
-                # Layout to hold both buttons
-                action_layout = QHBoxLayout()
-                action_layout.setContentsMargins(5, 5, 5, 5)
-                action_layout.setSpacing(20)
-                action_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                action_layout.addWidget(edit_btn)
-                action_layout.addWidget(delete_btn)
-
-                action_widget = QWidget()
-                action_widget.setLayout(action_layout)
-                action_widget.setStyleSheet("background-color: transparent;")
-                self.table.setCellWidget(row_number, 4, action_widget)
-
-
-            cursor.close()
-            db.close()
-
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Database Error", str(err))
+        self.status_label.setText("Loading menu items...")
+        run_query(menu_service.menu_items, self.show_menu_items,
+                  lambda err: self.on_failed("Database Error", err), owner=self)
+
+    def show_menu_items(self, results):
+        self.status_label.setText("" if results else "No menu items yet.")
+        self.menu_model.set_items(results)
+
+    def on_failed(self, title, err):
+        self.status_label.setText("")
+        QMessageBox.critical(self, title, str(err))
+
+    def save_in_background(self, write, args, apply, title, message):
+        run_query(write,
+                  lambda result: self.on_saved(apply, result, title, message),
+                  lambda err: self.on_failed("Error", err),
+                  *args, owner=self)
+
+    def on_saved(self, apply, result, title, message):
+        apply(result)
+        self.status_label.setText("" if self.menu_model.rowCount() else "No menu items yet.")
+        QMessageBox.information(self, title, message)
+
+    def apply_saved_item(self, item):
+        if item is None:
+            QMessageBox.warning(self, "Not Found", "Menu item not found.")
+            return
+        self.menu_model.upsert_item(item)
 
     def add_item(self):
         dialog = MenuItemDialog()
         if dialog.exec():
             name, category, price = dialog.get_data()
-            try:
-                db = kuha_databse()
-                cursor = db.cursor()
-                cursor.execute(
-                    "INSERT INTO menu_items (name, category, price) VALUES (%s, %s, %s)",
-                    (name, category, price)
-                )
-                db.commit()
-                cursor.close()
-                db.close()
-                QMessageBox.information(self, "Success", "Menu item added successfully.")
-                self.load_menu_items()
-            except mysql.connector.Error as err:
-                QMessageBox.critical(self, "Error", str(err))
+            self.save_in_background(menu_service.add_item, (name, category, price), self.apply_saved_item,
+                                    "Success", "Menu item added successfully.")
 
     def edit_item(self, item_id):
-        try:
-            db = kuha_databse()
-            cursor = db.cursor()
-            cursor.execute("SELECT name, category, price FROM menu_items WHERE item_id = %s", (item_id,))
-            item = cursor.fetchone()
-            cursor.close()
-            db.close()
-
-            if not item:
-                QMessageBox.warning(self, "Not Found", "Menu item not found.")
-                return
-
-            dialog = MenuItemDialog(item[0], item[1], item[2])
-            if dialog.exec():
-                name, category, price = dialog.get_data()
-                db = kuha_databse()
-                cursor = db.cursor()
-                cursor.execute("""
-                    UPDATE menu_items
-                    SET name=%s, category=%s, price=%s
-                    WHERE item_id=%s
-                """, (name, category, price, item_id))
-                db.commit()
-                cursor.close()
-                db.close()
-                QMessageBox.information(self, "Success", "Menu item updated.")
-                self.load_menu_items()
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error", str(err))
+        item = self.menu_model.item(item_id)
+        if item is None:
+            QMessageBox.warning(self, "Not Found", "Menu item not found.")
+            return
+
+        dialog = MenuItemDialog(item[1], item[2], item[3])
+        if dialog.exec():
+            name, category, price = dialog.get_data()
+            self.save_in_background(menu_service.update_item, (item_id, name, category, price), self.apply_saved_item,
+                                    "Success", "Menu item updated.")
 
     def delete_item(self, item_id):
         confirm = QMessageBox.question(
@@ -307,35 +424,100 @@ class ManageMenu(QWidget):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if confirm == QMessageBox.StandardButton.Yes:
-            try:
-                db = kuha_databse()
-                cursor = db.cursor()
-                cursor.execute("DELETE FROM menu_items WHERE item_id = %s", (item_id,))
-                db.commit()
-                cursor.close()
-                db.close()
-                QMessageBox.information(self, "Deleted", "Menu item deleted successfully.")
-                self.load_menu_items()
-            except mysql.connector.Error as err:
-                QMessageBox.critical(self, "Error", str(err))
+            self.save_in_background(menu_service.delete_item, (item_id,), self.menu_model.remove_item,
+                                    "Deleted", "Menu item deleted successfully.")
+
+    # --- Bulk actions ---
+    def selected_ids(self):
+        rows = self.table.selectionModel().selectedRows()
+        return sorted(self.menu_model.items[index.row()][0] for index in rows)
+
+    def bulk_price(self):
+        dialog = BulkPriceDialog(len(self.selected_ids()))
+        if dialog.exec():
+            scope, mode, value = dialog.get_data()
+            self.run_bulk(menu_service.update_prices, (self.bulk_scope(scope), mode, value), "Prices updated")
+
+    def bulk_category(self):
+        dialog = BulkCategoryDialog(len(self.selected_ids()))
+        if dialog.exec():
+            scope, category = dialog.get_data()
+            self.run_bulk(menu_service.move_category, (self.bulk_scope(scope), category), "Category changed")
+
+    def bulk_delete(self):
+        item_ids = self.selected_ids()
+        if not item_ids:
+            QMessageBox.warning(self, "No Selection", "Select the menu items to delete first.")
+            return
+        confirm = QMessageBox.question(
+            self, "Confirm Delete", f"Delete {len(item_ids)} selected menu items?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm == QMessageBox.StandardButton.Yes:
+            self.run_bulk(menu_service.delete_items, (("items", item_ids),), "Deleted")
+
+    def bulk_scope(self, scope):
+        # None means "the selected rows"; otherwise scope is a category name
+        return ("items", self.selected_ids()) if scope is None else ("category", scope)
+
+    def run_bulk(self, write, args, title):
+        scope = args[0]
+        if scope[0] == "items" and not scope[1]:
+            QMessageBox.warning(self, "No Selection", "Select some menu items first.")
+            return
+        self.status_label.setText("Saving changes...")
+        run_query(write, lambda result: self.on_bulk_saved(title, result),
+                  lambda err: self.on_failed("Error", err), *args, owner=self)
+
+    def on_bulk_saved(self, title, result):
+        changed, deleted = result
+        self.menu_model.upsert_items(changed)
+        self.menu_model.remove_items(deleted)
+        self.status_label.setText("" if self.menu_model.rowCount() else "No menu items yet.")
+        count = len(changed) + len(deleted)
+        QMessageBox.information(self, title, f"{count} menu items affected.")
+
+    # --- Import / export ---
+    def import_items(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Menu", "", "Menu files (*.csv *.json *.jsonl)"
+        )
+        if not path:
+            return
+        self.status_label.setText("Importing menu items...")
+        run_query(menu_service.import_file, self.on_imported,
+                  lambda err: self.on_failed("Import Failed", err), path,
+                  owner=self, on_progress=self.on_import_progress)
+
+    def on_import_progress(self, count):
+        self.status_label.setText(f"Imported {count} items...")
+
+    def on_imported(self, count):
+        QMessageBox.information(self, "Import Complete", f"{count} menu items imported.")
+        self.load_menu_items()
+
+    def export_items(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Menu", "menu.csv", "CSV (*.csv);;JSON (*.json);;JSON Lines (*.jsonl)"
+        )
+        if not path:
+            return
+        self.status_label.setText("Exporting menu items...")
+        run_query(menu_service.export_file, self.on_exported,
+                  lambda err: self.on_failed("Export Failed", err), path, owner=self)
+
+    def on_exported(self, count):
+        self.status_label.setText("")
+        QMessageBox.information(self, "Export Complete", f"{count} menu items exported.")
 
     def back_to_dashboard(self):
-        from AdminDashboard import AdminDashboard
-        self.dashboard = AdminDashboard(self.user_data)
-        self.dashboard.showMaximized()
-        self.close()
+        navigate(self, "admin")
     
     def open_manage_orders(self):
-        from ManageOrders import ManageOrders
-        self.manage_orders = ManageOrders(self.user_data)
-        self.manage_orders.showMaximized()
-        self.close()
+        navigate(self, "manage_orders")
     
     def logout(self):
-        from login import Login
-        self.login = Login()
-        self.login.showMaximized()
-        self.close()
+        logout(self)
     
     
 
@@ -350,7 +532,7 @@ class MenuItemDialog(QDialog):
         layout = QFormLayout(self)
         self.name_input = QLineEdit(name)
         self.category_input = QComboBox()
-        self.category_input.addItems(["Drinks", "Snacks", "Meals", "Desserts"])
+        self.category_input.addItems(MENU_CATEGORIES)
         if category:
             index = self.category_input.findText(category)
             if index >= 0:
@@ -377,3 +559,89 @@ class MenuItemDialog(QDialog):
             self.category_input.currentText(),
             self.price_input.value()
         )
+
+
+class BulkPriceDialog(QDialog):
+    MODES = [
+        ("Change by percent", "percent"),
+        ("Change by amount", "amount"),
+        ("Set price to", "set"),
+    ]
+
+    def __init__(self, selected_count):
+        super().__init__()
+        self.setWindowTitle("Adjust Prices")
+        self.setStyleSheet("background-color: #1E1E1E; color: white; font-size: 16px;")
+        self.setFixedWidth(400)
+
+        layout = QFormLayout(self)
+        self.scope_input = scope_combo(selected_count)
+
+        self.mode_input = QComboBox()
+        for label, mode in self.MODES:
+            self.mode_input.addItem(label, mode)
+        self.mode_input.currentIndexChanged.connect(self.update_value_range)
+
+        self.value_input = QDoubleSpinBox()
+        self.value_input.setDecimals(2)
+        self.update_value_range()
+
+        layout.addRow("Apply to:", self.scope_input)
+        layout.addRow("Change:", self.mode_input)
+        layout.addRow("Value:", self.value_input)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def update_value_range(self):
+        mode = self.mode_input.currentData()
+        if mode == "percent":
+            self.value_input.setRange(-100, 1000)
+            self.value_input.setPrefix("")
+            self.value_input.setSuffix(" %")
+        else:
+            self.value_input.setRange(-100000 if mode == "amount" else 0, 100000)
+            self.value_input.setPrefix("₱ ")
+            self.value_input.setSuffix("")
+
+    def get_data(self):
+        return (
+            self.scope_input.currentData(),
+            self.mode_input.currentData(),
+            self.value_input.value()
+        )
+
+
+class BulkCategoryDialog(QDialog):
+    def __init__(self, selected_count):
+        super().__init__()
+        self.setWindowTitle("Change Category")
+        self.setStyleSheet("background-color: #1E1E1E; color: white; font-size: 16px;")
+        self.setFixedWidth(400)
+
+        layout = QFormLayout(self)
+        self.scope_input = scope_combo(selected_count)
+        self.category_input = QComboBox()
+        self.category_input.addItems(MENU_CATEGORIES)
+
+        layout.addRow("Apply to:", self.scope_input)
+        layout.addRow("Move to:", self.category_input)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def get_data(self):
+        return self.scope_input.currentData(), self.category_input.currentText()
+
+
+def scope_combo(selected_count):
+    """Selected rows (data None) or every item of one category (data = name)."""
+    combo = QComboBox()
+    combo.addItem(f"Selected items ({selected_count})", None)
+    for category in MENU_CATEGORIES:
+        combo.addItem(f"All {category}", category)
+    return combo
@@ -1,23 +1,29 @@
 import sys
+from datetime import datetime, timedelta
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QFrame,
-    QTableWidget, QTableWidgetItem, QApplication, QMessageBox, QHeaderView
+    QTableWidget, QTableWidgetItem, QApplication, QMessageBox, QHeaderView,
+    QComboBox, QDateEdit, QCheckBox
 )
 from PyQt6.QtGui import QFont, QIcon, QPixmap
-from PyQt6.QtCore import Qt
-import mysql.connector
-from db import kuha_databse
+from PyQt6.QtCore import Qt, QDate, QTimer
+from workers import run_query
+from services import order_service, ORDER_STATUSES, NEXT_STATUS
+from main_window import logo_pixmap, navigate, logout
 
 
 class ManageOrders(QWidget):
+    PAGE_SIZE = 50
+    LIVE_INTERVAL_MS = 2000
+    # Re-read a little behind the high-water mark so rows committed late
+    # with an older updated_at are not skipped (patching is idempotent)
+    LIVE_OVERLAP = timedelta(seconds=2)
+
     def __init__(self, user_data):
         super().__init__()
         self.user_data = user_data
         self.setWindowTitle("Manage Orders")
-        self.setGeometry(0, 0, 1920, 1080)
-        self.showMaximized()
         self.setStyleSheet("background-color: #121212; color: white;")
-        self.setWindowIcon(QIcon('Logo (2).png'))
 
         main_layout = QHBoxLayout(self)
         main_layout.setSpacing(0)
@@ -32,9 +38,7 @@ class ManageOrders(QWidget):
 
         # Logo
         logo = QLabel()
-        pixmap = QPixmap("Logo (2).png")
-        pixmap = pixmap.scaled(210, 190, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        logo.setPixmap(pixmap)
+        logo.setPixmap(logo_pixmap(210, 190))
         logo.setAlignment(Qt.AlignmentFlag.AlignCenter)
         sidebar.addWidget(logo)
 
@@ -123,6 +127,55 @@ class ManageOrders(QWidget):
         title.setStyleSheet("color: white;")
         content_layout.addWidget(title)
 
+        # === Filters ===
+        control_style = """
+            QComboBox, QDateEdit {
+                background-color: #2C2C2C;
+                color: white;
+                border-radius: 8px;
+                padding: 8px 12px;
+                font-size: 16px;
+            }
+            QCheckBox {
+                font-size: 16px;
+            }
+        """
+        filter_layout = QHBoxLayout()
+
+        self.status_filter = QComboBox()
+        self.status_filter.addItem("All Statuses", None)
+        for status in ORDER_STATUSES:
+            self.status_filter.addItem(status, status)
+        self.status_filter.setStyleSheet(control_style)
+        self.status_filter.currentIndexChanged.connect(self.load_orders)
+
+        self.date_filter = QCheckBox("Date range")
+        self.date_filter.setStyleSheet(control_style)
+        self.date_filter.toggled.connect(self.on_date_filter_toggled)
+
+        self.date_from = QDateEdit(QDate.currentDate().addDays(-7))
+        self.date_to = QDateEdit(QDate.currentDate())
+        for date_edit in (self.date_from, self.date_to):
+            date_edit.setCalendarPopup(True)
+            date_edit.setDisplayFormat("yyyy-MM-dd")
+            date_edit.setStyleSheet(control_style)
+            date_edit.setEnabled(False)
+            date_edit.dateChanged.connect(self.load_orders)
+
+        filter_layout.addWidget(self.status_filter)
+        filter_layout.addSpacing(20)
+        filter_layout.addWidget(self.date_filter)
+        filter_layout.addWidget(self.date_from)
+        filter_layout.addWidget(QLabel("to"))
+        filter_layout.addWidget(self.date_to)
+        filter_layout.addStretch()
+
+        self.live_toggle = QCheckBox("Live updates")
+        self.live_toggle.setStyleSheet(control_style)
+        self.live_toggle.toggled.connect(self.set_live_mode)
+        filter_layout.addWidget(self.live_toggle)
+        content_layout.addLayout(filter_layout)
+
         # === Orders Table ===
         self.orders_table = QTableWidget()
         self.orders_table.setColumnCount(6)
@@ -142,96 +195,300 @@ class ManageOrders(QWidget):
                 padding: 10px;
             }
         """)
+        self.orders_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.orders_table.setSelectionMode(QTableWidget.SelectionMode.ExtendedSelection)
+        self.orders_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         content_layout.addWidget(self.orders_table)
 
+        self.status_label = QLabel("")
+        self.status_label.setFont(QFont("Arial", 16))
+        self.status_label.setStyleSheet("color: #AAAAAA;")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        content_layout.addWidget(self.status_label)
+
+        # === Page Controls ===
+        page_btn_style = """
+            QPushButton {
+                background-color: #2C2C2C;
+                color: white;
+                border-radius: 8px;
+                padding: 10px 25px;
+                font-size: 16px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #3D3D3D;
+            }
+            QPushButton:disabled {
+                color: #666;
+            }
+        """
+        page_layout = QHBoxLayout()
+        self.newer_btn = QPushButton("◀ Newer")
+        self.newer_btn.setStyleSheet(page_btn_style)
+        self.newer_btn.clicked.connect(self.newer_page)
+        self.page_label = QLabel("")
+        self.page_label.setFont(QFont("Arial", 16))
+        self.older_btn = QPushButton("Older ▶")
+        self.older_btn.setStyleSheet(page_btn_style)
+        self.older_btn.clicked.connect(self.older_page)
+        page_layout.addStretch()
+        page_layout.addWidget(self.newer_btn)
+        page_layout.addSpacing(20)
+        page_layout.addWidget(self.page_label)
+        page_layout.addSpacing(20)
+        page_layout.addWidget(self.older_btn)
+        page_layout.addStretch()
+
+        advance_btn = QPushButton("Advance Selected")
+        advance_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #4CAF50;
+                color: white;
+                border-radius: 8px;
+                padding: 10px 25px;
+                font-size: 16px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #45A049;
+            }
+        """)
+        advance_btn.clicked.connect(self.advance_selected)
+        page_layout.addWidget(advance_btn)
+        content_layout.addLayout(page_layout)
+
+        # Keyset cursors: the (order_date, order_id) each visited page starts after
+        self.page_starts = [None]
+        self.last_key = None
+        self.rows = []  # the page currently shown, as fetched
+
+        # Live mode polls for orders whose updated_at passed the high-water mark
+        self.live_since = None
+        self.live_polling = False
+        self.live_timer = QTimer(self)
+        self.live_timer.setInterval(self.LIVE_INTERVAL_MS)
+        self.live_timer.timeout.connect(self.poll_changes)
+
         # Load data
         self.load_orders()
 
         main_layout.addWidget(content_area)
 
+    def refresh(self):
+        self.load_page()
+
     def load_orders(self):
-        """Fetch and display all orders"""
-        try:
-            db = kuha_databse()
-            cursor = db.cursor()
-
-            query = """
-                SELECT o.order_id, c.name, o.order_date, o.status, o.total_amount
-                FROM orders o
-                LEFT JOIN customers c ON o.customer_id = c.customer_id
-                ORDER BY o.order_date DESC
-            """
-            cursor.execute(query)
-            results = cursor.fetchall()
-
-            self.orders_table.setRowCount(0)
-            for row_idx, row_data in enumerate(results):
-                self.orders_table.insertRow(row_idx)
-                for col_idx, value in enumerate(row_data):
-                    item = QTableWidgetItem(str(value))
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    self.orders_table.setItem(row_idx, col_idx, item)
-
-                # Add Update Button
-                update_btn = QPushButton("Update Status")
-                update_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #4CAF50;
-                        color: white;
-                        font-weight: bold;
-                        border-radius: 8px;
-                        padding: 8px;
-                    }
-                    QPushButton:hover {
-                        background-color: #45A049;
-                    }
-                """)
-                update_btn.clicked.connect(lambda _, order_id=row_data[0], status=row_data[3]: self.update_status(order_id, status))
-                self.orders_table.setCellWidget(row_idx, 5, update_btn)
-
-            cursor.close()
-            db.close()
-
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Database Error", f"Error loading orders: {err}")
+        """Show the newest page of orders matching the filters."""
+        self.page_starts = [None]
+        self.load_page()
+
+    def load_page(self):
+        self.status_label.setText("Loading orders...")
+        self.newer_btn.setEnabled(False)
+        self.older_btn.setEnabled(False)
+        # One extra row tells us whether an older page exists
+        run_query(order_service.order_page, self.show_orders, self.on_load_failed,
+                  self.current_filters(), self.page_starts[-1], self.PAGE_SIZE + 1, owner=self)
+
+    def older_page(self):
+        if self.last_key is not None:
+            self.page_starts.append(self.last_key)
+            self.load_page()
+
+    def newer_page(self):
+        if len(self.page_starts) > 1:
+            self.page_starts.pop()
+            self.load_page()
+
+    def on_date_filter_toggled(self, checked):
+        self.date_from.setEnabled(checked)
+        self.date_to.setEnabled(checked)
+        self.load_orders()
+
+    def current_filters(self):
+        filters = {"status": self.status_filter.currentData()}
+        if self.date_filter.isChecked():
+            start = self.date_from.date().toPyDate()
+            end = self.date_to.date().toPyDate()
+            filters["date_from"] = datetime(start.year, start.month, start.day)
+            filters["date_to"] = datetime(end.year, end.month, end.day) + timedelta(days=1)
+        return filters
+
+    def show_orders(self, results):
+        has_older = len(results) > self.PAGE_SIZE
+        self.rows = list(results[:self.PAGE_SIZE])
+        self.last_key = (self.rows[-1][2], self.rows[-1][0]) if has_older else None
+        self.newer_btn.setEnabled(len(self.page_starts) > 1)
+        self.older_btn.setEnabled(has_older)
+        self.page_label.setText(f"Page {len(self.page_starts)}")
+
+        self.status_label.setText("" if self.rows else "No orders found.")
+        self.orders_table.setRowCount(0)
+        for row_idx, row_data in enumerate(self.rows):
+            self.orders_table.insertRow(row_idx)
+            self.set_order_row(row_idx, row_data)
+
+    def set_order_row(self, row_idx, row_data):
+        for col_idx, value in enumerate(row_data[:5]):
+            item = QTableWidgetItem(str(value))
+            item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+            self.orders_table.setItem(row_idx, col_idx, item)
+
+        if self.orders_table.cellWidget(row_idx, 5) is not None:
+            return
+
+        # Add Update Button
+        update_btn = QPushButton("Update Status")
+        update_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #4CAF50;
+                color: white;
+                font-weight: bold;
+                border-radius: 8px;
+                padding: 8px;
+            }
+            QPushButton:hover {
+                background-color: #45A049;
+            }
+        """)
+        update_btn.clicked.connect(lambda _, order_id=row_data[0]: self.update_status(order_id, self.status_of(order_id)))
+        self.orders_table.setCellWidget(row_idx, 5, update_btn)
+
+    def status_of(self, order_id):
+        for row in self.rows:
+            if row[0] == order_id:
+                return row[3]
+        return None
+
+    # --- Live updates ---
+    def set_live_mode(self, enabled):
+        if enabled:
+            self.live_since = None
+            run_query(order_service.high_water, self.start_live, self.on_live_failed, owner=self)
+        else:
+            self.live_timer.stop()
+
+    def start_live(self, since):
+        self.live_since = since
+        if self.live_toggle.isChecked():
+            self.live_timer.start()
+
+    def poll_changes(self):
+        # Cached pages stay alive while hidden; only poll the one on screen
+        if self.live_polling or not self.isVisible():
+            return
+        self.live_polling = True
+        run_query(order_service.changes_since, self.apply_changes, self.on_live_failed,
+                  self.live_since - self.LIVE_OVERLAP, owner=self)
+
+    def apply_changes(self, changes):
+        self.live_polling = False
+        if not changes:
+            return
+        self.live_since = max(self.live_since, max(row[5] for row in changes))
+
+        self.patch_rows([tuple(row[:5]) for row in changes])
+
+    def patch_rows(self, changes):
+        """Apply changed order rows to the page without reloading it."""
+        filters = self.current_filters()
+        on_first_page = len(self.page_starts) == 1
+        for row in changes:
+            idx = next((i for i, r in enumerate(self.rows) if r[0] == row[0]), None)
+            if not self.matches_filters(row, filters):
+                if idx is not None:
+                    self.rows.pop(idx)
+                    self.orders_table.removeRow(idx)
+            elif idx is not None:
+                self.rows[idx] = row
+                self.set_order_row(idx, row)
+            elif on_first_page:
+                self.insert_new_row(row)
+        self.status_label.setText("" if self.rows else "No orders found.")
 
+    def insert_new_row(self, row):
+        key = (row[2], row[0])
+        pos = next((i for i, r in enumerate(self.rows) if (r[2], r[0]) < key), len(self.rows))
+        if pos >= self.PAGE_SIZE or (pos == len(self.rows) and self.last_key is not None):
+            return  # belongs on an older page
+        self.rows.insert(pos, row)
+        self.orders_table.insertRow(pos)
+        self.set_order_row(pos, row)
+
+        if len(self.rows) > self.PAGE_SIZE:
+            self.rows.pop()
+            self.orders_table.removeRow(self.PAGE_SIZE)
+            self.last_key = (self.rows[-1][2], self.rows[-1][0])
+            self.older_btn.setEnabled(True)
+
+    @staticmethod
+    def matches_filters(row, filters):
+        if filters.get("status") and row[3] != filters["status"]:
+            return False
+        if filters.get("date_from") and not (filters["date_from"] <= row[2] < filters["date_to"]):
+            return False
+        return True
+
+    def on_live_failed(self, err):
+        self.live_polling = False
+        print("Live update failed:", err)
+
+    def on_load_failed(self, err):
+        self.status_label.setText("")
+        self.newer_btn.setEnabled(len(self.page_starts) > 1)
+        QMessageBox.critical(self, "Database Error", f"Error loading orders: {err}")
+
+    # --- Status changes ---
     def update_status(self, order_id, current_status):
-        """Cycle through Pending → Preparing → Completed"""
-        next_status = {
-            "Pending": "Preparing",
-            "Preparing": "Completed",
-            "Completed": "Completed",
-            "Cancelled": "Cancelled"
-        }.get(current_status, "Pending")
-
-        try:
-            db = kuha_databse()
-            cursor = db.cursor()
-            cursor.execute("UPDATE orders SET status = %s WHERE order_id = %s", (next_status, order_id))
-            db.commit()
-            cursor.close()
-            db.close()
-
-            QMessageBox.information(self, "Success", f"Order #{order_id} updated to '{next_status}'.")
-            self.load_orders()
-
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error", f"Failed to update order: {err}")
+        """Advance one order: Pending → Preparing → Completed"""
+        self.advance_orders([(order_id, current_status)])
+
+    def advance_selected(self):
+        rows = sorted({index.row() for index in self.orders_table.selectionModel().selectedRows()})
+        if not rows:
+            QMessageBox.warning(self, "No Selection", "Select the orders to advance first.")
+            return
+        self.advance_orders([(self.rows[r][0], self.rows[r][3]) for r in rows])
+
+    def advance_orders(self, orders):
+        """Move each order one step on from the status this page shows for it."""
+        transitions = {}
+        for order_id, status in orders:
+            if status in NEXT_STATUS:
+                transitions.setdefault((status, NEXT_STATUS[status]), []).append(order_id)
+        if not transitions:
+            QMessageBox.information(self, "Nothing to Update", "The selected orders are already finished.")
+            return
+
+        run_query(
+            order_service.set_statuses,
+            self.on_status_saved,
+            lambda err: QMessageBox.critical(self, "Error", f"Failed to update order: {err}"),
+            [(expected, new, ids) for (expected, new), ids in transitions.items()],
+            owner=self,
+        )
+
+    def on_status_saved(self, result):
+        updated, requested, rows = result
+        self.patch_rows(rows)
+        if requested == 1 and updated == 1:
+            order_id, status = rows[0][0], rows[0][3]
+            QMessageBox.information(self, "Success", f"Order #{order_id} updated to '{status}'.")
+        elif updated == requested:
+            QMessageBox.information(self, "Success", f"{updated} orders updated.")
+        else:
+            QMessageBox.warning(
+                self, "Some Orders Changed",
+                f"{updated} of {requested} orders updated. The rest were changed "
+                "from another terminal and now show their current status."
+            )
 
     def logout(self):
-        from login import Login
-        self.login = Login()
-        self.login.showMaximized()
-        self.close()
+        logout(self)
 
     def open_dashboard(self):
-        from AdminDashboard import AdminDashboard
-        self.dashboard = AdminDashboard(self.user_data)
-        self.dashboard.showMaximized()
-        self.close()
+        navigate(self, "admin")
     
     def open_manage_menu(self):
-        from ManageMenu import ManageMenu
-        self.manage_menu = ManageMenu(self.user_data)
-        self.manage_menu.showMaximized()
-        self.close()
+        navigate(self, "manage_menu")
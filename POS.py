@@ -1,13 +1,111 @@
 import sys
-from mysql.connector import Error
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
     QGridLayout, QLineEdit, QScrollArea, QFrame, QSpacerItem, QSizePolicy,
-    QDialog, QFormLayout, QSpinBox, QMessageBox
+    QDialog, QFormLayout, QSpinBox, QMessageBox, QListView, QStyledItemDelegate,
+    QStyle, QComboBox
 )
-from PyQt6.QtGui import QFont, QPixmap, QIcon
-from PyQt6.QtCore import Qt
-from db import kuha_databse
+from PyQt6.QtGui import QFont, QPixmap, QIcon, QColor, QPainter
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QRect, QEvent, QTimer, pyqtSignal
+from services import menu_service, order_service
+from workers import run_query
+from menu_search import MenuSearchIndex
+from main_window import logo_pixmap, navigate, logout
+
+
+class MenuGridModel(QAbstractListModel):
+    """Holds (item_id, name, price, category) rows for the product grid."""
+
+    ItemRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self):
+        super().__init__()
+        self.items = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self.items[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return item[1]
+        if role == self.ItemRole:
+            return item
+        return None
+
+    def set_items(self, items):
+        # Rebinding the rows is all a search needs; the view repaints visible cells only
+        self.beginResetModel()
+        self.items = list(items)
+        self.endResetModel()
+
+
+class MenuCardDelegate(QStyledItemDelegate):
+    """Paints a menu card per cell and reports clicks on its button."""
+
+    add_clicked = pyqtSignal(object)
+
+    CARD_SIZE = QSize(300, 210)
+    MARGIN = 12
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_font = QFont("Arial", 18, QFont.Weight.Bold)
+        self.price_font = QFont("Arial", 16)
+        self.button_font = QFont("Arial", 12)
+
+    def sizeHint(self, option, index):
+        return self.CARD_SIZE
+
+    def card_rect(self, rect):
+        return rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+
+    def button_rect(self, rect):
+        card = self.card_rect(rect)
+        return QRect(card.left() + 20, card.bottom() - 60, card.width() - 40, 44)
+
+    def paint(self, painter, option, index):
+        item = index.data(MenuGridModel.ItemRole)
+        if item is None:
+            return
+        name, price = item[1], item[2]
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+
+        card = self.card_rect(option.rect)
+        painter.setBrush(QColor("#262626" if hovered else "#1E1E1E"))
+        painter.drawRoundedRect(card, 15, 15)
+
+        painter.setPen(QColor("white"))
+        painter.setFont(self.name_font)
+        name_rect = QRect(card.left() + 10, card.top() + 15, card.width() - 20, 50)
+        painter.drawText(name_rect, Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap, name)
+
+        painter.setFont(self.price_font)
+        price_rect = QRect(card.left() + 10, card.top() + 70, card.width() - 20, 30)
+        painter.drawText(price_rect, Qt.AlignmentFlag.AlignCenter, f"₱{price:.2f}")
+
+        button = self.button_rect(option.rect)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("#4A4A4A" if hovered else "#3A3A3A"))
+        painter.drawRoundedRect(button, 8, 8)
+        painter.setPen(QColor("white"))
+        painter.setFont(self.button_font)
+        painter.drawText(button, Qt.AlignmentFlag.AlignCenter, "Add to Cart")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and self.button_rect(option.rect).contains(event.position().toPoint())):
+            self.add_clicked.emit(index.data(MenuGridModel.ItemRole))
+            return True
+        return super().editorEvent(event, model, option, index)
 
 
 class POSPage(QWidget):
@@ -15,9 +113,6 @@ class POSPage(QWidget):
         super().__init__()
         self.user_data = user_data
         self.setWindowTitle("Point of Sale - Food Ordering System")
-        self.setGeometry(0, 0, 1920, 1080)
-        self.showMaximized()
-        self.setWindowIcon(QIcon('Logo (2).png'))
         self.setStyleSheet("background-color: #121212; color: white;")
 
         # --- Main Layout ---
@@ -33,9 +128,7 @@ class POSPage(QWidget):
 
         # Logo
         logo = QLabel()
-        pixmap = QPixmap("Logo (2).png")
-        pixmap = pixmap.scaled(210, 190, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        logo.setPixmap(pixmap)
+        logo.setPixmap(logo_pixmap(210, 190))
         logo.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         # Button Styles
@@ -126,95 +219,257 @@ class POSPage(QWidget):
                 padding: 12px 20px;
             }
         """)
-        self.search_bar.textChanged.connect(self.filter_items)
-        content_layout.addWidget(self.search_bar)
-
-        # Scroll area for menu items
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setStyleSheet("background-color: transparent; border: none;")
-        self.product_container = QWidget()
-        self.grid_layout = QGridLayout(self.product_container)
-        self.grid_layout.setSpacing(25)
-        scroll_area.setWidget(self.product_container)
-        content_layout.addWidget(scroll_area)
+        # Wait for a pause in typing before searching
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(120)
+        self.search_timer.timeout.connect(self.apply_filter)
+        self.search_bar.textChanged.connect(self.search_timer.start)
+        self.search_bar.returnPressed.connect(self.apply_filter)
+
+        self.category_filter = QComboBox()
+        self.category_filter.setFont(QFont("Arial", 14))
+        self.category_filter.setStyleSheet("""
+            QComboBox {
+                background-color: #2C2C2C;
+                color: white;
+                border-radius: 15px;
+                padding: 12px 20px;
+                min-width: 220px;
+            }
+        """)
+        self.category_filter.currentIndexChanged.connect(self.apply_filter)
+
+        search_row = QHBoxLayout()
+        search_row.addWidget(self.search_bar, 1)
+        search_row.addWidget(self.category_filter)
+        content_layout.addLayout(search_row)
+
+        # Product grid: only visible cards are painted, nothing is rebuilt on search
+        self.grid_placeholder = QLabel()
+        self.grid_placeholder.setFont(QFont("Arial", 18))
+        self.grid_placeholder.setStyleSheet("color: #AAAAAA;")
+        self.grid_placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.grid_placeholder.hide()
+        content_layout.addWidget(self.grid_placeholder)
+
+        self.menu_model = MenuGridModel()
+        self.card_delegate = MenuCardDelegate(self)
+        self.card_delegate.add_clicked.connect(lambda item: self.add_to_cart(*item[:3], 1))
+
+        self.product_view = QListView()
+        self.product_view.setViewMode(QListView.ViewMode.IconMode)
+        self.product_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.product_view.setMovement(QListView.Movement.Static)
+        self.product_view.setUniformItemSizes(True)
+        self.product_view.setGridSize(MenuCardDelegate.CARD_SIZE)
+        self.product_view.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.product_view.setMouseTracking(True)
+        self.product_view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.product_view.setStyleSheet("background-color: transparent; border: none;")
+        self.product_view.setModel(self.menu_model)
+        self.product_view.setItemDelegate(self.card_delegate)
+        content_layout.addWidget(self.product_view)
+
+        # === CART PANEL ===
+        self.cart = {}  # item_id -> [name, price, quantity]
+
+        cart_container = QWidget()
+        cart_container.setStyleSheet("background-color: #1E1E1E;")
+        cart_container.setFixedWidth(450)
+        cart_layout = QVBoxLayout(cart_container)
+        cart_layout.setContentsMargins(30, 50, 30, 50)
+        cart_layout.setSpacing(15)
+
+        cart_title = QLabel("🛒 Cart")
+        cart_title.setFont(QFont("Arial", 24, QFont.Weight.Bold))
+        cart_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        cart_layout.addWidget(cart_title)
+
+        cart_scroll = QScrollArea()
+        cart_scroll.setWidgetResizable(True)
+        cart_scroll.setStyleSheet("background-color: transparent; border: none;")
+        cart_lines_container = QWidget()
+        self.cart_lines = QVBoxLayout(cart_lines_container)
+        self.cart_lines.setAlignment(Qt.AlignmentFlag.AlignTop)
+        self.cart_lines.setSpacing(10)
+        cart_scroll.setWidget(cart_lines_container)
+        cart_layout.addWidget(cart_scroll)
+
+        self.cart_total_label = QLabel()
+        self.cart_total_label.setFont(QFont("Arial", 20, QFont.Weight.Bold))
+        self.cart_total_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        cart_layout.addWidget(self.cart_total_label)
+
+        self.checkout_btn = QPushButton("Checkout")
+        self.checkout_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #007BFF;
+                color: white;
+                border-radius: 10px;
+                padding: 15px;
+                font-size: 18px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #0066CC;
+            }
+            QPushButton:disabled {
+                background-color: #3A3A3A;
+                color: #888;
+            }
+        """)
+        self.checkout_btn.clicked.connect(self.confirm_order)
+        cart_layout.addWidget(self.checkout_btn)
+
+        clear_btn = QPushButton("Clear Cart")
+        clear_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #3A3A3A;
+                color: white;
+                border-radius: 10px;
+                padding: 10px;
+                font-size: 16px;
+            }
+            QPushButton:hover {
+                background-color: #4A4A4A;
+            }
+        """)
+        clear_btn.clicked.connect(self.clear_cart)
+        cart_layout.addWidget(clear_btn)
 
         # Add to main layout
         main_layout.addWidget(sidebar_container, 1)
         main_layout.addLayout(content_layout, 3)
+        main_layout.addWidget(cart_container)
+
+        self.refresh_cart()
 
         # Load items
         self.load_menu_items()
 
+    def refresh(self):
+        # Keep showing the current grid while the cached catalog is checked
+        run_query(self.fetch_menu_items, self.on_menu_loaded, self.on_menu_failed,
+                  self.menu_version, owner=self)
+
     def load_menu_items(self):
-        try:
-            connection = kuha_databse()
-            cursor = connection.cursor()
-            cursor.execute("SELECT item_id, name, price FROM menu_items")
-            self.menu_items = cursor.fetchall()
-        except Exception as e:
-            print("Error loading menu items:", e)
-            self.menu_items = []
-        finally:
-            if connection and connection.is_connected():
-                connection.close()
-        self.display_items(self.menu_items)
+        self.menu_items = []
+        self.menu_version = None
+        self.search_index = MenuSearchIndex([], 1, 3)
+        self.show_placeholder("Loading menu...")
+        run_query(self.fetch_menu_items, self.on_menu_loaded, self.on_menu_failed, owner=self)
+
+    # Runs on a worker thread; indexing a large menu takes too long for the GUI thread
+    def fetch_menu_items(self, known_version=None):
+        """(version, rows, search index), or None if the menu is still at known_version."""
+        version, items = menu_service.menu_catalog()
+        if version == known_version:
+            return None
+        rows = [(item_id, name, price, category) for item_id, name, category, price in items]
+        return version, rows, MenuSearchIndex(rows, 1, 3)
+
+    def on_menu_loaded(self, result):
+        if result is None:
+            return
+        self.menu_version, self.menu_items, self.search_index = result
+        self.update_category_filter()
+        self.apply_filter()
+
+    def on_menu_failed(self, error):
+        print("Error loading menu items:", error)
+        self.show_placeholder("Could not load the menu.")
+
+    def show_placeholder(self, text):
+        self.display_items([])
+        self.grid_placeholder.setText(text)
+        self.grid_placeholder.show()
 
     def display_items(self, items):
-        for i in reversed(range(self.grid_layout.count())):
-            widget = self.grid_layout.itemAt(i).widget()
-            if widget:
-                widget.deleteLater()
-
-        row, col = 0, 0
-        for item_id, name, price in items:
-            card = self.create_item_card(item_id, name, price)
-            self.grid_layout.addWidget(card, row, col)
-            col += 1
-            if col >= 3:
-                col = 0
-                row += 1
-
-    def create_item_card(self, item_id, name, price):
-        card = QFrame()
-        card.setStyleSheet("background-color: #1E1E1E; border-radius: 15px; padding: 15px;")
-        layout = QVBoxLayout(card)
-
-        name_label = QLabel(name)
-        name_label.setFont(QFont("Arial", 18, QFont.Weight.Bold))
-        name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        price_label = QLabel(f"₱{price:.2f}")
-        price_label.setFont(QFont("Arial", 16))
-        price_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.grid_placeholder.hide()
+        self.menu_model.set_items(items)
+
+    # --- Cart ---
+    def add_to_cart(self, item_id, name, price, quantity):
+        line = self.cart.setdefault(item_id, [name, float(price), 0])
+        line[2] = min(line[2] + quantity, 100)
+        self.refresh_cart()
+
+    def set_cart_quantity(self, item_id, quantity):
+        if item_id in self.cart:
+            self.cart[item_id][2] = quantity
+            self.refresh_cart(rebuild=False)
+
+    def remove_from_cart(self, item_id):
+        self.cart.pop(item_id, None)
+        self.refresh_cart()
+
+    def clear_cart(self):
+        self.cart.clear()
+        self.refresh_cart()
+
+    def cart_total(self):
+        return round(sum(price * qty for _, price, qty in self.cart.values()), 2)
+
+    def refresh_cart(self, rebuild=True):
+        if rebuild:
+            for i in reversed(range(self.cart_lines.count())):
+                widget = self.cart_lines.itemAt(i).widget()
+                if widget:
+                    widget.deleteLater()
+
+            for item_id, (name, price, qty) in self.cart.items():
+                self.cart_lines.addWidget(self.create_cart_line(item_id, name, price, qty))
+
+            if not self.cart:
+                empty = QLabel("Your cart is empty.")
+                empty.setFont(QFont("Arial", 14))
+                empty.setStyleSheet("color: #AAAAAA;")
+                empty.setAlignment(Qt.AlignmentFlag.AlignCenter)
+                self.cart_lines.addWidget(empty)
+
+        self.cart_total_label.setText(f"Total: ₱{self.cart_total():.2f}")
+        self.checkout_btn.setEnabled(bool(self.cart))
+
+    def create_cart_line(self, item_id, name, price, qty):
+        line = QFrame()
+        line.setStyleSheet("background-color: #2C2C2C; border-radius: 10px;")
+        layout = QHBoxLayout(line)
+
+        name_label = QLabel(f"{name}\n₱{price:.2f}")
+        name_label.setFont(QFont("Arial", 13))
 
         qty_input = QSpinBox()
         qty_input.setRange(1, 100)
-        qty_input.setStyleSheet("background-color: #2C2C2C; color: white; padding: 5px; border-radius: 5px; width: 60px;")
-        qty_input.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        qty_input.setValue(qty)
+        qty_input.setStyleSheet("background-color: #1E1E1E; color: white; padding: 5px; border-radius: 5px;")
+        qty_input.valueChanged.connect(lambda value: self.set_cart_quantity(item_id, value))
 
-        add_btn = QPushButton("Add Order")
-        add_btn.setStyleSheet("""
+        remove_btn = QPushButton("✕")
+        remove_btn.setFixedWidth(40)
+        remove_btn.setStyleSheet("""
             QPushButton {
-                background-color: #3A3A3A;
+                background-color: #F44336;
                 color: white;
                 border-radius: 8px;
-                padding: 10px;
-                font-size: 16px;
+                padding: 6px;
+                font-weight: bold;
             }
             QPushButton:hover {
-                background-color: #4A4A4A;
+                background-color: #E53935;
             }
         """)
-        add_btn.clicked.connect(lambda: self.confirm_order(item_id, name, price, qty_input.value()))
+        remove_btn.clicked.connect(lambda: self.remove_from_cart(item_id))
 
-        layout.addWidget(name_label)
-        layout.addWidget(price_label)
+        layout.addWidget(name_label, 1)
         layout.addWidget(qty_input)
-        layout.addWidget(add_btn)
-        return card
+        layout.addWidget(remove_btn)
+        return line
+
+    def confirm_order(self):
+        if not self.cart:
+            return
 
-    def confirm_order(self, item_id, name, price, quantity):
         dialog = QDialog(self)
         dialog.setWindowTitle("Payment")
         dialog.setStyleSheet("""
@@ -250,7 +505,7 @@ class POSPage(QWidget):
         form.setSpacing(20)
         form.setContentsMargins(40, 40, 40, 40)
 
-        total_amount = price * quantity
+        total_amount = self.cart_total()
         total_label = QLabel(f"Total: ₱{total_amount:.2f}")
         total_label.setFont(QFont("Arial", 20, QFont.Weight.Bold))
         total_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -260,7 +515,7 @@ class POSPage(QWidget):
 
         order_btn = QPushButton("Order Now")
         order_btn.clicked.connect(lambda: self.process_order(
-            dialog, item_id, name, price, quantity, total_amount, amount_input.text()
+            dialog, order_btn, total_amount, amount_input.text()
         ))
 
         form.addRow(total_label)
@@ -270,65 +525,64 @@ class POSPage(QWidget):
         dialog.exec()
 
 
-    def process_order(self, dialog, item_id, name, price, quantity, total_amount, amount_text):
-
-        amount_paid = float(amount_text)
+    def process_order(self, dialog, order_btn, total_amount, amount_text):
+        try:
+            amount_paid = float(amount_text)
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Amount", "Please enter a valid amount.")
+            return
         total_amount = float(total_amount)
 
         if amount_paid < total_amount:
             QMessageBox.warning(self, "Insufficient", "The amount paid is not enough.")
             return
 
-        try:
-
-            connection = kuha_databse()
-            cursor = connection.cursor()
-
-            cursor.execute("INSERT INTO orders (customer_id, total_amount) VALUES (%s, %s)",
-                        (self.user_data['customer_id'], total_amount))
-            connection.commit()
-            order_id = cursor.lastrowid
-            
-            cursor.execute("INSERT INTO order_items (order_id, item_id, quantity, subtotal) VALUES (%s, %s, %s, %s)",
-                        (order_id, item_id, quantity, total_amount))
-            connection.commit()
-            
-            change = amount_paid - total_amount
-
-            cursor.execute("INSERT INTO payments (order_id, amount_paid, change_amount) VALUES (%s, %s, %s)",
-                        (order_id, amount_paid, change))
-            connection.commit()
-            
-            QMessageBox.information(self, "Receipt",
-                                    f"✅ Order Successful!\n\nItem: {name}\nQuantity: {quantity}\nTotal: ₱{total_amount:.2f}\n"
-                                    f"Amount Paid: ₱{amount_paid:.2f}\nChange: ₱{change:.2f}")
-            dialog.close()
-
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error processing order: {e}")
-        finally:
-            if connection.is_connected():
-                connection.close()
-
-    def filter_items(self, text):
-        filtered = [i for i in self.menu_items if text.lower() in i[1].lower()]
-        self.display_items(filtered)
+        lines = [(item_id, name, price, qty) for item_id, (name, price, qty) in self.cart.items()]
+        order_btn.setEnabled(False)
+        run_query(
+            order_service.place_order,
+            lambda change: self.show_receipt(dialog, lines, total_amount, amount_paid, change),
+            lambda e: self.on_order_failed(order_btn, e),
+            self.user_data['customer_id'], lines, total_amount, amount_paid,
+            owner=self,
+        )
+
+    def show_receipt(self, dialog, lines, total_amount, amount_paid, change):
+        items = "\n".join(f"{name} x{qty} — ₱{price * qty:.2f}" for _, name, price, qty in lines)
+        QMessageBox.information(self, "Receipt",
+                                f"✅ Order Successful!\n\n{items}\n\nTotal: ₱{total_amount:.2f}\n"
+                                f"Amount Paid: ₱{amount_paid:.2f}\nChange: ₱{change:.2f}")
+        dialog.close()
+        self.clear_cart()
+
+    def on_order_failed(self, order_btn, e):
+        order_btn.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Error processing order: {e}")
+
+    # --- Search ---
+    def update_category_filter(self):
+        current = self.category_filter.currentData()
+        self.category_filter.blockSignals(True)
+        self.category_filter.clear()
+        self.category_filter.addItem("All Categories", None)
+        for category, count in sorted(self.search_index.facet_counts().items()):
+            self.category_filter.addItem(f"{category} ({count})", category)
+        index = self.category_filter.findData(current)
+        self.category_filter.setCurrentIndex(max(index, 0))
+        self.category_filter.blockSignals(False)
+
+    def apply_filter(self):
+        self.search_timer.stop()
+        self.filter_items(self.search_bar.text(), self.category_filter.currentData())
+
+    def filter_items(self, text, category=None):
+        self.display_items(self.search_index.search(text, category))
 
     def logout(self):
-        from login import Login
-        self.logout = Login()
-        self.logout.showMaximized()
-        self.close()
+        logout(self)
 
     def open_home(self):
-        from user_home import CustomerHomePage
-        self.home = CustomerHomePage(self.user_data)
-        self.home.showMaximized()
-        self.close()
-        
+        navigate(self, "home")
     def open_orders(self):
-        from order import CustomerOrders
-        self.orders_page = CustomerOrders(self.user_data)
-        self.orders_page.showMaximized()
-        self.close()
+        navigate(self, "orders")
 
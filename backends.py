@@ -0,0 +1,314 @@
+"""Storage backends: MySQL server or an embedded SQLite file.
+
+Both hand out connections that behave like mysql.connector connections
+(``%s`` placeholders, ``cursor(dictionary=True)``, ``lastrowid``,
+``is_connected()``), so page code does not care which one is active.
+"""
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+
+import migrations
+
+try:
+    import mysql.connector
+    _MYSQL_ERRORS = (mysql.connector.Error,)
+except ImportError:  # SQLite-only installs don't need the MySQL driver
+    mysql = None
+    _MYSQL_ERRORS = ()
+
+DATABASE_ERRORS = (sqlite3.Error,) + _MYSQL_ERRORS
+
+# Named lock that serializes migrations across every terminal on one MySQL server
+MIGRATION_LOCK = "foodie_migrate"
+MIGRATION_LOCK_TIMEOUT = 300  # seconds; a rollup rebuild on a large database is slow
+
+
+class MySQLBackend:
+    name = "mysql"
+
+    def __init__(self, **config):
+        self.config = config
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def connect(self):
+        if mysql is None:
+            raise RuntimeError("mysql-connector-python is not installed")
+        connection = mysql.connector.connect(**self.config)
+
+        # Bring databases created by older versions up to date once per run
+        with self._schema_lock:
+            if not self._schema_ready:
+                migrations.migrate(connection, self)
+                self._schema_ready = True
+        return connection
+
+    def upsert_sql(self, table, columns, key, add=()):
+        """INSERT that updates the other columns when key already exists.
+
+        Columns listed in add are summed with the existing value instead.
+        """
+        updates = ", ".join(
+            f"{c} = {c} + VALUES({c})" if c in add else f"{c} = VALUES({c})"
+            for c in columns if c not in _key_columns(key)
+        )
+        return (f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(['%s'] * len(columns))}) "
+                f"ON DUPLICATE KEY UPDATE {updates}")
+
+    def explain_sql(self, sql):
+        return "EXPLAIN " + sql
+
+    def lock_counters(self, cursor):
+        """InnoDB row-lock waits, time spent waiting (ms) and deadlocks since server start."""
+        cursor.execute("SHOW GLOBAL STATUS WHERE Variable_name IN ('Innodb_row_lock_waits', 'Innodb_row_lock_time')")
+        status = {name: int(value) for name, value in cursor.fetchall()}
+        cursor.execute("SELECT COUNT FROM information_schema.INNODB_METRICS WHERE NAME = 'lock_deadlocks'")
+        row = cursor.fetchone()
+        return {
+            "lock_waits": status.get("Innodb_row_lock_waits", 0),
+            "lock_wait_ms": status.get("Innodb_row_lock_time", 0),
+            "deadlocks": int(row[0]) if row else 0,
+        }
+
+    def table_columns(self, cursor, table):
+        cursor.execute(
+            "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table,)
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+    def table_indexes(self, cursor, table):
+        cursor.execute(
+            "SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table,)
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+    @contextmanager
+    def migration_lock(self, connection):
+        """Hold the server-wide migration lock; DDL commits on its own, so a transaction cannot."""
+        cursor = connection.cursor()
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (MIGRATION_LOCK, MIGRATION_LOCK_TIMEOUT))
+        (locked,) = cursor.fetchone()
+        if locked != 1:
+            cursor.close()
+            raise migrations.MigrationError("Another terminal is still updating the database; try again")
+        try:
+            yield
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
+            cursor.fetchone()
+            cursor.close()
+
+
+class SQLiteBackend:
+    name = "sqlite"
+
+    def __init__(self, path="foodie.db", timeout=10):
+        self.path = path
+        self.timeout = timeout
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def connect(self):
+        raw = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,  # the pool hands connections between threads
+            isolation_level=None,     # transactions are opened by SQLiteConnection
+            uri=self.path.startswith("file:"),
+        )
+        raw.execute("PRAGMA foreign_keys = ON")
+        raw.execute("PRAGMA journal_mode = WAL")
+        raw.execute("PRAGMA synchronous = NORMAL")
+        raw.create_function("CONCAT", -1, _concat, deterministic=True)
+        raw.create_function("NOW", 0, _now)
+        connection = SQLiteConnection(raw)
+
+        with self._schema_lock:
+            if not self._schema_ready:
+                migrations.migrate(connection, self)
+                self._schema_ready = True
+        return connection
+
+    def upsert_sql(self, table, columns, key, add=()):
+        """INSERT that updates the other columns when key already exists.
+
+        Columns listed in add are summed with the existing value instead.
+        """
+        updates = ", ".join(
+            f"{c} = {c} + excluded.{c}" if c in add else f"{c} = excluded.{c}"
+            for c in columns if c not in _key_columns(key)
+        )
+        return (f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(['%s'] * len(columns))}) "
+                f"ON CONFLICT ({', '.join(_key_columns(key))}) DO UPDATE SET {updates}")
+
+    def explain_sql(self, sql):
+        return "EXPLAIN QUERY PLAN " + sql
+
+    def lock_counters(self, cursor):
+        # SQLite keeps no lock statistics; waits show up as busy-timeout errors
+        return {}
+
+    def table_columns(self, cursor, table):
+        cursor.execute(f"PRAGMA table_info({table})")
+        return {row[1] for row in cursor.fetchall()}
+
+    def table_indexes(self, cursor, table):
+        cursor.execute(f"PRAGMA index_list({table})")
+        return {row[1] for row in cursor.fetchall()}
+
+    @contextmanager
+    def migration_lock(self, connection):
+        """Take the database write lock; the migration's commit or rollback gives it up."""
+        connection.start_transaction(immediate=True)
+        try:
+            yield
+        finally:
+            connection.rollback()  # nothing left to undo unless the migration was skipped
+
+
+class SQLiteConnection:
+    """mysql.connector-style wrapper around a sqlite3 connection."""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self._open = True
+
+    @property
+    def in_transaction(self):
+        return self._raw.in_transaction
+
+    def cursor(self, dictionary=False, **_):
+        return SQLiteCursor(self, dictionary)
+
+    def start_transaction(self, immediate=False):
+        # IMMEDIATE takes the write lock now instead of at the first write
+        if not self._raw.in_transaction:
+            self._raw.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+
+    def commit(self):
+        if self._raw.in_transaction:
+            self._raw.execute("COMMIT")
+
+    def rollback(self):
+        if self._raw.in_transaction:
+            self._raw.execute("ROLLBACK")
+
+    def ping(self, reconnect=False):
+        self._raw.execute("SELECT 1").fetchone()
+
+    def is_connected(self):
+        return self._open
+
+    def close(self):
+        if self._open:
+            self._open = False
+            self._raw.close()
+
+
+class SQLiteCursor:
+    def __init__(self, connection, dictionary=False):
+        self._connection = connection
+        self._cursor = connection._raw.cursor()
+        self._dictionary = dictionary
+
+    # Writes open a transaction implicitly, like InnoDB with autocommit off
+    def _begin_for(self, sql):
+        if not _is_read_only(sql):
+            self._connection.start_transaction()
+
+    def execute(self, sql, params=()):
+        self._begin_for(sql)
+        self._cursor.execute(_translate(sql), tuple(params or ()))
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._begin_for(sql)
+        self._cursor.executemany(_translate(sql), [tuple(p) for p in seq_of_params])
+        return self
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return self._shape(row) if row is not None else None
+
+    def fetchmany(self, size=None):
+        rows = self._cursor.fetchmany(size or self._cursor.arraysize)
+        return [self._shape(r) for r in rows]
+
+    def fetchall(self):
+        return [self._shape(r) for r in self._cursor.fetchall()]
+
+    def __iter__(self):
+        for row in self._cursor:
+            yield self._shape(row)
+
+    def _shape(self, row):
+        if not self._dictionary:
+            return row
+        return {col[0]: value for col, value in zip(self._cursor.description, row)}
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+
+def _key_columns(key):
+    return (key,) if isinstance(key, str) else tuple(key)
+
+
+# --- MySQL dialect shims ---
+_SEPARATOR = re.compile(r"\s+SEPARATOR\s+", re.IGNORECASE)
+
+
+@lru_cache(maxsize=512)
+def _translate(sql):
+    sql = sql.replace("%s", "?")
+    return _SEPARATOR.sub(", ", sql)
+
+
+@lru_cache(maxsize=512)
+def _is_read_only(sql):
+    return sql.lstrip().split(None, 1)[0].upper() in ("SELECT", "WITH", "PRAGMA", "EXPLAIN")
+
+
+def _concat(*parts):
+    if any(p is None for p in parts):
+        return None
+    return "".join(str(p) for p in parts)
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _convert_datetime(value):
+    return datetime.fromisoformat(value.decode())
+
+
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_adapter(datetime, lambda v: v.strftime("%Y-%m-%d %H:%M:%S"))
+sqlite3.register_adapter(date, lambda v: v.isoformat())
+sqlite3.register_converter("DATETIME", _convert_datetime)
+sqlite3.register_converter("TIMESTAMP", _convert_datetime)
@@ -0,0 +1,175 @@
+"""Synthetic Ced's Foodie database for benchmarks.
+
+Builds an SQLite file with realistic volumes: customers with accounts, a
+large menu with a few best sellers, a year of orders spread over opening
+hours (1-5 lines each) with payments, and the sales rollups filled in as
+checkout would have left them.
+
+    python bench_data.py bench.db --scale 0.1
+"""
+import argparse
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from backends import SQLiteBackend
+
+# Volumes at scale 1.0
+VOLUMES = {
+    "customers": 100_000,
+    "menu_items": 10_000,
+    "orders": 1_000_000,   # about 3M order_items at 1-5 lines per order
+}
+CATEGORIES = ["Drinks", "Snacks", "Meals", "Desserts"]
+STATUSES = ["Pending", "Preparing", "Completed", "Cancelled"]
+STATUS_WEIGHTS = [0.03, 0.02, 0.90, 0.05]
+CHUNK = 100_000
+
+
+def scaled(scale):
+    return {name: max(1, int(count * scale)) for name, count in VOLUMES.items()}
+
+
+def insert_chunks(raw, sql, rows):
+    for i in range(0, len(rows), CHUNK):
+        raw.executemany(sql, rows[i:i + CHUNK])
+
+
+def as_text(times):
+    return np.char.replace(np.datetime_as_string(times, unit="s"), "T", " ").tolist()
+
+
+def remove_database(path):
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def stored_scale(path):
+    """The scale path was generated at, or None for files without it."""
+    raw = sqlite3.connect(path)
+    try:
+        row = raw.execute("SELECT value FROM bench_info WHERE name = 'scale'").fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    finally:
+        raw.close()
+    return float(row[0]) if row else None
+
+
+def generate(path, scale=1.0, days=365, seed=42, progress=print):
+    """Create path from scratch; returns the row counts written."""
+    remove_database(path)
+    SQLiteBackend(path).connect().close()  # runs the migrations
+
+    counts = scaled(scale)
+    rng = np.random.default_rng(seed)
+    raw = sqlite3.connect(path, isolation_level=None)
+    raw.execute("PRAGMA synchronous = OFF")
+    raw.execute("BEGIN")
+    started = time.perf_counter()
+
+    # --- Accounts and customers ---
+    customers = counts["customers"]
+    raw.execute("INSERT INTO accounts (username, password, role) VALUES ('admin', 'admin', 'admin')")
+    insert_chunks(raw, "INSERT INTO accounts (ID, username, password, role) VALUES (?, ?, ?, 'customer')",
+                  [(i + 2, f"user{i}", f"pass{i}") for i in range(customers)])
+    insert_chunks(raw, "INSERT INTO customers (customer_id, account_id, name, email, phone, address) "
+                       "VALUES (?, ?, ?, ?, ?, ?)",
+                  [(i + 1, i + 2, f"Customer {i}", f"user{i}@example.com", f"09{i:09d}", f"{i} Main St")
+                   for i in range(customers)])
+    progress(f"{customers:,} customers")
+
+    # --- Menu: prices 20-500, popularity falls off with rank ---
+    items = counts["menu_items"]
+    prices = np.round(rng.integers(40, 1000, items) / 2, 2)
+    insert_chunks(raw, "INSERT INTO menu_items (item_id, name, category, price) VALUES (?, ?, ?, ?)",
+                  [(i + 1, f"Item {i:05d}", CATEGORIES[i % len(CATEGORIES)], float(prices[i]))
+                   for i in range(items)])
+    popularity = 1.0 / (np.arange(items) + 10)
+    popularity /= popularity.sum()
+    progress(f"{items:,} menu items")
+
+    # --- Orders between 08:00 and 22:00 over the last days days ---
+    orders = counts["orders"]
+    first_day = np.datetime64(datetime.now().date() - timedelta(days=days), "s")
+    order_times = np.sort(
+        first_day
+        + rng.integers(0, days, orders).astype("timedelta64[D]")
+        + rng.integers(8 * 3600, 22 * 3600, orders).astype("timedelta64[s]")
+    )
+    lines_per_order = rng.integers(1, 6, orders)
+    line_order = np.repeat(np.arange(orders), lines_per_order)
+    line_item = rng.choice(items, size=len(line_order), p=popularity)
+    line_qty = rng.integers(1, 4, len(line_order))
+    line_price = prices[line_item]
+    line_subtotal = np.round(line_price * line_qty, 2)
+    totals = np.round(np.bincount(line_order, weights=line_subtotal, minlength=orders), 2)
+    statuses = rng.choice(len(STATUSES), size=orders, p=STATUS_WEIGHTS)
+    customer_ids = rng.integers(1, customers + 1, orders)
+    paid = np.ceil(totals / 100) * 100
+
+    times = as_text(order_times)
+    insert_chunks(raw, "INSERT INTO orders (order_id, customer_id, order_date, status, total_amount, updated_at) "
+                       "VALUES (?, ?, ?, ?, ?, ?)",
+                  [(i + 1, int(customer_ids[i]), times[i], STATUSES[statuses[i]], float(totals[i]), times[i])
+                   for i in range(orders)])
+    insert_chunks(raw, "INSERT INTO order_items (order_id, item_id, quantity, unit_price, subtotal) "
+                       "VALUES (?, ?, ?, ?, ?)",
+                  list(zip((line_order + 1).tolist(), (line_item + 1).tolist(), line_qty.tolist(),
+                           line_price.tolist(), line_subtotal.tolist())))
+    insert_chunks(raw, "INSERT INTO payments (order_id, amount_paid, change_amount, payment_date) "
+                       "VALUES (?, ?, ?, ?)",
+                  [(i + 1, float(paid[i]), round(float(paid[i] - totals[i]), 2), times[i])
+                   for i in range(orders)])
+    progress(f"{orders:,} orders, {len(line_order):,} order items")
+
+    # --- Rollups, as checkout would have left them (see sales_rollup.py) ---
+    for table, bucket in (("sales_item_hourly", "strftime('%Y-%m-%d %H:00:00', o.order_date)"),
+                          ("sales_item_daily", "date(o.order_date)")):
+        raw.execute(f"""
+            INSERT INTO {table}
+            SELECT oi.item_id, {bucket}, SUM(oi.quantity), SUM(oi.quantity * oi.unit_price),
+                   COUNT(DISTINCT oi.order_id)
+            FROM order_items oi
+            JOIN orders o ON oi.order_id = o.order_id
+            WHERE o.status != 'Cancelled'
+            GROUP BY oi.item_id, {bucket}
+        """)
+    for table, bucket in (("sales_hourly", "strftime('%Y-%m-%d %H:00:00', order_date)"),
+                          ("sales_daily", "date(order_date)")):
+        raw.execute(f"""
+            INSERT INTO {table}
+            SELECT {bucket}, COUNT(*), SUM(total_amount)
+            FROM orders
+            WHERE status != 'Cancelled'
+            GROUP BY {bucket}
+        """)
+    raw.execute("UPDATE sales_rollup_state SET built = 1 WHERE id = 1")
+
+    # --- What was generated, so benchmark.py can tell a mismatched file ---
+    raw.execute("CREATE TABLE bench_info (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    raw.executemany("INSERT INTO bench_info (name, value) VALUES (?, ?)",
+                    [("scale", repr(scale)), ("days", str(days)), ("seed", str(seed))])
+    raw.execute("COMMIT")
+    raw.execute("ANALYZE")
+    raw.close()
+    progress(f"done in {time.perf_counter() - started:.1f}s")
+    return {**counts, "order_items": len(line_order)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic benchmark database.")
+    parser.add_argument("path", nargs="?", default="bench.db")
+    parser.add_argument("--scale", type=float, default=1.0, help="fraction of the full volumes")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    generate(args.path, args.scale, args.days, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Latency benchmarks for the hot database paths.
+
+Runs the service calls the pages make (login, checkout, the order
+manager's first page, a customer's order history and the dashboard
+snapshot; see services.py) against a copy of a synthetic database from
+bench_data.py, and reports p50/p95/p99 per operation. Checkouts write
+only to the copy, so every run starts from the same data. Results can be
+saved as a baseline and later runs compared against it:
+
+    python benchmark.py --generate --scale 0.1 --save-baseline baseline.json
+    python benchmark.py --scale 0.1 --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import bench_data
+import db
+from backends import SQLiteBackend
+from query_stats import query_stats
+from services import auth_service, order_service, report_service
+
+# --- Defaults ---
+RUNS = 200
+WARMUP = 5
+TOLERANCE = 0.20  # a p95 this much above the baseline counts as a regression
+PAGE_ROWS = 51    # ManageOrders.PAGE_SIZE plus the row that tells it an older page exists
+
+
+def percentiles(samples):
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99), "runs": len(samples)}
+
+
+def working_copy(path):
+    """A throwaway copy of the SQLite file at path, next to it."""
+    fd, copy = tempfile.mkstemp(suffix=".db", prefix="bench-run-", dir=os.path.dirname(os.path.abspath(path)))
+    os.close(fd)
+    source, target = sqlite3.connect(path), sqlite3.connect(copy)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+    return copy
+
+
+def time_case(operation, runs, warmup=WARMUP):
+    """Milliseconds per call; operation gets the run number."""
+    for i in range(warmup):
+        operation(i)
+    samples = []
+    for i in range(runs):
+        start = time.perf_counter()
+        operation(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+# --- Cases ---
+def build_cases(rng):
+    with db.db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM customers")
+        customers = cursor.fetchone()[0]
+        cursor.execute("SELECT item_id, name, price FROM menu_items ORDER BY item_id LIMIT 200")
+        menu = cursor.fetchall()
+        cursor.close()
+
+    def customer(i):
+        return int(rng.integers(customers)) + 1
+
+    def login(i):
+        n = int(rng.integers(customers))
+        auth_service.login(f"user{n}", f"pass{n}")
+
+    def checkout(i):
+        picks = rng.choice(len(menu), size=int(rng.integers(1, 6)), replace=False)
+        lines = [(menu[p][0], menu[p][1], float(menu[p][2]), int(rng.integers(1, 4))) for p in picks]
+        total = round(sum(price * qty for _, _, price, qty in lines), 2)
+        order_service.place_order(customer(i), lines, total, total + 100)
+
+    return {
+        "login": login,
+        "checkout": checkout,
+        "manage_orders.first_page": lambda i: order_service.order_page({"status": None}, limit=PAGE_ROWS),
+        "manage_orders.pending_page": lambda i: order_service.order_page({"status": "Pending"}, limit=PAGE_ROWS),
+        "customer_orders": lambda i: order_service.customer_orders(customer(i)),
+        "dashboard.last_30_days": lambda i: report_service.dashboard_snapshot(30),
+        "dashboard.all_time": lambda i: report_service.dashboard_snapshot(None),
+    }
+
+
+def run(runs=RUNS, only=None, seed=0, progress=print):
+    rng = np.random.default_rng(seed)
+    results = {}
+    for name, operation in build_cases(rng).items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        results[name] = percentiles(time_case(operation, runs))
+        progress(format_row(name, results[name]))
+    return results
+
+
+# --- Reporting ---
+def format_row(name, result, base=None):
+    row = f"{name:<28} {result['p50']:>9.2f} {result['p95']:>9.2f} {result['p99']:>9.2f} {result['runs']:>6}"
+    if base:
+        change = result["p95"] / base["p95"] - 1 if base["p95"] else 0.0
+        row += f"   p95 {change:+7.1%} vs {base['p95']:.2f}"
+    return row
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Print each case against the baseline; returns the names that regressed."""
+    print(f"{'operation (ms)':<28} {'p50':>9} {'p95':>9} {'p99':>9} {'runs':>6}")
+    regressed = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        print(format_row(name, result, base))
+        if base and result["p95"] > base["p95"] * (1 + tolerance):
+            regressed.append(name)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hot database paths.")
+    parser.add_argument("--db", default="bench.db", help="SQLite file to benchmark")
+    parser.add_argument("--generate", action="store_true", help="rebuild the database first")
+    parser.add_argument("--scale", type=float, default=1.0, help="data volume of --db (checked, or built with --generate)")
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--only", nargs="*", help="run cases starting with these names")
+    parser.add_argument("--baseline", help="compare against this baseline file")
+    parser.add_argument("--save-baseline", help="write the results to this file")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--queries", action="store_true", help="print per-statement timings at the end")
+    args = parser.parse_args()
+
+    if args.generate or not os.path.exists(args.db):
+        bench_data.generate(args.db, args.scale)
+    else:
+        # Results from another data volume are not comparable with the baseline
+        scale = bench_data.stored_scale(args.db)
+        if scale != args.scale:
+            found = f"was generated at scale {scale}" if scale is not None else "has no recorded scale"
+            print(f"warning: {args.db} {found}, not {args.scale}; pass --generate to rebuild it", file=sys.stderr)
+    copy = working_copy(args.db)
+    db.set_backend(SQLiteBackend(copy))
+
+    print(f"{'operation (ms)':<28} {'p50':>9} {'p95':>9} {'p99':>9} {'runs':>6}")
+    try:
+        results = run(args.runs, args.only)
+    finally:
+        db.set_backend(None)  # closes the pool's connections to the copy
+        bench_data.remove_database(copy)
+
+    regressed = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        print()
+        regressed = compare(results, baseline, args.tolerance)
+        if regressed:
+            print(f"\nRegressed (p95 over +{args.tolerance:.0%}): {', '.join(regressed)}")
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"database": args.db, "results": results}, f, indent=2)
+    if args.queries:
+        print()
+        print(query_stats.format_summary())
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
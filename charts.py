@@ -0,0 +1,181 @@
+"""Lightweight bar and line charts drawn with QPainter.
+
+These cover the standard dashboard views without loading matplotlib.
+They take the same calls as the matplotlib graphs in mpl_charts.py
+(show_message, plot_sales, plot_trend), so the dashboard can use either.
+"""
+import math
+
+import numpy as np
+from PyQt6.QtWidgets import QWidget, QSizePolicy
+from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QPolygonF, QFontMetrics
+from PyQt6.QtCore import Qt, QRectF, QPointF
+
+
+# Bars drawn by the sales charts; the remaining items share one "Other" bar
+TOP_ITEMS = 15
+
+
+def top_with_other(results, top=TOP_ITEMS):
+    """[(name, total)] for the first top rows (best sellers first) plus "Other" for the rest."""
+    rows = [(row[0], float(row[1])) for row in results[:top]]
+    rest = sum(float(row[1]) for row in results[top:])
+    if len(results) > top:
+        rows.append((f"Other ({len(results) - top:,} items)", rest))
+    return rows
+
+
+def nice_step(span, ticks=5):
+    """A round tick step (1, 2 or 5 times a power of ten) for an axis span."""
+    if span <= 0:
+        return 1
+    raw = span / ticks
+    power = 10 ** math.floor(math.log10(raw))
+    for factor in (1, 2, 5, 10):
+        if raw <= factor * power:
+            return factor * power
+    return 10 * power
+
+
+class NativeChart(QWidget):
+    BACKGROUND = QColor("#121212")
+    PLOT = QColor("#1E1E1E")
+    TEXT = QColor("white")
+    MARGINS = (90, 60, 30, 90)  # left, top, right, bottom
+
+    def __init__(self, title=""):
+        super().__init__()
+        self.title = title
+        self.message = "Loading sales data..."
+        self.title_font = QFont("Arial", 16)
+        self.label_font = QFont("Arial", 10)
+        self.message_font = QFont("Arial", 14)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.setMinimumHeight(250)
+
+    def show_message(self, text):
+        self.message = text
+        self.update()
+
+    def plot_rect(self):
+        left, top, right, bottom = self.MARGINS
+        return QRectF(left, top, self.width() - left - right, self.height() - top - bottom)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(self.rect(), self.BACKGROUND)
+        if self.message is not None:
+            painter.setPen(self.TEXT)
+            painter.setFont(self.message_font)
+            painter.drawText(QRectF(self.rect()), Qt.AlignmentFlag.AlignCenter, self.message)
+            return
+
+        painter.setPen(self.TEXT)
+        painter.setFont(self.title_font)
+        painter.drawText(QRectF(0, 10, self.width(), 40), Qt.AlignmentFlag.AlignCenter, self.title)
+
+        plot = self.plot_rect()
+        painter.fillRect(plot, self.PLOT)
+        scale = self.draw_y_axis(painter, plot)
+        self.draw_data(painter, plot, scale)
+        painter.setPen(QPen(self.TEXT, 1))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRect(plot)
+
+    def draw_y_axis(self, painter, plot):
+        """Draw value ticks from 0 to a round maximum; returns that maximum."""
+        step = nice_step(self.max_value())
+        top = step * max(1, math.ceil(self.max_value() / step))
+        painter.setFont(self.label_font)
+        ticks = int(round(top / step))
+        for i in range(ticks + 1):
+            value = i * step
+            y = plot.bottom() - plot.height() * value / top
+            painter.setPen(QPen(QColor("#333333"), 1))
+            painter.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+            painter.setPen(self.TEXT)
+            painter.drawText(QRectF(0, y - 10, plot.left() - 8, 20),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, f"{value:,.0f}")
+        return top
+
+    def draw_rotated_label(self, painter, x, y, text):
+        painter.save()
+        painter.translate(x, y)
+        painter.rotate(-25)
+        width = QFontMetrics(self.label_font).horizontalAdvance(text)
+        painter.drawText(QPointF(-width, 0), text)
+        painter.restore()
+
+    # Subclasses
+    def max_value(self):
+        return 0
+
+    def draw_data(self, painter, plot, scale):
+        pass
+
+
+class SalesBarChart(NativeChart):
+    def __init__(self):
+        super().__init__("Total Sales per Menu Item")
+        self.names = []
+        self.totals = []
+
+    def plot_sales(self, results):
+        """results are (name, total_sales, ...) rows, best sellers first."""
+        rows = top_with_other(results)
+        self.names = [name for name, _ in rows]
+        self.totals = [total for _, total in rows]
+        self.message = None if results else "No sales data found"
+        self.update()
+
+    def max_value(self):
+        return max(self.totals, default=0)
+
+    def draw_data(self, painter, plot, scale):
+        slot = plot.width() / len(self.totals)
+        bar = slot * 0.7
+        painter.setFont(self.label_font)
+        for i, (name, total) in enumerate(zip(self.names, self.totals)):
+            height = plot.height() * total / scale
+            x = plot.left() + slot * i + (slot - bar) / 2
+            painter.fillRect(QRectF(x, plot.bottom() - height, bar, height), QColor("#4CAF50"))
+            painter.setPen(self.TEXT)
+            self.draw_rotated_label(painter, x + bar / 2, plot.bottom() + 16, name)
+
+
+class SalesTrendChart(NativeChart):
+    """Revenue, orders or average ticket per hour, day or week as a line."""
+
+    def __init__(self):
+        super().__init__("Revenue")
+        self.buckets = np.zeros(0, dtype="datetime64[s]")
+        self.values = np.zeros(0)
+
+    def plot_trend(self, buckets, values, label, metric="Revenue"):
+        self.title = f"{metric} per {label}"
+        self.buckets = buckets
+        self.values = np.asarray(values, dtype=np.float64)
+        self.message = None if len(buckets) and self.values.any() else "No sales data found"
+        self.update()
+
+    def max_value(self):
+        return float(self.values.max()) if len(self.values) else 0
+
+    def draw_data(self, painter, plot, scale):
+        count = len(self.values)
+        xs = plot.left() + plot.width() * (np.arange(count) / max(count - 1, 1))
+        ys = plot.bottom() - plot.height() * self.values / scale
+        painter.setPen(QPen(QColor("#FFC107"), 2))
+        painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())]))
+
+        # About six date labels along the bottom
+        painter.setFont(self.label_font)
+        painter.setPen(self.TEXT)
+        fmt = "%Y-%m-%d %H:00" if self.is_hourly() else "%Y-%m-%d"
+        for i in np.linspace(0, count - 1, num=min(count, 6)).astype(int):
+            label = self.buckets[i].astype(object).strftime(fmt)
+            self.draw_rotated_label(painter, xs[i], plot.bottom() + 16, label)
+
+    def is_hourly(self):
+        return len(self.buckets) > 1 and (self.buckets[1] - self.buckets[0]) < np.timedelta64(1, "D")
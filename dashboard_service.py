@@ -0,0 +1,94 @@
+"""Background refresh of the admin dashboard data.
+
+The service keeps the latest snapshot for every date range it has been
+asked about. A dashboard shows the cached snapshot at once and the
+service recomputes it on a worker thread: when it is missing, when it is
+older than the refresh interval, and on a timer while a dashboard is on
+screen.
+"""
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from workers import run_query
+from services import report_service
+
+# --- Refresh settings (change with configure) ---
+REFRESH_SETTINGS = {
+    "interval": 60,  # seconds between refreshes while a dashboard is shown
+}
+
+
+class DashboardService(QObject):
+    snapshot_ready = pyqtSignal(object)
+    refresh_failed = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.snapshots = {}   # range (days back, None = all time) -> DashboardSnapshot
+        self.loading = set()
+        self.active_key = None
+        self.has_active = False  # None is a valid key (all time)
+        self.viewers = 0
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh_active)
+        self.set_interval(REFRESH_SETTINGS["interval"])
+
+    def set_interval(self, seconds):
+        self.interval = seconds
+        self.timer.setInterval(int(seconds * 1000))
+
+    # --- Dashboards ---
+    def request(self, key):
+        """The cached snapshot for key (or None); refreshes it if stale."""
+        self.active_key = key
+        self.has_active = True
+        snapshot = self.snapshots.get(key)
+        if snapshot is None or snapshot.age() >= self.interval:
+            self.refresh(key)
+        return snapshot
+
+    def start(self):
+        self.viewers += 1
+        self.timer.start()
+
+    def stop(self):
+        self.viewers = max(0, self.viewers - 1)
+        if not self.viewers:
+            self.timer.stop()
+
+    # --- Refreshing ---
+    def refresh_active(self):
+        if self.has_active:
+            self.refresh(self.active_key)
+
+    def refresh(self, key):
+        if key in self.loading:
+            return
+        self.loading.add(key)
+        run_query(report_service.dashboard_snapshot, self.on_snapshot,
+                  lambda err: self.on_failed(key, err), key, owner=self)
+
+    def on_snapshot(self, snapshot):
+        self.loading.discard(snapshot.key)
+        self.snapshots[snapshot.key] = snapshot
+        self.snapshot_ready.emit(snapshot)
+
+    def on_failed(self, key, err):
+        self.loading.discard(key)
+        self.refresh_failed.emit(err)
+
+
+_service = None
+
+
+def dashboard_service():
+    """The process-wide service; its cache outlives any one dashboard page."""
+    global _service
+    if _service is None:
+        _service = DashboardService()
+    return _service
+
+
+def configure(**settings):
+    REFRESH_SETTINGS.update(settings)
+    if _service is not None:
+        _service.set_interval(REFRESH_SETTINGS["interval"])
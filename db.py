@@ -1,9 +1,274 @@
-import mysql.connector 
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from backends import DATABASE_ERRORS, MySQLBackend, SQLiteBackend
+from migrations import MigrationError
+from query_stats import InstrumentedConnection
+
+DB_CONFIG = {
+    "host": "localhost",
+    "user": "root",
+    "password": "",
+    "database": "ced's_foodie",
+}
+
+# FOODIE_DB_BACKEND=sqlite runs on an embedded file instead of the MySQL server
+DB_BACKEND = os.environ.get("FOODIE_DB_BACKEND", "mysql")
+SQLITE_PATH = os.environ.get("FOODIE_SQLITE_PATH", "foodie.db")
+
+# --- Pool settings (change with configure_pool) ---
+POOL_SETTINGS = {
+    "min_size": 1,           # connections kept open even when idle
+    "max_size": 8,           # hard cap on open connections
+    "idle_timeout": 300,     # seconds before an idle extra connection is closed
+    "checkout_timeout": 10,  # seconds to wait for a free connection
+    "health_check": True,    # ping connections before handing them out
+}
+
+
+class PoolExhausted(Exception):
+    """Raised when no connection frees up within checkout_timeout."""
+
+
+# Catch this in pages instead of mysql.connector.Error so any backend works
+Error = (PoolExhausted, MigrationError) + DATABASE_ERRORS
+
+
+class ConnectionPool:
+    """A small thread-safe pool of database connections.
+
+    Connections are opened lazily up to max_size, pinged on checkout and
+    closed again once they sit idle longer than idle_timeout (never below
+    min_size).
+    """
+
+    def __init__(self, connect, min_size=1, max_size=8, idle_timeout=300,
+                 checkout_timeout=10, health_check=True):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Invalid pool size")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.health_check = health_check
+
+        self._idle = []  # list of (connection, released_at)
+        self._open = 0
+        self._lock = threading.Condition()
+        self._closed = False
+
+    # --- Checkout / return ---
+    def acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise PoolExhausted("Connection pool is closed")
+                self._evict_idle()
+                if self._idle:
+                    conn, _ = self._idle.pop()
+                    break
+                if self._open < self.max_size:
+                    self._open += 1
+                    conn = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolExhausted("No database connection available")
+                self._lock.wait(remaining)
+
+        if conn is None:
+            return self._open_connection()
+        if self.health_check and not self._is_healthy(conn):
+            # Reuse the dead connection's slot so _open never passes max_size
+            self._close_quietly(conn)
+            return self._open_connection()
+        return conn
+
+    def release(self, conn):
+        # Never hand an open transaction to the next caller
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+
+        with self._lock:
+            if self._closed:
+                self._open -= 1
+                self._close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._lock.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            self.release(conn)
+
+    # --- Maintenance ---
+    def close_all(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._lock.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self):
+        with self._lock:
+            return {"open": self._open, "idle": len(self._idle),
+                    "in_use": self._open - len(self._idle)}
+
+    # --- Internals ---
+    def _open_connection(self):
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._open -= 1
+                self._lock.notify()
+            raise
+
+    def _is_healthy(self, conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, conn):
+        self._close_quietly(conn)
+        with self._lock:
+            self._open -= 1
+            self._lock.notify()
+
+    def _evict_idle(self):
+        # Caller holds the lock; the oldest idle connections sit at the front
+        now = time.monotonic()
+        while (self._idle and self._open > self.min_size
+               and now - self._idle[0][1] > self.idle_timeout):
+            conn, _ = self._idle.pop(0)
+            self._open -= 1
+            self._close_quietly(conn)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+class PooledConnection:
+    """Wraps a pooled connection so close() hands it back instead of closing."""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise AttributeError(f"Connection already returned to the pool ({name})")
+        return getattr(self._conn, name)
+
+    def is_connected(self):
+        return self._conn is not None and self._conn.is_connected()
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self._conn is not None:
+            try:
+                self._conn.rollback()
+            except Exception:
+                pass
+        self.close()
+
+
+_backend = None
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    with _pool_lock:
+        if _backend is None:
+            if DB_BACKEND == "sqlite":
+                _backend = SQLiteBackend(SQLITE_PATH)
+            elif DB_BACKEND == "mysql":
+                _backend = MySQLBackend(**DB_CONFIG)
+            else:
+                raise ValueError(f"Unknown database backend: {DB_BACKEND}")
+        return _backend
+
+
+def set_backend(backend):
+    """Switch every page to another backend (e.g. SQLiteBackend for local runs)."""
+    global _backend, _pool
+    with _pool_lock:
+        _backend = backend
+        old, _pool = _pool, None
+    if old is not None:
+        old.close_all()
+
+
+def get_pool():
+    global _pool
+    backend = get_backend()
+    with _pool_lock:
+        if _pool is None:
+            # Every connection times its statements (see query_stats.py)
+            _pool = ConnectionPool(lambda: InstrumentedConnection(backend.connect(), backend),
+                                   **POOL_SETTINGS)
+        return _pool
+
+
+def configure_pool(**settings):
+    """Update POOL_SETTINGS and rebuild the pool on next use."""
+    global _pool
+    unknown = set(settings) - set(POOL_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown pool settings: {', '.join(sorted(unknown))}")
+    POOL_SETTINGS.update(settings)
+    with _pool_lock:
+        old, _pool = _pool, None
+    if old is not None:
+        old.close_all()
+
+
+@contextmanager
+def db_connection():
+    """Borrow a connection from the pool for the duration of a with-block.
+
+    Uncommitted work is rolled back when the block exits.
+    """
+    with get_pool().connection() as conn:
+        yield conn
+
 
 def kuha_databse():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="",
-        database="ced's_foodie"
-    )
\ No newline at end of file
+    """Check out a pooled connection; calling close() returns it to the pool."""
+    pool = get_pool()
+    return PooledConnection(pool, pool.acquire())
@@ -0,0 +1,236 @@
+"""Headless load simulator for several POS terminals on one database.
+
+Cashier threads run the checkout the POS page performs
+(OrderService.place_order); kitchen threads load the Pending/Preparing
+page of the order manager and advance one order with
+OrderService.set_statuses, like a cook clicking Update.
+Each terminal waits a random think time between actions. Lock timeouts
+and deadlocks are retried with backoff, as a cashier would press the
+button again.
+
+    python load_sim.py --db bench.db --cashiers 8 --kitchen 2 --duration 30
+    python load_sim.py --mysql foodie_loadtest --cashiers 8
+
+SQLite runs work on a throwaway copy of --db, so the benchmark dataset is
+left as it was. MySQL runs need the name of a scratch database on the
+configured server; the shop's own database is refused, since the
+simulator places orders and advances whatever is Pending or Preparing.
+
+The report gives throughput, latency percentiles per action, retries,
+deadlocks, lock timeouts and compare-and-set conflicts (orders another
+cook advanced first), plus the server's lock-wait counters on MySQL.
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+import bench_data
+import benchmark
+import db
+from backends import MySQLBackend, SQLiteBackend
+from services import order_service, NEXT_STATUS
+
+# --- Defaults ---
+THINK_MS = {"cashier": 500, "kitchen": 1500}  # mean think time per role
+PAGE_ROWS = 51  # what the order manager asks for (PAGE_SIZE + 1)
+MAX_RETRIES = 5
+BACKOFF_MS = 20
+
+# mysql.connector errno values
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+
+
+def retry_kind(err):
+    """'deadlock', 'lock_timeout' or None when the error is not worth retrying."""
+    errno = getattr(err, "errno", None)
+    if errno == ER_LOCK_DEADLOCK:
+        return "deadlock"
+    if errno == ER_LOCK_WAIT_TIMEOUT:
+        return "lock_timeout"
+    if isinstance(err, sqlite3.OperationalError) and ("locked" in str(err) or "busy" in str(err)):
+        return "lock_timeout"
+    return None
+
+
+class LoadStats:
+    """Counters shared by all terminals."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}   # action -> [ms]
+        self.counts = {"retries": 0, "deadlock": 0, "lock_timeout": 0, "failures": 0, "conflicts": 0}
+        self.errors = {}
+        self.menu = []        # (item_id, name, price) the cashiers ring up
+        self.customers = []   # customer ids to ring orders up for
+        self.elapsed = 0.0
+        self.server = {}      # lock counters from the database server, if it has any
+
+    def add_latency(self, action, elapsed_ms):
+        with self.lock:
+            self.latencies.setdefault(action, []).append(elapsed_ms)
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counts[name] += amount
+
+    def add_error(self, err):
+        with self.lock:
+            self.counts["failures"] += 1
+            key = f"{type(err).__name__}: {err}"[:200]
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+
+def attempt(stats, action, operation, *args):
+    """Run operation, retrying lock timeouts and deadlocks; returns its result or None."""
+    for retry in range(MAX_RETRIES + 1):
+        start = time.perf_counter()
+        try:
+            result = operation(*args)
+        except db.Error as err:
+            kind = retry_kind(err)
+            if kind is None or retry == MAX_RETRIES:
+                stats.add_error(err)
+                return None
+            stats.count(kind)
+            stats.count("retries")
+            time.sleep(BACKOFF_MS * (2 ** retry) / 1000)
+            continue
+        stats.add_latency(action, (time.perf_counter() - start) * 1000)
+        return result
+    return None
+
+
+# --- Terminals ---
+class Terminal(threading.Thread):
+    def __init__(self, role, stats, stop, think_ms, seed):
+        super().__init__(daemon=True)
+        self.role = role
+        self.stats = stats
+        self.stop = stop
+        self.think_ms = think_ms
+        self.rng = np.random.default_rng(seed)
+
+    def run(self):
+        step = self.checkout if self.role == "cashier" else self.advance_order
+        while not self.stop.is_set():
+            step()
+            self.stop.wait(self.rng.exponential(self.think_ms) / 1000)
+
+    def checkout(self):
+        menu, customers = self.stats.menu, self.stats.customers
+        picks = self.rng.choice(len(menu), size=int(self.rng.integers(1, 6)), replace=False)
+        lines = [(menu[p][0], menu[p][1], float(menu[p][2]), int(self.rng.integers(1, 4))) for p in picks]
+        total = round(sum(price * qty for _, _, price, qty in lines), 2)
+        customer_id = int(self.rng.choice(customers))
+        attempt(self.stats, "checkout", order_service.place_order, customer_id, lines, total, total + 100)
+
+    def advance_order(self):
+        status = "Pending" if self.rng.random() < 0.5 else "Preparing"
+        rows = attempt(self.stats, "kitchen.load_page", order_service.order_page,
+                       {"status": status}, None, PAGE_ROWS)
+        if not rows:
+            return
+        order_id = rows[int(self.rng.integers(len(rows)))][0]
+        result = attempt(self.stats, "kitchen.update_status", order_service.set_statuses,
+                         [(status, NEXT_STATUS[status], [order_id])])
+        if result is not None and result[0] == 0:
+            self.stats.count("conflicts")
+
+
+# --- Running ---
+def lock_counters():
+    with db.db_connection() as conn:
+        cursor = conn.cursor()
+        counters = db.get_backend().lock_counters(cursor)
+        cursor.close()
+    return counters
+
+
+def simulate(cashiers=4, kitchen=1, duration=30, think_ms=None, seed=0):
+    think_ms = {**THINK_MS, **(think_ms or {})}
+    # One connection per terminal, as if each ran on its own machine
+    db.configure_pool(max_size=cashiers + kitchen, min_size=0)
+
+    stats = LoadStats()
+    with db.db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT item_id, name, price FROM menu_items ORDER BY item_id LIMIT 200")
+        stats.menu = cursor.fetchall()
+        cursor.execute("SELECT customer_id FROM customers")
+        stats.customers = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+    if not stats.menu or not stats.customers:
+        raise ValueError("The database needs menu items and customers to simulate checkouts")
+
+    before = lock_counters()
+    stop = threading.Event()
+    terminals = [Terminal("cashier", stats, stop, think_ms["cashier"], seed + i) for i in range(cashiers)]
+    terminals += [Terminal("kitchen", stats, stop, think_ms["kitchen"], seed + 1000 + i) for i in range(kitchen)]
+    started = time.perf_counter()
+    for terminal in terminals:
+        terminal.start()
+    time.sleep(duration)
+    stop.set()
+    for terminal in terminals:
+        terminal.join()
+    stats.elapsed = time.perf_counter() - started
+    after = lock_counters()
+    stats.server = {name: after[name] - before.get(name, 0) for name in after}
+    return stats
+
+
+def report(stats):
+    lines = [f"{'action':<24} {'count':>7} {'per sec':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"]
+    for action, samples in sorted(stats.latencies.items()):
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        lines.append(f"{action:<24} {len(samples):>7} {len(samples) / stats.elapsed:>8.1f} "
+                     f"{p50:>8.2f} {p95:>8.2f} {p99:>8.2f} {max(samples):>8.2f}")
+    lines.append("")
+    lines.append(", ".join(f"{name}: {value}" for name, value in stats.counts.items()))
+    if stats.server:
+        lines.append("server: " + ", ".join(f"{name}: {value}" for name, value in stats.server.items()))
+    for error, count in stats.errors.items():
+        lines.append(f"  {count} x {error}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate several POS terminals on one database.")
+    parser.add_argument("--db", default="bench.db", help="SQLite file (created with bench_data.py if missing)")
+    parser.add_argument("--mysql", metavar="DATABASE",
+                        help="use this scratch database on the configured MySQL server instead")
+    parser.add_argument("--scale", type=float, default=0.01, help="data volume when creating --db")
+    parser.add_argument("--cashiers", type=int, default=4)
+    parser.add_argument("--kitchen", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--cashier-think", type=float, default=THINK_MS["cashier"], help="mean ms between checkouts")
+    parser.add_argument("--kitchen-think", type=float, default=THINK_MS["kitchen"], help="mean ms between updates")
+    parser.add_argument("--busy-timeout", type=float, default=10, help="SQLite lock wait in seconds")
+    args = parser.parse_args()
+
+    think_ms = {"cashier": args.cashier_think, "kitchen": args.kitchen_think}
+    if args.mysql:
+        if args.mysql == db.DB_CONFIG["database"]:
+            parser.error(f"refusing to run against the shop database {args.mysql!r}; pass a scratch copy")
+        db.set_backend(MySQLBackend(**{**db.DB_CONFIG, "database": args.mysql}))
+        stats = simulate(args.cashiers, args.kitchen, args.duration, think_ms)
+    else:
+        if not os.path.exists(args.db):
+            bench_data.generate(args.db, args.scale)
+        copy = benchmark.working_copy(args.db)
+        db.set_backend(SQLiteBackend(copy, timeout=args.busy_timeout))
+        try:
+            stats = simulate(args.cashiers, args.kitchen, args.duration, think_ms)
+        finally:
+            db.set_backend(None)  # closes the pool's connections to the copy
+            bench_data.remove_database(copy)
+    print(report(stats))
+
+
+if __name__ == "__main__":
+    main()
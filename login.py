@@ -1,12 +1,13 @@
 import sys
-from mysql.connector import Error
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLineEdit, QPushButton,
     QMessageBox, QLabel, QHBoxLayout
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QIcon
-from db import kuha_databse  # <-- your database connection file
+from workers import run_query
+from services import auth_service
+from main_window import navigate
 
 
 class Login(QWidget):
@@ -14,10 +15,7 @@ class Login(QWidget):
         self.user_data = user_data
         super().__init__()
         self.setWindowTitle("Login")
-        self.setGeometry(0, 0, 1920, 1080)
         self.setStyleSheet("background-color: #4A0E13; color: white;")
-        self.setWindowIcon(QIcon('Logo (2).png'))
-        self.showMaximized()
         
         # --- Outer layout ---
         outer_layout = QHBoxLayout()
@@ -75,6 +73,7 @@ class Login(QWidget):
 
         # --- Login Button ---
         login_btn = QPushButton("Login")
+        self.login_btn = login_btn
         login_btn.setFont(QFont("Arial", 14, QFont.Weight.Bold))
         login_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         login_btn.setStyleSheet("""
@@ -114,12 +113,12 @@ class Login(QWidget):
         outer_layout.addWidget(self.container)
         self.setLayout(outer_layout)
 
+    def refresh(self):
+        self.password_input.clear()
+
     # --- Open Register Page ---
     def open_register_page(self):
-        from register import Register
-        self.hide()
-        self.register_window = Register()
-        self.register_window.showMaximized()
+        navigate(self, "register")
 
     # --- Check Login ---
     def check_login(self):
@@ -130,49 +129,37 @@ class Login(QWidget):
             QMessageBox.warning(self, "Error", "Please fill in all fields.")
             return
 
-        connection = None
-        try:
-            connection = kuha_databse()
-            cursor = connection.cursor(dictionary=True)
-
-            query = """
-                SELECT a.ID, a.role, c.customer_id, c.name AS Fullname, c.email, c.phone, c.address
-                FROM accounts a
-                LEFT JOIN customers c
-                ON a.ID = c.account_id
-                WHERE username = %s AND password = %s
-            """
-            cursor.execute(query, (username, password))
-            user = cursor.fetchone()
-        
-            if user:
-                role = user["role"].lower()
-                QMessageBox.information(self, "Login Successful", f"Welcome, {username} ({role})!")
-
-                if role == "admin":
-                    self.open_admin_page(user)
-                else:
-                    self.open_user_home(user)
+        self.login_btn.setEnabled(False)
+        self.login_btn.setText("Logging in...")
+        run_query(auth_service.login, lambda user: self.on_login_result(username, user),
+                  self.on_login_failed, username, password, owner=self)
+
+    def on_login_result(self, username, user):
+        self.reset_login_button()
+        if user:
+            role = user["role"].lower()
+            QMessageBox.information(self, "Login Successful", f"Welcome, {username} ({role})!")
+
+            if role == "admin":
+                self.open_admin_page(user)
             else:
-                QMessageBox.warning(self, "Login Failed", "Invalid username or password.")
+                self.open_user_home(user)
+        else:
+            QMessageBox.warning(self, "Login Failed", "Invalid username or password.")
+
+    def on_login_failed(self, e):
+        self.reset_login_button()
+        QMessageBox.critical(self, "Database Error", f"Error: {e}")
 
-        except Error as e:
-            QMessageBox.critical(self, "Database Error", f"Error: {e}")
-        finally:
-            if connection and connection.is_connected():
-                connection.close()
+    def reset_login_button(self):
+        self.login_btn.setEnabled(True)
+        self.login_btn.setText("Login")
 
     # --- Open User Home Page ---
     def open_user_home(self, user_data):
-        from user_home import CustomerHomePage
-        self.home = CustomerHomePage(user_data)
-        self.home.showMaximized()
-        self.close()
+        navigate(self, "home", user_data)
 
     # --- Open Admin Page ---
     def open_admin_page(self, user_data):
-        from AdminDashboard import AdminDashboard
-        self.admin = AdminDashboard(user_data)
-        self.admin.showMaximized()
-        self.close()
+        navigate(self, "admin", user_data)
 
@@ -0,0 +1,91 @@
+"""The single top-level window that hosts every page.
+
+Pages are created the first time they are shown and then kept in a
+QStackedWidget. Showing a cached page again only calls its refresh()
+method, so navigation does not rebuild widgets, reload the logo or
+reapply stylesheets.
+"""
+from functools import lru_cache
+from importlib import import_module
+
+from PyQt6.QtWidgets import QMainWindow, QStackedWidget
+from PyQt6.QtGui import QPixmap, QIcon
+from PyQt6.QtCore import Qt
+
+LOGO_PATH = "Logo (2).png"
+
+# page name -> (module, class, needs the signed-in user)
+PAGES = {
+    "welcome": ("MAIn", "WelcomePage", False),
+    "login": ("login", "Login", False),
+    "register": ("register", "Register", False),
+    "home": ("user_home", "CustomerHomePage", True),
+    "pos": ("POS", "POSPage", True),
+    "orders": ("order", "CustomerOrders", True),
+    "admin": ("AdminDashboard", "AdminDashboard", True),
+    "manage_orders": ("ManageOrders", "ManageOrders", True),
+    "manage_menu": ("ManageMenu", "ManageMenu", True),
+}
+
+
+@lru_cache(maxsize=None)
+def logo_pixmap(width, height):
+    """The logo scaled once per size and shared by every page."""
+    pixmap = QPixmap(LOGO_PATH)
+    return pixmap.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+
+class MainWindow(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Food Ordering System")
+        self.setGeometry(0, 0, 1920, 1080)
+        self.setWindowIcon(QIcon(LOGO_PATH))
+
+        self.stack = QStackedWidget()
+        self.setCentralWidget(self.stack)
+        self.pages = {}
+        self.user_data = None
+
+    def show_page(self, name, user_data=None):
+        if user_data is not None and user_data != self.user_data:
+            # A different account signed in; its pages must not show old data
+            self.drop_user_pages()
+            self.user_data = user_data
+
+        page = self.pages.get(name)
+        if page is None:
+            page = self.create_page(name)
+            self.pages[name] = page
+            self.stack.addWidget(page)
+        elif hasattr(page, "refresh"):
+            page.refresh()
+
+        self.stack.setCurrentWidget(page)
+        if page.windowTitle():
+            self.setWindowTitle(page.windowTitle())
+
+    def create_page(self, name):
+        module_name, class_name, needs_user = PAGES[name]
+        cls = getattr(import_module(module_name), class_name)
+        return cls(self.user_data) if needs_user else cls()
+
+    def drop_user_pages(self):
+        for name in [n for n in self.pages if PAGES[n][2]]:
+            page = self.pages.pop(name)
+            self.stack.removeWidget(page)
+            page.deleteLater()
+
+    def logout(self):
+        self.drop_user_pages()
+        self.user_data = None
+        self.show_page("login")
+
+
+def navigate(widget, name, user_data=None):
+    """Switch the window hosting widget to another page."""
+    widget.window().show_page(name, user_data)
+
+
+def logout(widget):
+    widget.window().logout()
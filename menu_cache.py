@@ -0,0 +1,87 @@
+"""Process-wide cache of the menu catalog.
+
+The database keeps a single version stamp in ``menu_version``. Every menu
+write bumps it and stamps the touched row (``menu_items.row_version``) or
+records a tombstone (``menu_item_deletions``). Readers compare the stamp
+with the version they last saw and, when it moved, fetch only the rows
+changed since then.
+"""
+import threading
+
+from db import db_connection
+
+
+class MenuCache:
+    def __init__(self):
+        self._rows = {}  # item_id -> (item_id, name, category, price)
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get_items(self):
+        """Current catalog as (item_id, name, category, price) rows."""
+        return self.get_catalog()[1]
+
+    def get_catalog(self):
+        """(menu version, rows); an unchanged version means unchanged rows."""
+        with self._lock:
+            with db_connection() as db:
+                cursor = db.cursor()
+                cursor.execute("SELECT version FROM menu_version WHERE id = 1")
+                row = cursor.fetchone()
+                version = row[0] if row else 0
+
+                if self._version is None:
+                    cursor.execute("SELECT item_id, name, category, price FROM menu_items")
+                    self._rows = {r[0]: tuple(r) for r in cursor.fetchall()}
+                elif version != self._version:
+                    self._apply_changes(cursor, self._version)
+                cursor.close()
+
+            self._version = version
+            return version, [self._rows[item_id] for item_id in sorted(self._rows)]
+
+    def invalidate(self):
+        with self._lock:
+            self._rows = {}
+            self._version = None
+
+    def _apply_changes(self, cursor, since):
+        # Tombstones first: an id deleted and then reused comes back with the upserts
+        cursor.execute("SELECT item_id FROM menu_item_deletions WHERE version > %s", (since,))
+        for (item_id,) in cursor.fetchall():
+            self._rows.pop(item_id, None)
+
+        cursor.execute(
+            "SELECT item_id, name, category, price FROM menu_items WHERE row_version > %s",
+            (since,)
+        )
+        for r in cursor.fetchall():
+            self._rows[r[0]] = tuple(r)
+
+
+menu_cache = MenuCache()
+
+
+def bump_menu_version(cursor):
+    """Advance the catalog version inside the caller's transaction."""
+    cursor.execute("UPDATE menu_version SET version = version + 1 WHERE id = 1")
+    cursor.execute("SELECT version FROM menu_version WHERE id = 1")
+    return cursor.fetchone()[0]
+
+
+def mark_items_changed(cursor, item_ids):
+    version = bump_menu_version(cursor)
+    cursor.executemany(
+        "UPDATE menu_items SET row_version = %s WHERE item_id = %s",
+        [(version, item_id) for item_id in item_ids]
+    )
+    return version
+
+
+def mark_items_deleted(cursor, item_ids):
+    version = bump_menu_version(cursor)
+    cursor.executemany(
+        "INSERT INTO menu_item_deletions (item_id, version) VALUES (%s, %s)",
+        [(item_id, version) for item_id in item_ids]
+    )
+    return version
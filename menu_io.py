@@ -0,0 +1,127 @@
+"""Import and export of the menu catalog as CSV or JSON.
+
+Items are matched on their name, so importing a file from another branch
+updates prices and categories in place and adds whatever is missing.
+Files are read row by row and written in batches with executemany; the
+whole import is one transaction and one menu version bump.
+"""
+import csv
+import json
+import os
+from decimal import Decimal, InvalidOperation
+
+from db import db_connection, get_backend
+from menu_cache import bump_menu_version
+
+FIELDS = ["name", "category", "price"]
+BATCH_SIZE = 500
+
+
+def file_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".json", ".jsonl"):
+        return ext[1:]
+    raise ValueError(f"Unsupported file type: {ext or path}")
+
+
+# --- Reading ---
+def read_items(path):
+    """Yield (name, category, price) for every item in a CSV or JSON file."""
+    fmt = file_format(path)
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if fmt == "csv":
+            records = csv.DictReader(f)
+        elif fmt == "jsonl":
+            records = (json.loads(line) for line in f if line.strip())
+        else:
+            # A JSON array has to be parsed whole; use .jsonl for very large files
+            records = json.load(f)
+        for line, record in enumerate(records, start=1):
+            yield parse_item(record, line)
+
+
+def parse_item(record, line):
+    if not isinstance(record, dict):
+        raise ValueError(f"Item {line}: expected an object with name, category and price")
+    name = str(record.get("name") or "").strip()
+    if not name:
+        raise ValueError(f"Item {line}: name is required")
+    category = str(record.get("category") or "").strip() or None
+    try:
+        price = Decimal(str(record.get("price", "0")).replace("₱", "").strip() or "0")
+    except InvalidOperation:
+        raise ValueError(f"Item {line}: invalid price {record.get('price')!r}")
+    if price < 0:
+        raise ValueError(f"Item {line}: price cannot be negative")
+    return name, category, price
+
+
+# --- Import ---
+def import_items(items, progress=None, batch_size=BATCH_SIZE):
+    """Upsert items by name in one transaction; returns how many were read.
+
+    progress(count) is called after every batch.
+    """
+    sql = get_backend().upsert_sql("menu_items", FIELDS + ["row_version"], "name")
+    count = 0
+    with db_connection() as db:
+        cursor = db.cursor()
+        version = bump_menu_version(cursor)
+        batch = []
+        for name, category, price in items:
+            batch.append((name, category, price, version))
+            if len(batch) >= batch_size:
+                cursor.executemany(sql, batch)
+                count += len(batch)
+                batch = []
+                if progress:
+                    progress(count)
+        if batch:
+            cursor.executemany(sql, batch)
+            count += len(batch)
+        db.commit()
+        cursor.close()
+    if progress:
+        progress(count)
+    return count
+
+
+def import_file(path, progress=None):
+    return import_items(read_items(path), progress)
+
+
+# --- Export ---
+def export_file(path, batch_size=BATCH_SIZE):
+    """Write every menu item to path; returns how many were written."""
+    fmt = file_format(path)
+    count = 0
+    with db_connection() as db, open(path, "w", newline="", encoding="utf-8") as f:
+        cursor = db.cursor()
+        cursor.execute("SELECT name, category, price FROM menu_items ORDER BY item_id")
+        writer = csv.writer(f) if fmt == "csv" else None
+        if writer:
+            writer.writerow(FIELDS)
+        elif fmt == "json":
+            f.write("[")
+
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for name, category, price in rows:
+                if writer:
+                    writer.writerow([name, category or "", f"{price:.2f}"])
+                else:
+                    record = json.dumps({"name": name, "category": category, "price": float(price)},
+                                        ensure_ascii=False)
+                    if fmt == "jsonl":
+                        f.write(record + "\n")
+                    else:
+                        f.write(("," if count else "") + "\n  " + record)
+                count += 1
+        if fmt == "json":
+            f.write("\n]\n")
+        cursor.close()
+    return count
@@ -0,0 +1,107 @@
+"""In-memory search index for menu items.
+
+Names are normalized once (case-folded, accents stripped, punctuation
+collapsed) and broken into 1-, 2- and 3-character grams. A query looks up
+the posting sets for its grams, intersects them and only then confirms the
+substring match, so a search never scans the whole catalog.
+"""
+import re
+import unicodedata
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", str(text or "")).casefold()
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def _grams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class MenuSearchIndex:
+    """Index over rows whose name and category sit at fixed positions."""
+
+    def __init__(self, items, name_index=1, category_index=None):
+        self.items = list(items)
+        self.names = [normalize(item[name_index]) for item in self.items]
+        self.categories = [
+            item[category_index] if category_index is not None else None
+            for item in self.items
+        ]
+
+        self._grams = {1: {}, 2: {}, 3: {}}
+        for pos, name in enumerate(self.names):
+            for n, postings in self._grams.items():
+                for gram in _grams(name, n):
+                    postings.setdefault(gram, set()).add(pos)
+
+        self._by_category = {}
+        for pos, category in enumerate(self.categories):
+            self._by_category.setdefault(category, set()).add(pos)
+
+        # Typing usually extends the previous query, so narrow from its hits
+        self._last_query = None
+        self._last_hits = None
+
+    # --- Queries ---
+    def search(self, text, category=None):
+        """Items whose name contains text, best matches first."""
+        query = normalize(text)
+        hits = self._match(query)
+        if category is not None:
+            hits = hits & self._by_category.get(category, set())
+        return [self.items[pos] for pos in self._rank(query, hits)]
+
+    def facet_counts(self, text=""):
+        """Number of matches per category for the given query."""
+        hits = self._match(normalize(text))
+        return {
+            category: len(hits & positions)
+            for category, positions in self._by_category.items()
+            if category is not None
+        }
+
+    # --- Internals ---
+    def _match(self, query):
+        if not query:
+            return set(range(len(self.items)))
+
+        if self._last_query and query.startswith(self._last_query):
+            candidates = self._last_hits
+        else:
+            candidates = None
+
+        n = min(len(query), 3)
+        postings = self._grams[n]
+        for gram in sorted(_grams(query, n), key=lambda g: len(postings.get(g, ()))):
+            found = postings.get(gram)
+            if not found:
+                candidates = set()
+                break
+            candidates = found.copy() if candidates is None else candidates & found
+            if not candidates:
+                break
+
+        if len(query) > 3:
+            # Grams can all be present without forming the whole query
+            candidates = {pos for pos in candidates if query in self.names[pos]}
+
+        self._last_query, self._last_hits = query, candidates
+        return candidates
+
+    def _rank(self, query, hits):
+        if not query:
+            return sorted(hits)
+
+        def rank(pos):
+            name = self.names[pos]
+            if name.startswith(query):
+                return (0, pos)
+            if (" " + query) in name:
+                return (1, pos)
+            return (2, pos)
+
+        return sorted(hits, key=rank)
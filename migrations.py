@@ -0,0 +1,532 @@
+"""Versioned schema migrations for the Ced's Foodie database.
+
+Each migration has a version number, a description and a list of steps.
+A step is a SQL statement for both dialects, a {"mysql": ..., "sqlite": ...}
+dict, or a callable taking (cursor, backend). Applied versions are
+recorded in ``schema_migrations``; ``migrate`` runs the missing ones in
+order, each committed on its own.
+
+Column and index steps check the live schema first, so databases created
+by older builds (which added some of these pieces on the fly) upgrade
+cleanly.
+"""
+from datetime import datetime
+
+import sales_rollup
+
+
+class MigrationError(Exception):
+    """A migration cannot be applied until the data is fixed by hand."""
+
+
+# --- Step helpers ---
+def add_column(table, column, definitions, backfill=()):
+    """Add a column if the table lacks it, then run the backfill statements."""
+    def step(cursor, backend):
+        if column in backend.table_columns(cursor, table):
+            return
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definitions[backend.name]}")
+        for statement in backfill:
+            cursor.execute(statement)
+    return step
+
+
+def add_index(table, name, columns, unique=False):
+    def step(cursor, backend):
+        if name in backend.table_indexes(cursor, table):
+            return
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        cursor.execute(f"CREATE {kind} {name} ON {table} ({', '.join(columns)})")
+    return step
+
+
+def require_unique(table, columns, shown=20):
+    """Stop with the duplicated values listed before a unique index would fail on them."""
+    def step(cursor, backend):
+        key = ", ".join(columns)
+        cursor.execute(f"SELECT {key}, COUNT(*) FROM {table} GROUP BY {key} HAVING COUNT(*) > 1 ORDER BY {key}")
+        duplicates = cursor.fetchall()
+        if not duplicates:
+            return
+        listed = "\n".join(f"  {', '.join(map(str, row[:-1]))} ({row[-1]} rows)" for row in duplicates[:shown])
+        if len(duplicates) > shown:
+            listed += f"\n  ... and {len(duplicates) - shown} more"
+        raise MigrationError(f"{table}.{key} must be unique; rename or merge these first:\n{listed}")
+    return step
+
+
+def drop_index(table, name):
+    def step(cursor, backend):
+        if name not in backend.table_indexes(cursor, table):
+            return
+        cursor.execute(f"DROP INDEX {name} ON {table}" if backend.name == "mysql" else f"DROP INDEX {name}")
+    return step
+
+
+def build_sales_rollups(cursor, backend):
+    sales_rollup.ensure_built(cursor, backend)
+
+
+MIGRATIONS = [
+    (1, "Base tables", [
+        {
+            "mysql": """
+                CREATE TABLE IF NOT EXISTS accounts (
+                    ID INT AUTO_INCREMENT PRIMARY KEY,
+                    username VARCHAR(50) NOT NULL,
+                    password VARCHAR(255) NOT NULL,
+                    role VARCHAR(20) NOT NULL DEFAULT 'customer'
+                ) ENGINE=InnoDB
+            """,
+            "sqlite": """
+                CREATE TABLE IF NOT EXISTS accounts (
+                    ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT NOT NULL,
+                    password TEXT NOT NULL,
+                    role TEXT NOT NULL DEFAULT 'customer'
+                )
+            """,
+        },
+        {
+            "mysql": """
+                CREATE TABLE IF NOT EXISTS customers (
+                    customer_id INT AUTO_INCREMENT PRIMARY KEY,
+                    account_id INT NOT NULL,
+                    name VARCHAR(100) NOT NULL,
+                    email VARCHAR(100) NOT NULL,
+                    phone VARCHAR(30),
+                    address VARCHAR(255),
+                    FOREIGN KEY (account_id) REFERENCES accounts(ID)
+                ) ENGINE=InnoDB
+            """,
+            "sqlite": """
+                CREATE TABLE IF NOT EXISTS customers (
+                    customer_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    account_id INTEGER NOT NULL REFERENCES accounts(ID),
+                    name TEXT NOT NULL,
+                    email TEXT NOT NULL,
+                    phone TEXT,
+                    address TEXT
+                )
+            """,
+        },
+        {
+            "mysql": """
+                CREATE TABLE IF NOT EXISTS menu_items (
+                    item_id INT AUTO_INCREMENT PRIMARY KEY,
+                    name VARCHAR(100) NOT NULL,
+                    category VARCHAR(50),
+                    price DECIMAL(10, 2) NOT NULL DEFAULT 0
+                ) ENGINE=InnoDB
+            """,
+            "sqlite": """
+                CREATE TABLE IF NOT EXISTS menu_items (
+                    item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    category TEXT,
+                    price REAL NOT NULL DEFAULT 0
+                )
+            """,
+        },
+        {
+            "mysql": """
+                CREATE TABLE IF NOT EXISTS orders (
+                    order_id INT AUTO_INCREMENT PRIMARY KEY,
+                    customer_id INT,
+                    order_date DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    status VARCHAR(20) NOT NULL DEFAULT 'Pending',
+                    total_amount DECIMAL(10, 2) NOT NULL DEFAULT 0,
+                    FOREIGN KEY (customer_id) REFERENCES customers(customer_id)
+                ) ENGINE=InnoDB
+            """,
+            "sqlite": """
+                CREATE TABLE IF NOT EXISTS orders (
+                    order_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    customer_id INTEGER REFERENCES customers(customer_id),
+                    order_date DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+                    status TEXT NOT NULL DEFAULT 'Pending',
+                    total_amount REAL NOT NULL DEFAULT 0
+                )
+            """,
+        },
+        {
+            "mysql": """
+                CREATE TABLE IF NOT EXISTS order_items (
+                    order_item_id INT AUTO_INCREMENT PRIMARY KEY,
+                    order_id INT NOT NULL,
+                    item_id INT NOT NULL,
+                    quantity INT NOT NULL DEFAULT 1,
+                    subtotal DECIMAL(10, 2) NOT NULL DEFAULT 0,
+                    FOREIGN KEY (order_id) REFERENCES orders(order_id),
+                    FOREIGN KEY (item_id) REFERENCES menu_items(item_id)
+                ) ENGINE=InnoDB
+            """,
+            "sqlite": """
+                CREATE TABLE IF NOT EXISTS order_items (
+                    order_item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    order_id INTEGER NOT NULL REFERENCES orders(order_id),
+                    item_id INTEGER NOT NULL REFERENCES menu_items(item_id),
+                    quantity INTEGER NOT NULL DEFAULT 1,
+                    subtotal REAL NOT NULL DEFAULT 0
+                )
+            """,
+        },
+        {
+            "mysql": """
+                CREATE TABLE IF NOT EXISTS payments (
+                    payment_id INT AUTO_INCREMENT PRIMARY KEY,
+                    order_id INT NOT NULL,
+                    payment_method VARCHAR(30) NOT NULL DEFAULT 'Cash',
+                    amount_paid DECIMAL(10, 2) NOT NULL DEFAULT 0,
+                    change_amount DECIMAL(10, 2) NOT NULL DEFAULT 0,
+                    payment_date DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (order_id) REFERENCES orders(order_id)
+                ) ENGINE=InnoDB
+            """,
+            "sqlite": """
+                CREATE TABLE IF NOT EXISTS payments (
+                    payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    order_id INTEGER NOT NULL REFERENCES orders(order_id),
+                    payment_method TEXT NOT NULL DEFAULT 'Cash',
+                    amount_paid REAL NOT NULL DEFAULT 0,
+                    change_amount REAL NOT NULL DEFAULT 0,
+                    payment_date DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+                )
+            """,
+        },
+    ]),
+
+    # Catalog version stamp bumped by every menu change (see menu_cache.py)
+    (2, "Menu catalog versioning", [
+        add_column("menu_items", "row_version", {
+            "mysql": "INT NOT NULL DEFAULT 0",
+            "sqlite": "INTEGER NOT NULL DEFAULT 0",
+        }),
+        add_index("menu_items", "idx_menu_items_row_version", ["row_version"]),
+        {
+            "mysql": """
+                CREATE TABLE IF NOT EXISTS menu_version (
+                    id INT PRIMARY KEY,
+                    version INT NOT NULL DEFAULT 0
+                ) ENGINE=InnoDB
+            """,
+            "sqlite": """
+                CREATE TABLE IF NOT EXISTS menu_version (
+                    id INTEGER PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0
+                )
+            """,
+        },
+        {
+            "mysql": "INSERT IGNORE INTO menu_version (id, version) VALUES (1, 0)",
+            "sqlite": "INSERT OR IGNORE INTO menu_version (id, version) VALUES (1, 0)",
+        },
+        {
+            "mysql": """
+                CREATE TABLE IF NOT EXISTS menu_item_deletions (
+                    item_id INT PRIMARY KEY,
+                    version INT NOT NULL
+                ) ENGINE=InnoDB
+            """,
+            "sqlite": """
+                CREATE TABLE IF NOT EXISTS menu_item_deletions (
+                    item_id INTEGER PRIMARY KEY,
+                    version INTEGER NOT NULL
+                )
+            """,
+        },
+        add_index("menu_item_deletions", "idx_menu_item_deletions_version", ["version"]),
+    ]),
+
+    # Natural key for menu imports (see menu_io.py)
+    (3, "Unique menu item names", [
+        require_unique("menu_items", ["name"]),
+        add_index("menu_items", "uq_menu_items_name", ["name"], unique=True),
+    ]),
+
+    # Live order feed in ManageOrders polls on updated_at
+    (4, "Order change tracking", [
+        add_column("orders", "updated_at", {
+            "mysql": "DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP",
+            # SQLite cannot add a column with a non-constant default; triggers fill it in
+            "sqlite": "DATETIME NOT NULL DEFAULT '1970-01-01 00:00:00'",
+        }, backfill=["UPDATE orders SET updated_at = order_date"]),
+        {
+            "sqlite": """
+                CREATE TRIGGER IF NOT EXISTS trg_orders_updated_at_insert
+                AFTER INSERT ON orders
+                FOR EACH ROW WHEN NEW.updated_at = '1970-01-01 00:00:00'
+                BEGIN
+                    UPDATE orders SET updated_at = datetime('now', 'localtime') WHERE order_id = NEW.order_id;
+                END
+            """,
+        },
+        # Same effect as MySQL's ON UPDATE CURRENT_TIMESTAMP
+        {
+            "sqlite": """
+                CREATE TRIGGER IF NOT EXISTS trg_orders_updated_at
+                AFTER UPDATE ON orders
+                FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+                BEGIN
+                    UPDATE orders SET updated_at = datetime('now', 'localtime') WHERE order_id = NEW.order_id;
+                END
+            """,
+        },
+        add_index("orders", "idx_orders_updated", ["updated_at"]),
+    ]),
+
+    # Keyset pagination in ManageOrders walks these newest-first
+    (5, "Order list indexes", [
+        add_index("orders", "idx_orders_date", ["order_date", "order_id"]),
+        add_index("orders", "idx_orders_status_date", ["status", "order_date", "order_id"]),
+    ]),
+
+    (6, "Unit price on order items", [
+        add_column("order_items", "unit_price", {
+            "mysql": "DECIMAL(10, 2) NOT NULL DEFAULT 0 AFTER quantity",
+            "sqlite": "REAL NOT NULL DEFAULT 0",
+        }, backfill=[
+            # The price actually charged, recovered from the stored subtotal
+            "UPDATE order_items SET unit_price = ROUND(subtotal / quantity, 2) WHERE quantity > 0",
+        ]),
+        # Covering indexes: revenue sums read these without touching the table
+        add_index("order_items", "idx_order_items_order_sales", ["order_id", "item_id", "quantity", "unit_price"]),
+        add_index("order_items", "idx_order_items_item_sales", ["item_id", "quantity", "unit_price"]),
+    ]),
+
+    # Kept current by checkout and status changes (see sales_rollup.py)
+    (7, "Sales rollups", [
+        {
+            "mysql": """
+                CREATE TABLE IF NOT EXISTS sales_item_hourly (
+                    item_id INT NOT NULL,
+                    sale_hour DATETIME NOT NULL,
+                    quantity INT NOT NULL DEFAULT 0,
+                    revenue DECIMAL(12, 2) NOT NULL DEFAULT 0,
+                    order_count INT NOT NULL DEFAULT 0,
+                    PRIMARY KEY (item_id, sale_hour)
+                ) ENGINE=InnoDB
+            """,
+            "sqlite": """
+                CREATE TABLE IF NOT EXISTS sales_item_hourly (
+                    item_id INTEGER NOT NULL,
+                    sale_hour DATETIME NOT NULL,
+                    quantity INTEGER NOT NULL DEFAULT 0,
+                    revenue REAL NOT NULL DEFAULT 0,
+                    order_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (item_id, sale_hour)
+                )
+            """,
+        },
+        add_index("sales_item_hourly", "idx_sales_item_hourly_hour", ["sale_hour"]),
+        {
+            "mysql": """
+                CREATE TABLE IF NOT EXISTS sales_item_daily (
+                    item_id INT NOT NULL,
+                    sale_date DATE NOT NULL,
+                    quantity INT NOT NULL DEFAULT 0,
+                    revenue DECIMAL(12, 2) NOT NULL DEFAULT 0,
+                    order_count INT NOT NULL DEFAULT 0,
+                    PRIMARY KEY (item_id, sale_date)
+                ) ENGINE=InnoDB
+            """,
+            "sqlite": """
+                CREATE TABLE IF NOT EXISTS sales_item_daily (
+                    item_id INTEGER NOT NULL,
+                    sale_date DATE NOT NULL,
+                    quantity INTEGER NOT NULL DEFAULT 0,
+                    revenue REAL NOT NULL DEFAULT 0,
+                    order_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (item_id, sale_date)
+                )
+            """,
+        },
+        add_index("sales_item_daily", "idx_sales_item_daily_date", ["sale_date"]),
+        {
+            "mysql": """
+                CREATE TABLE IF NOT EXISTS sales_rollup_state (
+                    id INT PRIMARY KEY,
+                    built INT NOT NULL DEFAULT 0
+                ) ENGINE=InnoDB
+            """,
+            "sqlite": """
+                CREATE TABLE IF NOT EXISTS sales_rollup_state (
+                    id INTEGER PRIMARY KEY,
+                    built INTEGER NOT NULL DEFAULT 0
+                )
+            """,
+        },
+        {
+            "mysql": "INSERT IGNORE INTO sales_rollup_state (id, built) VALUES (1, 0)",
+            "sqlite": "INSERT OR IGNORE INTO sales_rollup_state (id, built) VALUES (1, 0)",
+        },
+        # Filled in by migration 9, together with the order rollups
+    ]),
+
+    # One index per lookup the pages make on every screen load
+    (8, "Hot path indexes", [
+        # login.py / register.py: account by username, customer by email
+        add_index("accounts", "idx_accounts_username", ["username"]),
+        add_index("customers", "idx_customers_account", ["account_id"]),
+        add_index("customers", "idx_customers_email", ["email"]),
+        # order.py / user_home.py: a customer's orders, newest first
+        add_index("orders", "idx_orders_customer_date", ["customer_id", "order_date"]),
+        add_index("payments", "idx_payments_order", ["order_id"]),
+        # sales_analytics.py: revenue over a date range without reading the rows
+        add_index("orders", "idx_orders_date_sales", ["order_date", "status", "total_amount"]),
+    ]),
+
+    # The dashboard reads only rollups: order counts and revenue per hour and
+    # per day here, best sellers from the per-item tables of migration 7
+    (9, "Order rollups", [
+        {
+            "mysql": """
+                CREATE TABLE IF NOT EXISTS sales_hourly (
+                    sale_hour DATETIME PRIMARY KEY,
+                    order_count INT NOT NULL DEFAULT 0,
+                    revenue DECIMAL(12, 2) NOT NULL DEFAULT 0
+                ) ENGINE=InnoDB
+            """,
+            "sqlite": """
+                CREATE TABLE IF NOT EXISTS sales_hourly (
+                    sale_hour DATETIME PRIMARY KEY,
+                    order_count INTEGER NOT NULL DEFAULT 0,
+                    revenue REAL NOT NULL DEFAULT 0
+                )
+            """,
+        },
+        {
+            "mysql": """
+                CREATE TABLE IF NOT EXISTS sales_daily (
+                    sale_date DATE PRIMARY KEY,
+                    order_count INT NOT NULL DEFAULT 0,
+                    revenue DECIMAL(12, 2) NOT NULL DEFAULT 0
+                ) ENGINE=InnoDB
+            """,
+            "sqlite": """
+                CREATE TABLE IF NOT EXISTS sales_daily (
+                    sale_date DATE PRIMARY KEY,
+                    order_count INTEGER NOT NULL DEFAULT 0,
+                    revenue REAL NOT NULL DEFAULT 0
+                )
+            """,
+        },
+        # No longer read: the order rollups replace range scans over orders
+        drop_index("orders", "idx_orders_date_sales"),
+        # Rebuild all four rollups from the order history
+        "UPDATE sales_rollup_state SET built = 0 WHERE id = 1",
+        build_sales_rollups,
+    ]),
+
+    # A reused item_id gets a tombstone of its own instead of colliding with the old one
+    (10, "Tombstones per item and version", [
+        {
+            "mysql": "ALTER TABLE menu_item_deletions DROP PRIMARY KEY, ADD PRIMARY KEY (item_id, version)",
+            "sqlite": [
+                """
+                CREATE TABLE menu_item_deletions_new (
+                    item_id INTEGER NOT NULL,
+                    version INTEGER NOT NULL,
+                    PRIMARY KEY (item_id, version)
+                )
+                """,
+                "INSERT INTO menu_item_deletions_new (item_id, version) SELECT item_id, version FROM menu_item_deletions",
+                "DROP TABLE menu_item_deletions",
+                "ALTER TABLE menu_item_deletions_new RENAME TO menu_item_deletions",
+            ],
+        },
+        add_index("menu_item_deletions", "idx_menu_item_deletions_version", ["version"]),
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# --- Running ---
+def ensure_migrations_table(cursor, backend):
+    if backend.name == "mysql":
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INT PRIMARY KEY,
+                description VARCHAR(255) NOT NULL,
+                applied_at DATETIME NOT NULL
+            ) ENGINE=InnoDB
+        """)
+    else:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at DATETIME NOT NULL
+            )
+        """)
+
+
+def applied_versions(cursor):
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def pending(connection, backend):
+    """[(version, description)] not yet applied to this database."""
+    cursor = connection.cursor()
+    ensure_migrations_table(cursor, backend)
+    connection.commit()
+    done = applied_versions(cursor)
+    cursor.close()
+    return [(version, description) for version, description, _ in MIGRATIONS if version not in done]
+
+
+def run_step(cursor, backend, step):
+    if callable(step):
+        step(cursor, backend)
+        return
+    statements = step.get(backend.name) if isinstance(step, dict) else step
+    if statements is None:
+        return
+    for statement in [statements] if isinstance(statements, str) else statements:
+        cursor.execute(statement)
+
+
+def migrate(connection, backend):
+    """Apply every pending migration; returns the versions applied.
+
+    Each one runs under the backend's migration lock and is skipped if
+    another terminal applied it while this one waited.
+    """
+    todo = {version for version, _ in pending(connection, backend)}
+    applied = []
+    cursor = connection.cursor()
+    for version, description, steps in MIGRATIONS:
+        if version not in todo:
+            continue
+        with backend.migration_lock(connection):
+            if version in applied_versions(cursor):
+                continue
+            try:
+                for step in steps:
+                    run_step(cursor, backend, step)
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, description, applied_at) VALUES (%s, %s, %s)",
+                    (version, description, datetime.now())
+                )
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                cursor.close()
+                raise
+        applied.append(version)
+    cursor.close()
+    return applied
+
+
+def check_at_startup():
+    """Migrate the configured database before any page opens.
+
+    The first connection of a run applies pending migrations; doing it here
+    means a failure is reported once at startup instead of by whichever
+    page queries first.
+    """
+    from db import db_connection  # db imports backends, which imports this module
+    with db_connection() as db:
+        db.ping()
@@ -0,0 +1,95 @@
+"""matplotlib versions of the dashboard charts (FOODIE_CHARTS=matplotlib).
+
+Only imported when that renderer is selected; see AdminDashboard.chart_classes.
+"""
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+from charts import top_with_other
+
+
+class SalesBarGraph(FigureCanvas):
+    def __init__(self):
+        self.fig = Figure(facecolor="#121212")
+        super().__init__(self.fig)
+        self.ax = self.fig.add_subplot(111)
+        self.fig.subplots_adjust(bottom=0.25)
+        self.artists = None  # bars or line kept for in-place updates
+        self.show_message("Loading sales data...")
+
+    def show_message(self, text):
+        self.artists = None
+        self.ax.clear()
+        self.ax.axis("off")
+        self.ax.text(0.5, 0.5, text,
+                    color="white", ha="center", va="center", fontsize=14)
+        self.draw_idle()
+
+    def plot_sales(self, results):
+        """results are (name, total_sales, ...) rows, best sellers first."""
+        rows = top_with_other(results)
+        items = [name for name, _ in rows]
+        totals = [total for _, total in rows]
+        if self.artists is not None and self.artists[0] == items:
+            # Same items as last time: only the bar heights change
+            for bar, total in zip(self.artists[1], totals):
+                bar.set_height(total)
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self.draw_idle()
+            return
+
+        self.ax.clear()
+        self.ax.axis("on")
+        self.artists = None
+        if results:
+            self.artists = (items, self.ax.bar(items, totals, color="#4CAF50"))
+            self.ax.set_facecolor("#1E1E1E")
+            self.ax.set_title("Total Sales per Menu Item", color="white", fontsize=16, pad=20)
+            self.ax.set_xlabel("Menu Items", color="white", fontsize=12)
+            self.ax.set_ylabel("Total Sales (₱)", color="white", fontsize=12)
+            self.ax.tick_params(axis='x', rotation=25, colors='white')
+            self.ax.tick_params(axis='y', colors='white')
+
+            for spine in self.ax.spines.values():
+                spine.set_color("white")
+
+            self.fig.tight_layout()
+        else:
+            self.ax.axis("off")
+            self.ax.text(0.5, 0.5, "No sales data found",
+                        color="white", ha="center", va="center", fontsize=14)
+        self.draw_idle()
+
+
+class SalesTrendGraph(SalesBarGraph):
+    """Revenue, orders or average ticket per hour, day or week as a line."""
+
+    def plot_trend(self, buckets, values, label, metric="Revenue"):
+        if len(buckets) == 0 or not values.any():
+            self.show_message("No sales data found")
+            return
+
+        times = buckets.astype("datetime64[s]").astype(object)
+        if self.artists is not None:
+            # Reuse the line; only its data and the title change
+            self.artists.set_data(times, values)
+            self.ax.set_title(f"{metric} per {label}", color="white", fontsize=16, pad=20)
+            self.ax.set_ylabel(metric, color="white", fontsize=12)
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self.draw_idle()
+            return
+
+        self.ax.clear()
+        self.ax.axis("on")
+        (self.artists,) = self.ax.plot(times, values, color="#FFC107", linewidth=2)
+        self.ax.set_facecolor("#1E1E1E")
+        self.ax.set_title(f"{metric} per {label}", color="white", fontsize=16, pad=20)
+        self.ax.set_ylabel(metric, color="white", fontsize=12)
+        self.ax.tick_params(axis='x', rotation=25, colors='white')
+        self.ax.tick_params(axis='y', colors='white')
+        for spine in self.ax.spines.values():
+            spine.set_color("white")
+        self.fig.tight_layout()
+        self.draw_idle()
@@ -1,12 +1,13 @@
 import sys
-from mysql.connector import Error
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
     QTableWidget, QTableWidgetItem, QMessageBox
 )
 from PyQt6.QtGui import QFont, QPixmap, QIcon, QCursor
 from PyQt6.QtCore import Qt
-from db import kuha_databse
+from workers import run_query
+from services import order_service
+from main_window import logo_pixmap, navigate, logout
 
 
 class CustomerOrders(QWidget):
@@ -14,9 +15,6 @@ class CustomerOrders(QWidget):
         super().__init__()
         self.user_data = user_data
         self.setWindowTitle("My Orders - Food Ordering System")
-        self.setGeometry(0, 0, 1920, 1080)
-        self.showMaximized()
-        self.setWindowIcon(QIcon('Logo (2).png'))
         self.setStyleSheet("background-color: #121212; color: white;")
 
         # --- Main Layout ---
@@ -32,9 +30,7 @@ class CustomerOrders(QWidget):
 
         # Logo
         logo = QLabel()
-        pixmap = QPixmap("Logo (2).png")
-        pixmap = pixmap.scaled(210, 190, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        logo.setPixmap(pixmap)
+        logo.setPixmap(logo_pixmap(210, 190))
         logo.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         # Button Styles
@@ -139,6 +135,12 @@ class CustomerOrders(QWidget):
         
         content_layout.addWidget(self.table)
 
+        self.status_label = QLabel("")
+        self.status_label.setFont(QFont("Arial", 16))
+        self.status_label.setStyleSheet("color: #AAAAAA;")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        content_layout.addWidget(self.status_label)
+
         # Refresh Button
         refresh_btn = QPushButton("Refresh Orders")
         refresh_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
@@ -164,78 +166,51 @@ class CustomerOrders(QWidget):
         self.load_orders()
 
     # --- Database Query ---
+    def refresh(self):
+        self.load_orders()
+
     def load_orders(self):
-        try:
-            connection = kuha_databse()
-            cursor = connection.cursor()
-            query = """
-                SELECT 
-                    o.order_id,
-                    o.order_date,
-                    o.status,
-                    o.total_amount,
-                    p.payment_method,
-                    p.amount_paid,
-                    p.change_amount,
-                    GROUP_CONCAT(CONCAT(m.name, ' x', oi.quantity) SEPARATOR ', ') AS items_ordered
-                FROM orders o
-                JOIN order_items oi ON o.order_id = oi.order_id
-                JOIN menu_items m ON oi.item_id = m.item_id
-                LEFT JOIN payments p ON o.order_id = p.order_id
-                WHERE o.customer_id = %s
-                GROUP BY o.order_id;
-            """
-            cursor.execute(query, (self.user_data["customer_id"],))
-            rows = cursor.fetchall()
-
-            headers = [
-                "Order ID", "Order Date", "Status", "Total Amount",
-                "Payment Method", "Amount Paid", "Change", "Items Ordered"
-            ]
-            self.table.setColumnCount(len(headers))
-            self.table.setHorizontalHeaderLabels(headers)
-            self.table.setRowCount(len(rows))
-
-            for row_index, row_data in enumerate(rows):
-                for col_index, col_data in enumerate(row_data):
-                    item = QTableWidgetItem(str(col_data))
-                    item.setFlags(item.flags() ^ Qt.ItemFlag.ItemIsEditable)
-                    self.table.setItem(row_index, col_index, item)
-            
-            
-            self.table.setColumnWidth(0, 120)   
-            self.table.setColumnWidth(1, 160)  
-            self.table.setColumnWidth(2, 100)   
-            self.table.setColumnWidth(3, 200)   
-            self.table.setColumnWidth(4, 180)   
-            self.table.setColumnWidth(5, 200)   
-            self.table.setColumnWidth(6, 150)
-            self.table.setColumnWidth(7, 150)
-            self.table.setFixedSize(1300, 500)
+        self.status_label.setText("Loading orders...")
+        run_query(order_service.customer_orders, self.show_orders, self.on_load_failed,
+                  self.user_data["customer_id"], owner=self)
+
+    def show_orders(self, rows):
+        self.status_label.setText("" if rows else "You have no orders yet.")
+        headers = [
+            "Order ID", "Order Date", "Status", "Total Amount",
+            "Payment Method", "Amount Paid", "Change", "Items Ordered"
+        ]
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.setRowCount(len(rows))
+
+        for row_index, row_data in enumerate(rows):
+            for col_index, col_data in enumerate(row_data):
+                item = QTableWidgetItem(str(col_data))
+                item.setFlags(item.flags() ^ Qt.ItemFlag.ItemIsEditable)
+                self.table.setItem(row_index, col_index, item)
         
-
-        except Error as e:
-            QMessageBox.critical(self, "Database Error", f"Error loading orders:\n{e}")
-        finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+        
+        self.table.setColumnWidth(0, 120)   
+        self.table.setColumnWidth(1, 160)  
+        self.table.setColumnWidth(2, 100)   
+        self.table.setColumnWidth(3, 200)   
+        self.table.setColumnWidth(4, 180)   
+        self.table.setColumnWidth(5, 200)   
+        self.table.setColumnWidth(6, 150)
+        self.table.setColumnWidth(7, 150)
+        self.table.setFixedSize(1300, 500)
+
+    def on_load_failed(self, e):
+        self.status_label.setText("")
+        QMessageBox.critical(self, "Database Error", f"Error loading orders:\n{e}")
 
     # --- Navigation Functions ---
     def open_pos(self):
-        from POS import POSPage
-        self.pos_page = POSPage(self.user_data)
-        self.pos_page.showMaximized()
-        self.close()
+        navigate(self, "pos")
 
     def open_home(self):
-        from user_home import CustomerHomePage
-        self.home = CustomerHomePage(self.user_data)
-        self.home.showMaximized()
-        self.close()
+        navigate(self, "home")
 
     def logout(self):
-        from login import Login
-        self.logout = Login()
-        self.logout.showMaximized()
-        self.close()
+        logout(self)
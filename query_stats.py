@@ -0,0 +1,277 @@
+"""Per-statement timing for every database call.
+
+The pool hands out connections wrapped in InstrumentedConnection, whose
+cursors time each statement from execute until its rows have been read
+and record it under the page method that ran it (e.g.
+``services.OrderService.order_page``). The last ``window`` timings of each
+statement are kept in memory for percentiles and histograms; statements
+slower than ``slow_ms`` are also appended to the slow-query log, with the
+query plan when ``explain`` is on. Bound values are left out of the log
+(only their count is written) unless ``log_params`` is on, since login
+and register bind passwords and customer details.
+"""
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+# --- Settings (change with configure) ---
+QUERY_SETTINGS = {
+    "enabled": True,
+    "slow_ms": float(os.environ.get("FOODIE_SLOW_QUERY_MS", 200)),  # slow-query log threshold
+    "log_path": os.environ.get("FOODIE_SLOW_QUERY_LOG", "slow_queries.log"),
+    "explain": False,   # add the query plan to slow-query log entries
+    "log_params": False,  # write bound values to the log (they can hold passwords)
+    "window": 1000,     # timings kept per statement
+}
+
+# Histogram bucket upper bounds in milliseconds (the last bucket is open-ended)
+HISTOGRAM_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Frames in these modules are plumbing, not the page that ran the query
+_PLUMBING = {__name__, "db", "backends", "contextlib", "threading"}
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(sql):
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def calling_method():
+    """'module.Class.method' of the nearest caller outside the database layer."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module not in _PLUMBING:
+            code = frame.f_code
+            return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+        frame = frame.f_back
+    return "?"
+
+
+class StatementStats:
+    def __init__(self, window):
+        self.count = 0
+        self.total_ms = 0.0
+        self.rows = 0
+        self.max_ms = 0.0
+        self.recent = deque(maxlen=window)
+        self.callers = set()
+
+    def add(self, elapsed_ms, rows, caller):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.rows += max(rows, 0)
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.recent.append(elapsed_ms)
+        self.callers.add(caller)
+
+
+class QueryStats:
+    """Thread-safe rolling timings per statement."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.statements = {}   # normalized SQL -> StatementStats
+        self.log_lock = threading.Lock()
+
+    def record(self, sql, caller, elapsed_ms, rows):
+        key = normalize(sql)
+        with self.lock:
+            stats = self.statements.get(key)
+            if stats is None:
+                stats = self.statements[key] = StatementStats(QUERY_SETTINGS["window"])
+            stats.add(elapsed_ms, rows, caller)
+
+    def reset(self):
+        with self.lock:
+            self.statements.clear()
+
+    # --- Reading ---
+    def summary(self):
+        """[dict] per statement, the most total time first."""
+        with self.lock:
+            items = [(sql, s.count, s.total_ms, s.rows, s.max_ms, list(s.recent), sorted(s.callers))
+                     for sql, s in self.statements.items()]
+        rows = []
+        for sql, count, total_ms, rows_read, max_ms, recent, callers in items:
+            p50, p95, p99 = np.percentile(recent, [50, 95, 99]) if recent else (0.0, 0.0, 0.0)
+            rows.append({
+                "sql": sql, "callers": callers, "count": count, "rows": rows_read,
+                "total_ms": total_ms, "max_ms": max_ms,
+                "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+            })
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows
+
+    def histogram(self, sql):
+        """Counts of recent timings per HISTOGRAM_MS bucket (plus one for slower)."""
+        with self.lock:
+            stats = self.statements.get(normalize(sql))
+            recent = list(stats.recent) if stats else []
+        positions = np.searchsorted(HISTOGRAM_MS, recent, side="left")
+        return np.bincount(positions, minlength=len(HISTOGRAM_MS) + 1).tolist()
+
+    def format_summary(self, top=20):
+        lines = [f"{'calls':>7} {'total ms':>10} {'p50':>8} {'p95':>8} {'p99':>8} {'rows':>9}  statement"]
+        for r in self.summary()[:top]:
+            lines.append(f"{r['count']:>7} {r['total_ms']:>10.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+                         f"{r['p99_ms']:>8.2f} {r['rows']:>9}  {', '.join(r['callers'])}: {r['sql'][:120]}")
+        return "\n".join(lines)
+
+    # --- Slow-query log ---
+    def log_slow(self, sql, params, caller, elapsed_ms, rows, plan=None):
+        entry = [f"{datetime.now():%Y-%m-%d %H:%M:%S} {elapsed_ms:.1f} ms, {max(rows, 0)} rows, {caller}",
+                 f"    {normalize(sql)}"]
+        if params and QUERY_SETTINGS["log_params"]:
+            entry.append(f"    params: {tuple(params)!r}"[:500])
+        elif params:
+            entry.append(f"    params: {len(params)} bound")
+        if plan:
+            entry.extend(f"    plan: {line}" for line in plan)
+        with self.log_lock:
+            with open(QUERY_SETTINGS["log_path"], "a", encoding="utf-8") as log:
+                log.write("\n".join(entry) + "\n")
+
+
+query_stats = QueryStats()
+
+
+def configure(**settings):
+    unknown = set(settings) - set(QUERY_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown query settings: {', '.join(sorted(unknown))}")
+    QUERY_SETTINGS.update(settings)
+
+
+class InstrumentedConnection:
+    """Wraps a backend connection so its cursors report to query_stats."""
+
+    def __init__(self, conn, backend):
+        self._conn = conn
+        self._backend = backend
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        cursor = self._conn.cursor(*args, **kwargs)
+        if not QUERY_SETTINGS["enabled"]:
+            return cursor
+        return InstrumentedCursor(cursor, self)
+
+    def explain(self, sql, params):
+        """The plan of a statement as text lines, or the reason it has none."""
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute(self._backend.explain_sql(sql), params)
+            return [" | ".join(str(v) for v in row) for row in cursor.fetchall()]
+        except Exception as err:
+            return [f"(no plan: {err})"]
+        finally:
+            cursor.close()
+
+
+class InstrumentedCursor:
+    """A statement's time runs from execute until its rows are read or the cursor moves on."""
+
+    def __init__(self, cursor, connection):
+        self._cursor = cursor
+        self._connection = connection
+        self._pending = None   # [sql, params, caller, elapsed_ms, rows fetched]
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def execute(self, sql, params=()):
+        self._finish()
+        caller = calling_method()
+        start = time.perf_counter()
+        result = self._cursor.execute(sql, params)
+        self._pending = [sql, params, caller, (time.perf_counter() - start) * 1000, 0]
+        return result if result is not self._cursor else self
+
+    def executemany(self, sql, seq_of_params):
+        self._finish()
+        caller = calling_method()
+        start = time.perf_counter()
+        result = self._cursor.executemany(sql, seq_of_params)
+        self._pending = [sql, (), caller, (time.perf_counter() - start) * 1000, 0]
+        self._finish()
+        return result if result is not self._cursor else self
+
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        if row is None:
+            self._finish()
+        elif self._pending:
+            self._pending[4] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(self._cursor.fetchmany, size) if size else self._timed(self._cursor.fetchmany)
+        if self._pending:
+            self._pending[4] += len(rows)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        if self._pending:
+            self._pending[4] += len(rows)
+        self._finish()
+        return rows
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
+
+    def __del__(self):
+        # The connection may be back in the pool by now: record the timing only
+        if self.__dict__.get("_pending"):
+            self._finish(log=False)
+
+    def _timed(self, fetch, *args):
+        start = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            if self._pending:
+                self._pending[3] += (time.perf_counter() - start) * 1000
+
+    def _finish(self, log=True):
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        sql, params, caller, elapsed_ms, fetched = pending
+        try:
+            rows = fetched or self._cursor.rowcount
+        except Exception:
+            rows = fetched
+        query_stats.record(sql, caller, elapsed_ms, rows)
+        if not log or elapsed_ms < QUERY_SETTINGS["slow_ms"]:
+            return
+        try:
+            plan = self._plan(sql, params) if QUERY_SETTINGS["explain"] else None
+            query_stats.log_slow(sql, params, caller, elapsed_ms, rows, plan)
+        except Exception:
+            pass  # a log that cannot be written must not fail the page's query
+
+    def _plan(self, sql, params):
+        if params and not QUERY_SETTINGS["log_params"]:
+            # EXPLAIN would re-send the values; they stay out unless log_params is on
+            return ["(no plan: the statement has bound values and log_params is off)"]
+        return self._connection.explain(sql, params)
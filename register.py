@@ -1,22 +1,20 @@
 import sys
-from mysql.connector import Error
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLineEdit, QPushButton,
     QMessageBox, QLabel
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QIcon
-from db import kuha_databse
+from workers import run_query
+from services import auth_service
+from main_window import navigate
 
 
 class Register(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Register")
-        self.setGeometry(0, 0, 1920, 1080)
         self.setStyleSheet("background-color: #4A0E13; color: white;")
-        self.setWindowIcon(QIcon('Logo (2).png'))
-        self.showMaximized()
 
         # === Parent Layout ===
         main_layout = QVBoxLayout()
@@ -66,6 +64,7 @@ class Register(QWidget):
 
         # === Register Button ===
         register_btn = QPushButton("Register")
+        self.register_btn = register_btn
         register_btn.setFont(QFont("Arial", 14, QFont.Weight.Bold))
         register_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         register_btn.setStyleSheet("""
@@ -142,44 +141,23 @@ class Register(QWidget):
             QMessageBox.warning(self, "Error", "Passwords do not match.")
             return
 
-        connection = None
-        try:
-            connection = kuha_databse()
-            cursor = connection.cursor()
-
-            # Check duplicate username or email
-            cursor.execute("SELECT * FROM accounts WHERE username = %s", (username,))
-            if cursor.fetchone():
-                QMessageBox.warning(self, "Error", "Username already exists.")
-                return
-
-            cursor.execute("SELECT * FROM customers WHERE email = %s", (email,))
-            if cursor.fetchone():
-                QMessageBox.warning(self, "Error", "Email already registered.")
-                return
-
-            # Insert into accounts table (default role: customer)
-            insert_account = "INSERT INTO accounts (username, password, role) VALUES (%s, %s, %s)"
-            cursor.execute(insert_account, (username, password, "customer"))
-            account_id = cursor.lastrowid
-
-            # Insert into customers table
-            insert_customer = """
-                INSERT INTO customers (account_id, name, email, phone, address)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            cursor.execute(insert_customer, (account_id, fullname, email, phone, address))
-            connection.commit()
-
-            QMessageBox.information(self, "Success", "Account registered successfully!")
-            self.clear_fields()
-            self.back_to_login()
-
-        except Error as e:
-            QMessageBox.critical(self, "Database Error", f"Error: {e}")
-        finally:
-            if connection and connection.is_connected():
-                connection.close()
+        self.register_btn.setEnabled(False)
+        run_query(auth_service.register, self.on_register_result, self.on_register_failed,
+                  username, fullname, email, phone, address, password, owner=self)
+
+    def on_register_result(self, problem):
+        self.register_btn.setEnabled(True)
+        if problem:
+            QMessageBox.warning(self, "Error", problem)
+            return
+
+        QMessageBox.information(self, "Success", "Account registered successfully!")
+        self.clear_fields()
+        self.back_to_login()
+
+    def on_register_failed(self, e):
+        self.register_btn.setEnabled(True)
+        QMessageBox.critical(self, "Database Error", f"Error: {e}")
 
     # === Clear inputs ===
     def clear_fields(self):
@@ -191,7 +169,4 @@ class Register(QWidget):
 
     # === Back to login page ===
     def back_to_login(self):
-        from login import Login
-        self.hide()
-        self.login_window = Login()
-        self.login_window.showMaximized()
+        navigate(self, "login")
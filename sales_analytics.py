@@ -0,0 +1,241 @@
+"""Time-range sales analytics over NumPy arrays.
+
+SalesData pulls the order and per-item rollups of a date range (see
+sales_rollup.py) in two bulk queries: hourly rollups for ranges of up
+to HOURLY_DAYS days, daily ones otherwise, so the raw orders are never
+scanned. Everything after that (resampling to the views the resolution
+allows, order counts, average ticket) is computed with vectorized NumPy
+operations, so switching views never goes back to the database. Per-item
+series are the exception: they are queried only when asked for.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from db import db_connection
+
+STEPS = {
+    "hour": np.timedelta64(1, "h"),
+    "day": np.timedelta64(1, "D"),
+    "week": np.timedelta64(7, "D"),
+}
+
+# Longer ranges (and all time) are read from the daily rollups, without an hourly view
+HOURLY_DAYS = 7
+
+# Best sellers item_series shows unless asked for more
+SERIES_ITEMS = 5
+
+# step -> (orders rollup, per-item rollup, bucket column)
+ROLLUP_TABLES = {
+    "hour": ("sales_hourly", "sales_item_hourly", "sale_hour"),
+    "day": ("sales_daily", "sales_item_daily", "sale_date"),
+}
+
+# Named date ranges for the dashboard: label -> days back (None = all time)
+RANGES = {
+    "Last 7 days": 7,
+    "Last 30 days": 30,
+    "Last 90 days": 90,
+    "Last 365 days": 365,
+    "All time": None,
+}
+
+
+def date_range(days, now=None):
+    """(start, end) covering the last days days up to the end of today."""
+    now = now or datetime.now()
+    end = datetime(now.year, now.month, now.day) + timedelta(days=1)
+    start = end - timedelta(days=days) if days else None
+    return start, end
+
+
+def floor_times(times, freq):
+    """Round datetime64 values down to the start of their hour, day or ISO week."""
+    if freq == "hour":
+        return times.astype("datetime64[h]")
+    days = times.astype("datetime64[D]")
+    if freq == "day":
+        return days
+    # 1970-01-01 was a Thursday; shift so weeks start on Monday
+    weekday = (days.astype(np.int64) + 3) % 7
+    return days - weekday.astype("timedelta64[D]")
+
+
+def bucket_starts(start, end, freq):
+    """Every bucket start from the bucket containing start up to end."""
+    first = floor_times(np.array([start], dtype="datetime64[s]"), freq).astype("datetime64[s]")[0]
+    return np.arange(first, np.datetime64(end, "s"), STEPS[freq].astype("timedelta64[s]"))
+
+
+def resample(times, values, buckets, freq):
+    """Sum values into buckets (as returned by bucket_starts)."""
+    if len(buckets) == 0:
+        return np.zeros(0)
+    keys = floor_times(times, freq).astype(buckets.dtype)
+    positions = np.searchsorted(buckets, keys)
+    inside = (positions < len(buckets)) & (buckets[np.minimum(positions, len(buckets) - 1)] == keys)
+    # bincount returns integers when nothing falls inside; keep the sums float
+    return np.bincount(positions[inside], weights=values[inside], minlength=len(buckets)).astype(np.float64)
+
+
+class SalesData:
+    """Order and per-item rollups of one date range, as arrays.
+
+    step is the rollup resolution the data was read at ("hour" or "day");
+    freqs lists the views it can be resampled to. Items are held as range
+    totals, best sellers first; their per-bucket revenue is only queried
+    when item_series first asks for it.
+    """
+
+    def __init__(self, start, end, step, order_times, orders_placed, order_totals,
+                 item_ids, item_names, item_quantities, item_revenue):
+        self.start = start
+        self.end = end
+        self.step = step
+        self.order_times = order_times          # bucket start per order rollup row
+        self.orders_placed = orders_placed      # orders in each of those buckets
+        self.order_totals = order_totals        # and their revenue
+        self.item_ids = item_ids                # item index -> item_id, best sellers first
+        self.item_names = item_names            # item index -> name
+        self.item_quantities = item_quantities  # range totals per item index
+        self.item_revenue = item_revenue
+        self.series_items = 0                   # best sellers loaded into the series arrays
+        self.series_keys = np.zeros(0, dtype=np.int64)  # item index per series row
+        self.series_times = np.zeros(0, dtype="datetime64[s]")
+        self.series_revenue = np.zeros(0)
+
+    @property
+    def freqs(self):
+        return [freq for freq in STEPS if STEPS[freq] >= STEPS[self.step]]
+
+    @staticmethod
+    def range_filter(step, start, end, extra=()):
+        """(WHERE clause, params) limiting a rollup table of step to the range."""
+        column = ROLLUP_TABLES[step][2]
+        where, params = [], []
+        if start is not None:
+            where.append(f"{column} >= %s")
+            params.append(start if step == "hour" else start.date())
+        if end is not None:
+            where.append(f"{column} < %s")
+            params.append(end if step == "hour" else end.date())
+        parts = where + list(extra)
+        return ("WHERE " + " AND ".join(parts)) if parts else "", params
+
+    @classmethod
+    def load(cls, start=None, end=None):
+        """Fetch a range (start inclusive, end exclusive; None = unbounded)."""
+        hourly = start is not None and end is not None and end - start <= timedelta(days=HOURLY_DAYS)
+        step = "hour" if hourly else "day"
+        orders_table, items_table, column = ROLLUP_TABLES[step]
+        where, params = cls.range_filter(step, start, end)
+
+        with db_connection() as db:
+            cursor = db.cursor()
+            cursor.execute(f"SELECT {column}, order_count, revenue FROM {orders_table} {where}", params)
+            orders = cursor.fetchall()
+            cursor.execute(f"""
+                SELECT t.item_id, m.name, t.quantity, t.revenue
+                FROM (
+                    SELECT item_id, SUM(quantity) AS quantity, SUM(revenue) AS revenue
+                    FROM {items_table}
+                    {where}
+                    GROUP BY item_id
+                ) t
+                LEFT JOIN menu_items m ON t.item_id = m.item_id
+                WHERE t.revenue > 0
+                ORDER BY t.revenue DESC, t.item_id
+            """, params)
+            items = cursor.fetchall()
+            cursor.close()
+
+        return cls(
+            start, end, step,
+            np.array([row[0] for row in orders], dtype="datetime64[s]"),
+            np.array([row[1] for row in orders], dtype=np.float64),
+            np.array([row[2] for row in orders], dtype=np.float64),
+            [row[0] for row in items],
+            [row[1] or f"Item #{row[0]}" for row in items],
+            np.array([row[2] for row in items], dtype=np.float64),
+            np.array([row[3] for row in items], dtype=np.float64),
+        )
+
+    def load_series(self, top=SERIES_ITEMS):
+        """Query the per-bucket revenue of the first top best sellers, unless already loaded."""
+        top = min(top, len(self.item_ids))
+        if top <= self.series_items:
+            return
+        ids = self.item_ids[:top]
+        _, items_table, column = ROLLUP_TABLES[self.step]
+        where, params = self.range_filter(
+            self.step, self.start, self.end, [f"item_id IN ({', '.join(['%s'] * len(ids))})"]
+        )
+        with db_connection() as db:
+            cursor = db.cursor()
+            cursor.execute(f"SELECT item_id, {column}, revenue FROM {items_table} {where}", params + ids)
+            rows = cursor.fetchall()
+            cursor.close()
+
+        key_of = {item_id: key for key, item_id in enumerate(ids)}
+        self.series_keys = np.array([key_of[row[0]] for row in rows], dtype=np.int64)
+        self.series_times = np.array([row[1] for row in rows], dtype="datetime64[s]")
+        self.series_revenue = np.array([row[2] for row in rows], dtype=np.float64)
+        self.series_items = top
+
+    # --- Buckets ---
+    def buckets(self, freq):
+        start, end = self.start, self.end
+        if start is None or end is None:
+            # Every item sale belongs to an order, so the order rollups span all the data
+            times = self.order_times
+            if len(times) == 0:
+                return np.zeros(0, dtype="datetime64[s]")
+            if start is None:
+                start = times.min().astype(datetime)
+            if end is None:
+                end = (times.max() + np.timedelta64(1, "s")).astype(datetime)
+        return bucket_starts(start, end, freq)
+
+    # --- Series ---
+    def revenue(self, freq):
+        return resample(self.order_times, self.order_totals, self.buckets(freq), freq)
+
+    def order_counts(self, freq):
+        return resample(self.order_times, self.orders_placed, self.buckets(freq), freq)
+
+    def average_ticket(self, freq):
+        revenue = self.revenue(freq)
+        counts = self.order_counts(freq)
+        return np.divide(revenue, counts, out=np.zeros_like(revenue), where=counts > 0)
+
+    def item_series(self, freq, top=SERIES_ITEMS):
+        """Revenue per bucket for the top items: {name: array}. Queries the database on first use."""
+        self.load_series(top)
+        buckets = self.buckets(freq)
+        series = {}
+        for key in self.top_items(top, indexes=True):
+            mask = self.series_keys == key
+            series[self.item_names[key]] = resample(
+                self.series_times[mask], self.series_revenue[mask], buckets, freq
+            )
+        return series
+
+    # --- Totals ---
+    def item_totals(self):
+        """[(name, revenue, quantity)] for the whole range, best sellers first."""
+        return [(name, float(revenue), int(quantity))
+                for name, revenue, quantity in zip(self.item_names, self.item_revenue, self.item_quantities)]
+
+    def top_items(self, top=5, indexes=False):
+        order = list(range(min(top, len(self.item_names))))
+        return order if indexes else [self.item_names[i] for i in order]
+
+    def kpis(self):
+        total = float(self.order_totals.sum())
+        count = int(self.orders_placed.sum())
+        return {
+            "revenue": total,
+            "orders": count,
+            "average_ticket": total / count if count else 0.0,
+        }
@@ -0,0 +1,99 @@
+"""Sales rollups by hour and by day.
+
+Checkout adds each order to ``sales_hourly`` and ``sales_daily`` (order
+count and revenue) and its items to ``sales_item_hourly`` and
+``sales_item_daily``; a status change that cancels an order (or restores
+a cancelled one) takes it out again (or puts it back). Reports read these
+tables instead of re-aggregating the whole order history.
+
+The functions take the backend of the cursor's connection, which builds
+the upsert statements; it need not be the one the pool is using (the
+migrations run while a backend is still connecting).
+"""
+ORDER_COLUMNS = ["order_count", "revenue"]
+ROLLUP_COLUMNS = ["quantity", "revenue", "order_count"]
+
+
+def counts_as_sale(status):
+    return status != "Cancelled"
+
+
+def hour_of(order_date):
+    return order_date.replace(minute=0, second=0, microsecond=0)
+
+
+def record_order(cursor, backend, order_id, sign=1):
+    """Add an order to the rollups (sign=-1 removes it) in the caller's transaction."""
+    cursor.execute("SELECT order_date, total_amount FROM orders WHERE order_id = %s", (order_id,))
+    add_orders(cursor, backend, cursor.fetchall(), sign)
+    cursor.execute("""
+        SELECT o.order_date, oi.item_id, SUM(oi.quantity), SUM(oi.quantity * oi.unit_price)
+        FROM order_items oi
+        JOIN orders o ON oi.order_id = o.order_id
+        WHERE oi.order_id = %s
+        GROUP BY o.order_date, oi.item_id
+    """, (order_id,))
+    add_sales(cursor, backend, cursor.fetchall(), sign)
+
+
+def add_orders(cursor, backend, rows, sign=1):
+    """rows are (order_date, total_amount), one per order."""
+    hourly, daily = {}, {}
+    for order_date, total in rows:
+        for buckets, key in ((hourly, (hour_of(order_date),)), (daily, (order_date.date(),))):
+            totals = buckets.setdefault(key, [0, 0])
+            totals[0] += 1
+            totals[1] += total
+    write_buckets(cursor, backend, "sales_hourly", ["sale_hour"], ORDER_COLUMNS, hourly, sign)
+    write_buckets(cursor, backend, "sales_daily", ["sale_date"], ORDER_COLUMNS, daily, sign)
+
+
+def add_sales(cursor, backend, rows, sign=1):
+    """rows are (order_date, item_id, quantity, revenue), one per order and item."""
+    hourly, daily = {}, {}
+    for order_date, item_id, quantity, revenue in rows:
+        for buckets, key in ((hourly, (item_id, hour_of(order_date))), (daily, (item_id, order_date.date()))):
+            totals = buckets.setdefault(key, [0, 0, 0])
+            totals[0] += quantity
+            totals[1] += revenue
+            totals[2] += 1
+    write_buckets(cursor, backend, "sales_item_hourly", ["item_id", "sale_hour"], ROLLUP_COLUMNS, hourly, sign)
+    write_buckets(cursor, backend, "sales_item_daily", ["item_id", "sale_date"], ROLLUP_COLUMNS, daily, sign)
+
+
+def write_buckets(cursor, backend, table, key_columns, columns, buckets, sign):
+    """Add (or with sign=-1 subtract) {key tuple: [column values]} to table."""
+    if not buckets:
+        return
+    sql = backend.upsert_sql(table, key_columns + columns, tuple(key_columns), add=columns)
+    cursor.executemany(sql, [key + tuple(sign * value for value in values) for key, values in buckets.items()])
+
+
+def rebuild(cursor, backend):
+    """Recompute every rollup from the full order history."""
+    for table in ("sales_hourly", "sales_daily", "sales_item_hourly", "sales_item_daily"):
+        cursor.execute(f"DELETE FROM {table}")
+    cursor.execute("SELECT order_date, total_amount FROM orders WHERE status != 'Cancelled'")
+    add_orders(cursor, backend, cursor.fetchall())
+    cursor.execute("""
+        SELECT o.order_date, oi.item_id, SUM(oi.quantity), SUM(oi.quantity * oi.unit_price)
+        FROM order_items oi
+        JOIN orders o ON oi.order_id = o.order_id
+        WHERE o.status != 'Cancelled'
+        GROUP BY o.order_id, o.order_date, oi.item_id
+    """)
+    add_sales(cursor, backend, cursor.fetchall())
+
+
+def ensure_built(cursor, backend):
+    """Build the rollups once for databases that predate them.
+
+    Returns True when a rebuild happened and the caller must commit.
+    """
+    cursor.execute("SELECT built FROM sales_rollup_state WHERE id = 1")
+    row = cursor.fetchone()
+    if row and row[0]:
+        return False
+    rebuild(cursor, backend)
+    cursor.execute("UPDATE sales_rollup_state SET built = 1 WHERE id = 1")
+    return True
@@ -0,0 +1,404 @@
+"""Database operations behind the pages, with no Qt dependency.
+
+Pages hand these methods to run_query; benchmark.py and load_sim.py call
+them directly. Each method borrows a pooled connection, does its work in
+one transaction and returns plain rows, so caching or batching added here
+applies to every caller at once.
+"""
+import time
+from datetime import datetime
+
+from db import db_connection, get_backend
+from menu_cache import menu_cache, bump_menu_version, mark_items_changed, mark_items_deleted
+import menu_io
+import sales_rollup
+from sales_analytics import SalesData, date_range
+
+ORDER_STATUSES = ["Pending", "Preparing", "Completed", "Cancelled"]
+
+# Pending → Preparing → Completed; finished orders stay where they are
+NEXT_STATUS = {
+    "Pending": "Preparing",
+    "Preparing": "Completed",
+}
+
+
+class AuthService:
+    def login(self, username, password):
+        """The account (with its customer details, if any) or None."""
+        with db_connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT a.ID, a.role, c.customer_id, c.name AS Fullname, c.email, c.phone, c.address
+                FROM accounts a
+                LEFT JOIN customers c
+                ON a.ID = c.account_id
+                WHERE username = %s AND password = %s
+            """, (username, password))
+            user = cursor.fetchone()
+            cursor.close()
+        return user
+
+    def register(self, username, fullname, email, phone, address, password):
+        """Create a customer account; returns an error message or None on success."""
+        with db_connection() as connection:
+            cursor = connection.cursor(buffered=True)
+
+            # Check duplicate username or email
+            cursor.execute("SELECT * FROM accounts WHERE username = %s", (username,))
+            if cursor.fetchone():
+                return "Username already exists."
+
+            cursor.execute("SELECT * FROM customers WHERE email = %s", (email,))
+            if cursor.fetchone():
+                return "Email already registered."
+
+            # Insert into accounts table (default role: customer)
+            cursor.execute("INSERT INTO accounts (username, password, role) VALUES (%s, %s, %s)",
+                           (username, password, "customer"))
+            account_id = cursor.lastrowid
+
+            cursor.execute("""
+                INSERT INTO customers (account_id, name, email, phone, address)
+                VALUES (%s, %s, %s, %s, %s)
+            """, (account_id, fullname, email, phone, address))
+            connection.commit()
+            cursor.close()
+        return None
+
+
+class MenuService:
+    """Menu reads go through menu_cache; every write bumps the menu version."""
+
+    def menu_items(self):
+        """Current catalog as (item_id, name, category, price) rows."""
+        return menu_cache.get_items()
+
+    def menu_catalog(self):
+        """(menu version, rows); callers holding that version can skip the rows."""
+        return menu_cache.get_catalog()
+
+    # --- Single items ---
+    def read_item(self, cursor, item_id):
+        cursor.execute("SELECT item_id, name, category, price FROM menu_items WHERE item_id = %s", (item_id,))
+        row = cursor.fetchone()
+        return tuple(row) if row else None
+
+    def add_item(self, name, category, price):
+        with db_connection() as db:
+            cursor = db.cursor()
+            cursor.execute(
+                "INSERT INTO menu_items (name, category, price) VALUES (%s, %s, %s)",
+                (name, category, price)
+            )
+            item_id = cursor.lastrowid
+            mark_items_changed(cursor, [item_id])
+            item = self.read_item(cursor, item_id)
+            db.commit()
+            cursor.close()
+        return item
+
+    def update_item(self, item_id, name, category, price):
+        """The saved row, or None if the item no longer exists."""
+        with db_connection() as db:
+            cursor = db.cursor()
+            cursor.execute("""
+                UPDATE menu_items
+                SET name=%s, category=%s, price=%s
+                WHERE item_id=%s
+            """, (name, category, price, item_id))
+            mark_items_changed(cursor, [item_id])
+            item = self.read_item(cursor, item_id)
+            db.commit()
+            cursor.close()
+        return item
+
+    def delete_item(self, item_id):
+        with db_connection() as db:
+            cursor = db.cursor()
+            cursor.execute("DELETE FROM menu_items WHERE item_id = %s", (item_id,))
+            mark_items_deleted(cursor, [item_id])
+            db.commit()
+            cursor.close()
+        return item_id
+
+    # --- Bulk changes (one statement, one transaction) ---
+    # scope is ("items", [item_id, ...]) or ("category", name); each returns
+    # (changed rows, deleted ids).
+    @staticmethod
+    def scope_clause(scope):
+        kind, value = scope
+        if kind == "category":
+            return "category = %s", [value]
+        return f"item_id IN ({', '.join(['%s'] * len(value))})", list(value)
+
+    def changed_rows(self, cursor, version):
+        cursor.execute(
+            "SELECT item_id, name, category, price FROM menu_items WHERE row_version = %s", (version,)
+        )
+        return [tuple(row) for row in cursor.fetchall()]
+
+    def update_prices(self, scope, mode, value):
+        """mode is "percent", "amount" or "set"; prices never drop below zero."""
+        where, params = self.scope_clause(scope)
+        if mode == "percent":
+            new_price = "ROUND(price * (100 + %s) / 100, 2)"
+        elif mode == "amount":
+            new_price = "price + %s"
+        else:
+            new_price = "%s"
+        with db_connection() as db:
+            cursor = db.cursor()
+            version = bump_menu_version(cursor)
+            cursor.execute(f"""
+                UPDATE menu_items
+                SET price = CASE WHEN {new_price} < 0 THEN 0 ELSE {new_price} END,
+                    row_version = %s
+                WHERE {where}
+            """, [value, value, version] + params)
+            changed = self.changed_rows(cursor, version)
+            db.commit()
+            cursor.close()
+        return changed, []
+
+    def move_category(self, scope, category):
+        where, params = self.scope_clause(scope)
+        with db_connection() as db:
+            cursor = db.cursor()
+            version = bump_menu_version(cursor)
+            cursor.execute(
+                f"UPDATE menu_items SET category = %s, row_version = %s WHERE {where}",
+                [category, version] + params
+            )
+            changed = self.changed_rows(cursor, version)
+            db.commit()
+            cursor.close()
+        return changed, []
+
+    def delete_items(self, scope):
+        where, params = self.scope_clause(scope)
+        with db_connection() as db:
+            cursor = db.cursor()
+            version = bump_menu_version(cursor)
+            cursor.execute(
+                f"INSERT INTO menu_item_deletions (item_id, version) SELECT item_id, %s FROM menu_items WHERE {where}",
+                [version] + params
+            )
+            cursor.execute(f"DELETE FROM menu_items WHERE {where}", params)
+            cursor.execute("SELECT item_id FROM menu_item_deletions WHERE version = %s", (version,))
+            deleted = [row[0] for row in cursor.fetchall()]
+            db.commit()
+            cursor.close()
+        return [], deleted
+
+    # --- Files (see menu_io.py) ---
+    def import_file(self, path, progress=None):
+        return menu_io.import_file(path, progress)
+
+    def export_file(self, path):
+        return menu_io.export_file(path)
+
+
+class OrderService:
+    # --- Checkout ---
+    def place_order(self, customer_id, lines, total_amount, amount_paid):
+        """Write the order, its items and the payment in one transaction.
+
+        lines are (item_id, name, price, quantity); returns the change due.
+        """
+        change = round(amount_paid - total_amount, 2)
+        with db_connection() as connection:
+            cursor = connection.cursor()
+
+            cursor.execute("INSERT INTO orders (customer_id, total_amount) VALUES (%s, %s)",
+                           (customer_id, total_amount))
+            order_id = cursor.lastrowid
+
+            cursor.executemany(
+                "INSERT INTO order_items (order_id, item_id, quantity, unit_price, subtotal) VALUES (%s, %s, %s, %s, %s)",
+                [(order_id, item_id, qty, price, round(price * qty, 2)) for item_id, _, price, qty in lines]
+            )
+
+            cursor.execute("INSERT INTO payments (order_id, amount_paid, change_amount) VALUES (%s, %s, %s)",
+                           (order_id, amount_paid, change))
+            sales_rollup.record_order(cursor, get_backend(), order_id)
+            connection.commit()
+            cursor.close()
+        return change
+
+    # --- Order manager ---
+    def order_page(self, filters, after=None, limit=50):
+        """Up to limit orders, newest first, starting after the (order_date, order_id) key.
+
+        filters may hold "status" and a "date_from"/"date_to" pair.
+        """
+        conditions, params = [], []
+        if filters.get("status"):
+            conditions.append("o.status = %s")
+            params.append(filters["status"])
+        if filters.get("date_from"):
+            conditions.append("o.order_date >= %s AND o.order_date < %s")
+            params += [filters["date_from"], filters["date_to"]]
+        if after is not None:
+            conditions.append("(o.order_date < %s OR (o.order_date = %s AND o.order_id < %s))")
+            params += [after[0], after[0], after[1]]
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with db_connection() as db:
+            cursor = db.cursor()
+            cursor.execute(f"""
+                SELECT o.order_id, c.name, o.order_date, o.status, o.total_amount
+                FROM orders o
+                LEFT JOIN customers c ON o.customer_id = c.customer_id
+                {where}
+                ORDER BY o.order_date DESC, o.order_id DESC
+                LIMIT %s
+            """, params + [limit])
+            results = cursor.fetchall()
+            cursor.close()
+        return results
+
+    def high_water(self):
+        """The latest updated_at of any order; changes_since starts from here."""
+        with db_connection() as db:
+            cursor = db.cursor()
+            cursor.execute("SELECT MAX(updated_at) FROM orders")
+            (since,) = cursor.fetchone()
+            cursor.close()
+        if isinstance(since, str):
+            since = datetime.fromisoformat(since)
+        return since or datetime(1970, 1, 1)
+
+    def changes_since(self, since):
+        with db_connection() as db:
+            cursor = db.cursor()
+            cursor.execute("""
+                SELECT o.order_id, c.name, o.order_date, o.status, o.total_amount, o.updated_at
+                FROM orders o
+                LEFT JOIN customers c ON o.customer_id = c.customer_id
+                WHERE o.updated_at >= %s
+                ORDER BY o.updated_at
+            """, (since,))
+            changes = cursor.fetchall()
+            cursor.close()
+        return changes
+
+    def set_statuses(self, transitions):
+        """Compare-and-set: an order only moves if it still has the expected status.
+
+        transitions are (expected, new, [order_id, ...]). Another terminal
+        may have changed an order since it was shown; those are left alone.
+        Returns (updated, requested, current rows of all requested orders).
+        """
+        updated = 0
+        order_ids = []
+        with db_connection() as db:
+            cursor = db.cursor()
+            for expected, new, ids in transitions:
+                order_ids += ids
+                if sales_rollup.counts_as_sale(expected) != sales_rollup.counts_as_sale(new):
+                    # The rollups must know exactly which orders moved
+                    sign = 1 if sales_rollup.counts_as_sale(new) else -1
+                    for order_id in ids:
+                        cursor.execute("UPDATE orders SET status = %s WHERE status = %s AND order_id = %s",
+                                       (new, expected, order_id))
+                        if cursor.rowcount:
+                            updated += 1
+                            sales_rollup.record_order(cursor, get_backend(), order_id, sign)
+                    continue
+                cursor.execute(
+                    f"UPDATE orders SET status = %s WHERE status = %s AND order_id IN ({', '.join(['%s'] * len(ids))})",
+                    [new, expected] + ids
+                )
+                updated += cursor.rowcount
+            cursor.execute(f"""
+                SELECT o.order_id, c.name, o.order_date, o.status, o.total_amount
+                FROM orders o
+                LEFT JOIN customers c ON o.customer_id = c.customer_id
+                WHERE o.order_id IN ({', '.join(['%s'] * len(order_ids))})
+            """, order_ids)
+            rows = [tuple(row) for row in cursor.fetchall()]
+            db.commit()
+            cursor.close()
+        return updated, len(order_ids), rows
+
+    # --- Customers ---
+    def customer_orders(self, customer_id):
+        """A customer's orders with payment details and a summary of the items."""
+        with db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT
+                    o.order_id,
+                    o.order_date,
+                    o.status,
+                    o.total_amount,
+                    p.payment_method,
+                    p.amount_paid,
+                    p.change_amount,
+                    GROUP_CONCAT(CONCAT(m.name, ' x', oi.quantity) SEPARATOR ', ') AS items_ordered
+                FROM orders o
+                JOIN order_items oi ON o.order_id = oi.order_id
+                JOIN menu_items m ON oi.item_id = m.item_id
+                LEFT JOIN payments p ON o.order_id = p.order_id
+                WHERE o.customer_id = %s
+                GROUP BY o.order_id;
+            """, (customer_id,))
+            rows = cursor.fetchall()
+            cursor.close()
+        return rows
+
+    def recent_items(self, customer_id, limit=5):
+        """(name, unit_price, quantity, order_date) of a customer's latest order lines."""
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT m.name, o_r.unit_price, o_r.quantity, o.order_date
+                FROM order_items o_r
+                JOIN menu_items m ON o_r.item_id = m.item_id
+                JOIN orders o ON o_r.order_id = o.order_id
+                JOIN customers c ON o.customer_id = c.customer_id
+                WHERE o.customer_id = %s
+                ORDER BY o.order_date DESC
+                LIMIT %s
+            """, (customer_id, limit))
+            rows = cursor.fetchall()
+            cursor.close()
+        return rows
+
+
+class DashboardSnapshot:
+    """Everything the dashboard draws for one date range."""
+
+    def __init__(self, key, data):
+        self.key = key
+        self.loaded_at = time.monotonic()
+        self.kpis = data.kpis()
+        self.items = data.item_totals()
+        # freq -> (bucket starts, {kpi: value per bucket}) for the trend chart
+        self.trends = {
+            freq: (data.buckets(freq), {
+                "revenue": data.revenue(freq),
+                "orders": data.order_counts(freq),
+                "average_ticket": data.average_ticket(freq),
+            })
+            for freq in data.freqs
+        }
+
+    def age(self):
+        return time.monotonic() - self.loaded_at
+
+
+class ReportService:
+    def sales(self, days=None):
+        """SalesData for the last days days (None = all time)."""
+        return SalesData.load(*date_range(days))
+
+    def dashboard_snapshot(self, days=None):
+        return DashboardSnapshot(days, self.sales(days))
+
+
+auth_service = AuthService()
+menu_service = MenuService()
+order_service = OrderService()
+report_service = ReportService()
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+from backends import SQLiteBackend  # noqa: E402
+from menu_cache import menu_cache  # noqa: E402
+
+
+@pytest.fixture
+def backend(tmp_path):
+    """A fresh, fully migrated SQLite database behind every service."""
+    backend = SQLiteBackend(str(tmp_path / "foodie.db"))
+    db.set_backend(backend)
+    menu_cache.invalidate()
+    yield backend
+    db.set_backend(None)
+    menu_cache.invalidate()
+
@@ -0,0 +1,31 @@
+import db
+from menu_cache import mark_items_changed
+from services import menu_service
+
+
+def test_cache_drops_deleted_items_and_keeps_new_ones(backend):
+    burger = menu_service.add_item("Burger", "Meals", 99)
+    cola = menu_service.add_item("Cola", "Drinks", 35)
+    assert menu_service.menu_items() == [burger, cola]
+
+    menu_service.delete_item(burger[0])
+    fries = menu_service.add_item("Fries", "Snacks", 49)
+    assert menu_service.menu_items() == [cola, fries]
+
+
+def test_reused_id_survives_its_old_tombstone(backend):
+    burger = menu_service.add_item("Burger", "Meals", 99)
+    assert menu_service.menu_items() == [burger]
+
+    menu_service.delete_item(burger[0])
+    with db.db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO menu_items (item_id, name, category, price) VALUES (%s, 'Fries', 'Snacks', 49)",
+                       (burger[0],))
+        mark_items_changed(cursor, [burger[0]])
+        conn.commit()
+        cursor.close()
+    assert menu_service.menu_items() == [(burger[0], "Fries", "Snacks", 49)]
+
+    menu_service.delete_item(burger[0])
+    assert menu_service.menu_items() == []
@@ -0,0 +1,64 @@
+import json
+from decimal import Decimal
+
+import pytest
+
+import menu_io
+from services import menu_service
+
+
+def test_parse_item_reads_prices_with_the_peso_sign():
+    assert menu_io.parse_item({"name": " Burger ", "category": "", "price": "₱99.50"}, 1) == \
+        ("Burger", None, Decimal("99.50"))
+
+
+@pytest.mark.parametrize("record, message", [
+    ({"category": "Meals", "price": 10}, "name is required"),
+    ({"name": "Burger", "price": "ten"}, "invalid price"),
+    ({"name": "Burger", "price": -1}, "cannot be negative"),
+    (["Burger", 10], "expected an object"),
+])
+def test_parse_item_rejects_bad_records(record, message):
+    with pytest.raises(ValueError, match=message):
+        menu_io.parse_item(record, 3)
+
+
+def test_read_items_handles_csv_json_and_jsonl(tmp_path):
+    rows = [{"name": "Burger", "category": "Meals", "price": "99"}, {"name": "Cola", "category": "Drinks", "price": "35"}]
+    expected = [("Burger", "Meals", Decimal("99")), ("Cola", "Drinks", Decimal("35"))]
+
+    csv_path = tmp_path / "menu.csv"
+    csv_path.write_text("name,category,price\nBurger,Meals,99\nCola,Drinks,35\n", encoding="utf-8")
+    json_path = tmp_path / "menu.json"
+    json_path.write_text(json.dumps(rows), encoding="utf-8")
+    jsonl_path = tmp_path / "menu.jsonl"
+    jsonl_path.write_text("\n".join(json.dumps(row) for row in rows) + "\n\n", encoding="utf-8")
+
+    for path in (csv_path, json_path, jsonl_path):
+        assert list(menu_io.read_items(str(path))) == expected
+    with pytest.raises(ValueError, match="Unsupported"):
+        list(menu_io.read_items(str(tmp_path / "menu.xlsx")))
+
+
+def test_import_updates_items_by_name_and_adds_the_rest(backend, tmp_path):
+    burger = menu_service.add_item("Burger", "Meals", 99)
+    assert menu_service.menu_items() == [burger]
+
+    path = tmp_path / "menu.csv"
+    path.write_text("name,category,price\nBurger,Specials,109\nCola,Drinks,35\n", encoding="utf-8")
+    progress = []
+    assert menu_service.import_file(str(path), progress.append) == 2
+    assert progress[-1] == 2
+
+    items = {name: (item_id, category, price) for item_id, name, category, price in menu_service.menu_items()}
+    assert items["Burger"] == (burger[0], "Specials", 109)
+    assert items["Cola"][1:] == ("Drinks", 35)
+
+
+def test_export_writes_what_import_reads(backend, tmp_path):
+    menu_service.add_item("Burger", "Meals", 99.5)
+    menu_service.add_item("Halo-Halo", None, 120)
+    for name in ("menu.csv", "menu.json", "menu.jsonl"):
+        path = str(tmp_path / name)
+        assert menu_service.export_file(path) == 2
+        assert list(menu_io.read_items(path)) == [("Burger", "Meals", Decimal("99.5")), ("Halo-Halo", None, 120)]
@@ -0,0 +1,35 @@
+from menu_search import MenuSearchIndex, normalize
+
+ITEMS = [
+    (1, "Iced Coffee", "Drinks", 90),
+    (2, "Coffee Jelly", "Desserts", 80),
+    (3, "Hot Coffee", "Drinks", 70),
+    (4, "Toffee Cake", "Desserts", 120),
+    (5, "Crème Brûlée", "Desserts", 150),
+]
+
+
+def test_search_ranks_prefix_then_word_start_then_substring():
+    index = MenuSearchIndex(ITEMS, 1, 2)
+    assert [item[0] for item in index.search("coffee")] == [2, 1, 3]
+    assert [item[0] for item in index.search("offee")] == [1, 2, 3, 4]
+
+
+def test_search_ignores_case_accents_and_punctuation():
+    assert normalize("Crème-Brûlée!") == "creme brulee"
+    index = MenuSearchIndex(ITEMS, 1, 2)
+    assert index.search("CREME brulee") == [ITEMS[4]]
+
+
+def test_search_narrows_by_category_and_counts_facets():
+    index = MenuSearchIndex(ITEMS, 1, 2)
+    assert [item[0] for item in index.search("coffee", "Drinks")] == [1, 3]
+    assert index.facet_counts("coffee") == {"Drinks": 2, "Desserts": 1}
+    assert index.search("") == ITEMS
+
+
+def test_extending_a_query_rechecks_the_previous_hits():
+    index = MenuSearchIndex(ITEMS, 1, 2)
+    index.search("cof")
+    assert index.search("coffee j") == [ITEMS[1]]
+    assert index.search("cake") == [ITEMS[3]]
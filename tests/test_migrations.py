@@ -0,0 +1,111 @@
+import sqlite3
+import threading
+
+import pytest
+
+import migrations
+from backends import SQLiteBackend
+from migrations import LATEST_VERSION, MigrationError
+
+
+def migrate_to(path, version, monkeypatch):
+    """Create path with only the migrations up to version applied."""
+    every = migrations.MIGRATIONS
+    monkeypatch.setattr(migrations, "MIGRATIONS", [m for m in every if m[0] <= version])
+    SQLiteBackend(path).connect().close()
+    monkeypatch.setattr(migrations, "MIGRATIONS", every)
+
+
+def applied(path):
+    with sqlite3.connect(path) as raw:
+        return [row[0] for row in raw.execute("SELECT version FROM schema_migrations ORDER BY version")]
+
+
+def test_duplicate_names_stop_the_unique_index(tmp_path, monkeypatch):
+    path = str(tmp_path / "foodie.db")
+    migrate_to(path, 2, monkeypatch)
+    with sqlite3.connect(path) as raw:
+        raw.executemany("INSERT INTO menu_items (name, category, price) VALUES (?, ?, ?)", [
+            ("Burger", "Meals", 99), ("Burger", "Meals", 109), ("Fries", "Snacks", 49),
+            ("Fries", "Snacks", 49), ("Cola", "Drinks", 35),
+        ])
+
+    with pytest.raises(MigrationError) as err:
+        SQLiteBackend(path).connect()
+    assert "Burger (2 rows)" in str(err.value)
+    assert "Fries (2 rows)" in str(err.value)
+    assert "Cola" not in str(err.value)
+    assert applied(path) == [1, 2]
+
+    with sqlite3.connect(path) as raw:
+        raw.execute("UPDATE menu_items SET name = 'Burger Deluxe' WHERE price = 109")
+        raw.execute("DELETE FROM menu_items WHERE item_id = (SELECT MAX(item_id) FROM menu_items WHERE name = 'Fries')")
+    SQLiteBackend(path).connect().close()
+    assert applied(path)[-1] == LATEST_VERSION
+
+
+def test_new_database_gets_every_migration(tmp_path):
+    path = str(tmp_path / "foodie.db")
+    SQLiteBackend(path).connect().close()
+    assert applied(path) == [version for version, _, _ in migrations.MIGRATIONS]
+
+
+def test_database_from_before_migrations_is_upgraded_in_place(tmp_path, monkeypatch):
+    # Older builds created the base tables without recording any version
+    path = str(tmp_path / "foodie.db")
+    migrate_to(path, 1, monkeypatch)
+    with sqlite3.connect(path) as raw:
+        raw.execute("DROP TABLE schema_migrations")
+        raw.execute("INSERT INTO menu_items (name, category, price) VALUES ('Burger', 'Meals', 100)")
+        raw.execute("INSERT INTO orders (order_date, status, total_amount) VALUES ('2026-10-01 12:15:00', 'Completed', 250)")
+        raw.execute("INSERT INTO orders (order_date, status, total_amount) VALUES ('2026-10-01 13:00:00', 'Cancelled', 100)")
+        raw.execute("INSERT INTO order_items (order_id, item_id, quantity, subtotal) VALUES (1, 1, 2, 250)")
+        raw.execute("INSERT INTO order_items (order_id, item_id, quantity, subtotal) VALUES (2, 1, 1, 100)")
+
+    SQLiteBackend(path).connect().close()
+    assert applied(path) == [version for version, _, _ in migrations.MIGRATIONS]
+    with sqlite3.connect(path) as raw:
+        assert raw.execute("SELECT unit_price FROM order_items ORDER BY order_id").fetchall() == [(125.0,), (100.0,)]
+        assert raw.execute("SELECT COUNT(*) FROM orders WHERE updated_at IS NULL").fetchone() == (0,)
+        assert raw.execute("SELECT sale_date, order_count, revenue FROM sales_daily").fetchall() == \
+            [("2026-10-01", 1, 250.0)]
+        assert raw.execute("SELECT sale_hour, quantity, revenue FROM sales_item_hourly").fetchall() == \
+            [("2026-10-01 12:00:00", 2, 250.0)]
+
+
+def test_upgrade_from_an_earlier_version_keeps_the_data(tmp_path, monkeypatch):
+    path = str(tmp_path / "foodie.db")
+    migrate_to(path, 8, monkeypatch)
+    with sqlite3.connect(path) as raw:
+        raw.execute("INSERT INTO menu_items (name, category, price) VALUES ('Burger', 'Meals', 100)")
+        raw.execute("INSERT INTO menu_item_deletions (item_id, version) VALUES (7, 3)")
+
+    SQLiteBackend(path).connect().close()
+    assert applied(path)[-1] == LATEST_VERSION
+    with sqlite3.connect(path) as raw:
+        assert raw.execute("SELECT name FROM menu_items").fetchall() == [("Burger",)]
+        # The same id can be tombstoned again at a later version
+        raw.execute("INSERT INTO menu_item_deletions (item_id, version) VALUES (7, 5)")
+        assert raw.execute("SELECT COUNT(*) FROM menu_item_deletions").fetchone() == (2,)
+        assert "idx_orders_date_sales" not in {row[1] for row in raw.execute("PRAGMA index_list(orders)")}
+
+
+def test_terminals_starting_together_apply_each_migration_once(tmp_path):
+    path = str(tmp_path / "foodie.db")
+    errors, ready = [], threading.Barrier(4)
+
+    def start_terminal():
+        backend = SQLiteBackend(path, timeout=30)
+        ready.wait()
+        try:
+            backend.connect().close()
+        except Exception as err:
+            errors.append(err)
+
+    terminals = [threading.Thread(target=start_terminal) for _ in range(4)]
+    for terminal in terminals:
+        terminal.start()
+    for terminal in terminals:
+        terminal.join()
+    assert errors == []
+    assert applied(path) == [version for version, _, _ in migrations.MIGRATIONS]
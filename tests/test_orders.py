@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import db
+from services import menu_service, order_service
+
+
+@pytest.fixture
+def burger(backend):
+    return menu_service.add_item("Burger", "Meals", 100)[0]
+
+
+def place(item_id, quantity=1, price=100.0):
+    total = price * quantity
+    order_service.place_order(None, [(item_id, "Burger", price, quantity)], total, total)
+    with db.db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT MAX(order_id) FROM orders")
+        (order_id,) = cursor.fetchone()
+        cursor.close()
+    return order_id
+
+
+def query(sql, params=()):
+    with db.db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        cursor.close()
+    return rows
+
+
+def execute(sql, params=()):
+    with db.db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        conn.commit()
+        cursor.close()
+
+
+def daily_totals():
+    """(orders, revenue, item quantity) over every day of the rollups."""
+    (orders, revenue), = query("SELECT COALESCE(SUM(order_count), 0), COALESCE(SUM(revenue), 0) FROM sales_daily")
+    (quantity,), = query("SELECT COALESCE(SUM(quantity), 0) FROM sales_item_daily")
+    return orders, revenue, quantity
+
+
+# --- Compare-and-set status changes ---
+def test_only_orders_still_in_the_expected_status_move(burger):
+    first, second = place(burger), place(burger)
+    order_service.set_statuses([("Pending", "Preparing", [first])])
+
+    updated, requested, rows = order_service.set_statuses([("Pending", "Preparing", [first, second])])
+    assert (updated, requested) == (1, 2)
+    assert {row[0]: row[3] for row in rows} == {first: "Preparing", second: "Preparing"}
+
+    updated, _, _ = order_service.set_statuses([("Pending", "Completed", [first])])
+    assert updated == 0
+    assert query("SELECT status FROM orders WHERE order_id = %s", (first,)) == [("Preparing",)]
+
+
+# --- Sales rollups ---
+def test_checkout_adds_the_order_to_the_rollups(burger):
+    place(burger, 2)
+    place(burger, 1)
+    assert daily_totals() == (2, 300, 3)
+
+
+def test_cancelling_takes_the_order_out_of_the_rollups_once(burger):
+    kept, cancelled = place(burger, 1), place(burger, 2)
+
+    assert order_service.set_statuses([("Pending", "Cancelled", [cancelled])])[0] == 1
+    assert daily_totals() == (1, 100, 1)
+    # Already cancelled: the compare-and-set fails and nothing is subtracted twice
+    assert order_service.set_statuses([("Pending", "Cancelled", [cancelled, kept])])[0] == 1
+    assert daily_totals() == (0, 0, 0)
+
+
+def test_restoring_a_cancelled_order_puts_it_back(burger):
+    order_id = place(burger, 3)
+    order_service.set_statuses([("Pending", "Cancelled", [order_id])])
+    order_service.set_statuses([("Cancelled", "Pending", [order_id])])
+    assert daily_totals() == (1, 300, 3)
+    (hourly,), = query("SELECT SUM(order_count) FROM sales_hourly")
+    assert hourly == 1
+
+
+def test_moves_between_live_statuses_leave_the_rollups_alone(burger):
+    order_id = place(burger, 2)
+    order_service.set_statuses([("Pending", "Preparing", [order_id])])
+    order_service.set_statuses([("Preparing", "Completed", [order_id])])
+    assert daily_totals() == (1, 200, 2)
+
+
+# --- Keyset pages ---
+def test_order_pages_walk_every_order_newest_first(burger):
+    ids = [place(burger) for _ in range(7)]
+    # Three orders share a timestamp; ties fall back to the newest order_id
+    noon = datetime(2026, 3, 1, 12, 0)
+    for order_id, minutes in zip(ids, [5, 6, 0, 0, 0, 7, 8]):
+        execute("UPDATE orders SET order_date = %s WHERE order_id = %s", (noon + timedelta(minutes=minutes), order_id))
+
+    seen, after = [], None
+    while True:
+        page = order_service.order_page({"status": None}, after=after, limit=3)
+        seen += [row[0] for row in page]
+        if len(page) < 3:
+            break
+        after = (page[-1][2], page[-1][0])
+
+    assert seen == [ids[6], ids[5], ids[1], ids[0], ids[4], ids[3], ids[2]]
+
+
+def test_order_page_filters_by_status(burger):
+    pending, preparing = place(burger), place(burger)
+    order_service.set_statuses([("Pending", "Preparing", [preparing])])
+    assert [row[0] for row in order_service.order_page({"status": "Pending"})] == [pending]
+    assert [row[0] for row in order_service.order_page({"status": "Preparing"})] == [preparing]
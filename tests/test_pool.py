@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+from db import ConnectionPool, PoolExhausted
+
+
+class FakeConnection:
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+        self.in_transaction = False
+
+    def ping(self, reconnect=False):
+        if not self.alive:
+            raise OSError("server has gone away")
+
+    def rollback(self):
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**settings):
+    opened = []
+
+    def connect():
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    return ConnectionPool(connect, **settings), opened
+
+
+def test_released_connection_is_reused():
+    pool, opened = make_pool()
+    conn = pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
+    assert len(opened) == 1
+
+
+def test_checkout_times_out_when_every_connection_is_in_use():
+    pool, _ = make_pool(max_size=1, checkout_timeout=0.05)
+    pool.acquire()
+    with pytest.raises(PoolExhausted):
+        pool.acquire()
+
+
+def test_waiting_checkout_gets_the_next_released_connection():
+    pool, opened = make_pool(max_size=1, checkout_timeout=5)
+    conn = pool.acquire()
+    threading.Timer(0.05, pool.release, [conn]).start()
+    started = time.monotonic()
+    assert pool.acquire() is conn
+    assert time.monotonic() - started < 5
+    assert len(opened) == 1
+
+
+def test_dead_connection_is_replaced_in_its_own_slot():
+    pool, opened = make_pool(max_size=1, checkout_timeout=0.05)
+    dead = pool.acquire()
+    pool.release(dead)
+    dead.alive = False
+
+    conn = pool.acquire()
+    assert conn is not dead and dead.closed
+    assert pool.stats() == {"open": 1, "idle": 0, "in_use": 1}
+    with pytest.raises(PoolExhausted):
+        pool.acquire()
+
+
+def test_failed_connect_gives_the_slot_back():
+    def connect():
+        raise OSError("refused")
+
+    pool = ConnectionPool(connect, max_size=1)
+    with pytest.raises(OSError):
+        pool.acquire()
+    assert pool.stats()["open"] == 0
+
+
+def test_release_rolls_back_an_open_transaction():
+    pool, _ = make_pool()
+    conn = pool.acquire()
+    conn.in_transaction = True
+    pool.release(conn)
+    assert not conn.in_transaction
@@ -0,0 +1,51 @@
+import gc
+
+import pytest
+
+import db
+import query_stats
+from services import auth_service
+
+
+@pytest.fixture
+def slow_log(backend, tmp_path, monkeypatch):
+    """Log every statement to a temporary file."""
+    path = tmp_path / "slow.log"
+    monkeypatch.setitem(query_stats.QUERY_SETTINGS, "slow_ms", 0)
+    monkeypatch.setitem(query_stats.QUERY_SETTINGS, "log_path", str(path))
+    return path
+
+
+def test_bound_values_stay_out_of_the_log(slow_log, monkeypatch):
+    monkeypatch.setitem(query_stats.QUERY_SETTINGS, "explain", True)
+    auth_service.login("bob", "s3cret")
+    log = slow_log.read_text(encoding="utf-8")
+    assert "params: 2 bound" in log
+    assert "s3cret" not in log and "bob" not in log
+
+
+def test_bound_values_are_logged_when_asked_for(slow_log, monkeypatch):
+    monkeypatch.setitem(query_stats.QUERY_SETTINGS, "log_params", True)
+    auth_service.login("bob", "s3cret")
+    assert "('bob', 's3cret')" in slow_log.read_text(encoding="utf-8")
+
+
+def test_an_unwritable_log_does_not_fail_the_query(slow_log, monkeypatch, tmp_path):
+    monkeypatch.setitem(query_stats.QUERY_SETTINGS, "log_path", str(tmp_path / "missing" / "slow.log"))
+    assert auth_service.login("bob", "s3cret") is None
+
+
+def test_collected_cursor_records_without_touching_the_connection(slow_log, monkeypatch):
+    monkeypatch.setitem(query_stats.QUERY_SETTINGS, "explain", True)
+    monkeypatch.setitem(query_stats.QUERY_SETTINGS, "log_params", True)
+    explained = []
+    monkeypatch.setattr(query_stats.InstrumentedConnection, "explain",
+                        lambda self, sql, params: explained.append(sql) or [])
+    query_stats.query_stats.reset()
+    with db.db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM accounts WHERE username = %s", ("bob",))
+        del cursor
+        gc.collect()
+    assert explained == []
+    assert any("FROM accounts" in row["sql"] for row in query_stats.query_stats.summary())
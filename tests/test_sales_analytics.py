@@ -0,0 +1,100 @@
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+import db
+import sales_rollup
+from sales_analytics import SalesData, bucket_starts, date_range, floor_times, resample
+from services import menu_service, order_service
+
+NOW = datetime(2026, 10, 18, 15, 30)  # a Sunday
+
+
+# --- Resampling ---
+def test_floor_times_starts_weeks_on_monday():
+    times = np.array(["2026-10-18T15:30", "2026-10-12T00:00", "2026-10-11T23:59"], dtype="datetime64[s]")
+    assert floor_times(times, "week").tolist() == [date(2026, 10, 12), date(2026, 10, 12), date(2026, 10, 5)]
+    assert floor_times(times[:1], "hour")[0] == np.datetime64("2026-10-18T15")
+
+
+def test_resample_sums_into_buckets_and_drops_outsiders():
+    buckets = bucket_starts(datetime(2026, 10, 16), datetime(2026, 10, 19), "day")
+    times = np.array(["2026-10-16T09:00", "2026-10-16T20:00", "2026-10-18T12:00", "2026-10-20T08:00"],
+                     dtype="datetime64[s]")
+    assert resample(times, np.array([1.0, 2.0, 4.0, 8.0]), buckets, "day").tolist() == [3.0, 0.0, 4.0]
+
+
+def test_empty_ranges_average_to_zero(backend):
+    data = SalesData.load(*date_range(7, NOW))
+    assert data.average_ticket("day").tolist() == [0.0] * 7
+    assert data.item_series("day") == {}
+
+
+def test_date_range_ends_after_today():
+    assert date_range(7, NOW) == (datetime(2026, 10, 12), datetime(2026, 10, 19))
+    assert date_range(None, NOW) == (None, datetime(2026, 10, 19))
+
+
+# --- Loading from the rollups ---
+@pytest.fixture
+def sales(backend):
+    burger = menu_service.add_item("Burger", "Meals", 100)[0]
+    cola = menu_service.add_item("Cola", "Drinks", 40)[0]
+    orders = [
+        (NOW - timedelta(hours=1), [(burger, 2), (cola, 1)]),
+        (NOW - timedelta(hours=1), [(cola, 1)]),
+        (NOW - timedelta(days=3), [(burger, 1)]),
+        (NOW - timedelta(days=20), [(cola, 3)]),
+        (NOW - timedelta(days=20), [(burger, 5)]),  # cancelled below
+    ]
+    with db.db_connection() as conn:
+        cursor = conn.cursor()
+        for when, lines in orders:
+            total = sum(quantity * (100 if item_id == burger else 40) for item_id, quantity in lines)
+            cursor.execute("INSERT INTO orders (order_date, total_amount) VALUES (%s, %s)", (when, total))
+            order_id = cursor.lastrowid
+            cursor.executemany(
+                "INSERT INTO order_items (order_id, item_id, quantity, unit_price, subtotal) VALUES (%s, %s, %s, %s, %s)",
+                [(order_id, item_id, quantity, 100 if item_id == burger else 40,
+                  quantity * (100 if item_id == burger else 40)) for item_id, quantity in lines]
+            )
+        sales_rollup.rebuild(cursor, backend)
+        conn.commit()
+        cursor.close()
+    order_service.set_statuses([("Pending", "Cancelled", [order_id])])
+
+
+def test_short_ranges_read_the_hourly_rollups(sales):
+    data = SalesData.load(*date_range(7, NOW))
+    assert data.step == "hour" and data.freqs == ["hour", "day", "week"]
+    assert data.kpis() == {"revenue": 380.0, "orders": 3, "average_ticket": pytest.approx(380 / 3)}
+
+    hours = data.buckets("hour")
+    assert len(hours) == 7 * 24
+    revenue = data.revenue("hour")
+    assert revenue[list(hours).index(np.datetime64("2026-10-18T14:00"))] == 280.0
+    assert data.order_counts("day").tolist() == [0, 0, 0, 1, 0, 0, 2]
+    assert data.average_ticket("day")[-1] == 140.0
+
+
+def test_long_ranges_read_the_daily_rollups(sales):
+    data = SalesData.load(*date_range(30, NOW))
+    assert data.step == "day" and data.freqs == ["day", "week"]
+    assert data.kpis()["orders"] == 4
+    assert data.item_totals() == [("Burger", 300.0, 3), ("Cola", 200.0, 5)]
+    assert data.revenue("day").sum() == data.revenue("week").sum() == 500.0
+    assert len(data.buckets("day")) == 30
+    assert data.buckets("week")[0] == np.datetime64("2026-09-14")
+
+
+def test_all_time_starts_at_the_first_sale(sales):
+    data = SalesData.load(*date_range(None, NOW))
+    assert data.buckets("day")[0] == np.datetime64("2026-09-28")
+    # Per-item series are only queried when asked for
+    assert data.series_items == 0
+    series = data.item_series("week", top=2)
+    assert data.series_items == 2
+    assert list(series) == ["Burger", "Cola"]
+    assert series["Cola"].sum() == 200.0
+    assert data.top_items(1) == ["Burger"]
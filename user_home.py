@@ -5,17 +5,16 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont, QIcon, QPixmap
 from PyQt6.QtCore import Qt
-from db import kuha_databse
+from workers import run_query
+from services import order_service
+from main_window import logo_pixmap, navigate, logout
 
 class CustomerHomePage(QWidget):
     def __init__(self, user_data):
         super().__init__()
         self.user_data = user_data
         self.setWindowTitle("Customer Home Page")
-        self.setGeometry(0, 0, 1920, 1080)
-        self.showMaximized()
         self.setStyleSheet("background-color: ##E53935;")
-        self.setWindowIcon(QIcon('Logo (2).png'))
 
         # === Main Layout ===
         main_layout = QHBoxLayout(self)
@@ -30,9 +29,7 @@ class CustomerHomePage(QWidget):
 
         # Logo
         logo = QLabel()
-        pixmap = QPixmap("Logo (2).png")
-        pixmap = pixmap.scaled(210, 190, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        logo.setPixmap(pixmap)
+        logo.setPixmap(logo_pixmap(210, 190))
         logo.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         # Button Styles
@@ -133,72 +130,69 @@ class CustomerHomePage(QWidget):
                 padding: 30px;
             }
         """)
-        activity_layout = QVBoxLayout(activity_frame)
-        activity_layout.setSpacing(15)
+        self.activity_layout = QVBoxLayout(activity_frame)
+        self.activity_layout.setSpacing(15)
 
-        # Fetch recent activity from DB
-        recent_activities = self.fetch_recent_activity()
+        # Fetch recent activity from DB in the background
+        self.load_recent_activity()
+
+        right_layout.addWidget(activity_frame)
+        right_layout.addStretch(1)
+
+        # Combine layouts
+        main_layout.addWidget(sidebar_container, 1)
+        main_layout.addLayout(right_layout, 3)
+
+    def refresh(self):
+        self.load_recent_activity()
+
+    def load_recent_activity(self):
+        self.clear_activity()
+        loading_label = QLabel("Loading recent activity...")
+        loading_label.setFont(QFont("Arial", 16))
+        loading_label.setStyleSheet("color: #AAAAAA;")
+        self.activity_layout.addWidget(loading_label)
+        run_query(self.fetch_recent_activity, self.show_recent_activity, self.on_activity_failed, owner=self)
+
+    def clear_activity(self):
+        for i in reversed(range(self.activity_layout.count())):
+            widget = self.activity_layout.itemAt(i).widget()
+            if widget:
+                widget.setParent(None)
+                widget.deleteLater()
+
+    def show_recent_activity(self, recent_activities):
+        self.clear_activity()
 
         if recent_activities:
             for name, price, quantity, date in recent_activities:
                 label = QLabel(f"🛒 {name} — ₱{price:.2f} - Quantity: {quantity} |  Ordered on: {date}")
                 label.setFont(QFont("Arial", 16))
                 label.setStyleSheet("color: #FFFFFF;")
-                activity_layout.addWidget(label)
+                self.activity_layout.addWidget(label)
         else:
-            no_label = QLabel("No recent activity found.")
-            no_label.setFont(QFont("Arial", 16))
-            no_label.setStyleSheet("color: #AAAAAA;")
-            activity_layout.addWidget(no_label)
+            self.show_activity_message("No recent activity found.")
 
-        right_layout.addWidget(activity_frame)
-        right_layout.addStretch(1)
+    def on_activity_failed(self, e):
+        print("Error fetching recent activity:", e)
+        self.clear_activity()
+        self.show_activity_message("Could not load recent activity.")
 
-        # Combine layouts
-        main_layout.addWidget(sidebar_container, 1)
-        main_layout.addLayout(right_layout, 3)
+    def show_activity_message(self, text):
+        label = QLabel(text)
+        label.setFont(QFont("Arial", 16))
+        label.setStyleSheet("color: #AAAAAA;")
+        self.activity_layout.addWidget(label)
 
+    # Runs on a worker thread
     def fetch_recent_activity(self):
         """Fetch recent customer orders from DB (e.g., last 5 items)."""
-        try:
-            conn = kuha_databse()
-            cursor = conn.cursor()
-            query = """
-                SELECT m.name, m.price, o_r.quantity, o.order_date
-                FROM order_items o_r
-                JOIN menu_items m ON o_r.item_id = m.item_id
-                JOIN orders o ON o_r.order_id = o.order_id
-                JOIN customers c ON o.customer_id = c.customer_id
-                WHERE o.customer_id = %s
-                ORDER BY o.order_date DESC
-                LIMIT 5
-            """
-            cursor.execute(query, (self.user_data.get("customer_id"),))
-            return cursor.fetchall()
-        except Exception as e:
-            print("Error fetching recent activity:", e)
-            return []
-        finally:
-            try:
-                if conn.is_connected():
-                    conn.close()
-            except:
-                pass
-            
+        return order_service.recent_items(self.user_data.get("customer_id"))
+
     def logout(self):
-        from login import Login
-        self.logout = Login()
-        self.logout.showMaximized()
-        self.close()
+        logout(self)
 
     def open_pos(self):
-        from POS import POSPage
-        self.pos_page = POSPage(self.user_data)
-        self.pos_page.showMaximized()
-        self.close()
-        
+        navigate(self, "pos")
     def open_orders(self):
-        from order import CustomerOrders
-        self.orders_page = CustomerOrders(self.user_data)
-        self.orders_page.showMaximized()
-        self.close()
\ No newline at end of file
+        navigate(self, "orders")
\ No newline at end of file
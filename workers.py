@@ -0,0 +1,79 @@
+"""Run blocking database calls on a worker thread and hand results back to Qt.
+
+Usage from a page::
+
+    run_query(self.fetch_rows, self.show_rows, self.show_error, owner=self)
+
+``fetch_rows`` runs on a QThreadPool thread and must not touch widgets.
+``show_rows`` / ``show_error`` are delivered on the GUI thread through Qt
+signals, and skipped if ``owner`` was destroyed in the meantime.
+
+Long jobs can pass ``on_progress``; the worker function then receives a
+``progress`` keyword it may call with any value, delivered the same way.
+"""
+import traceback
+
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from db import POOL_SETTINGS
+
+_thread_pool = None
+_running = set()  # keeps task signals alive until they have been delivered
+
+
+def thread_pool():
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = QThreadPool()
+        # More threads than pooled connections would only queue on the pool
+        _thread_pool.setMaxThreadCount(POOL_SETTINGS["max_size"])
+    return _thread_pool
+
+
+class QuerySignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    progress = pyqtSignal(object)
+
+
+class QueryTask(QRunnable):
+    def __init__(self, fn, args, kwargs):
+        super().__init__()
+        self.setAutoDelete(False)  # we keep the Python side alive in _running
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = QuerySignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(result)
+
+
+def run_query(fn, on_result=None, on_error=None, *args, owner=None, on_progress=None, **kwargs):
+    """Call fn(*args, **kwargs) off the GUI thread; returns the queued task."""
+    task = QueryTask(fn, args, kwargs)
+
+    def deliver(callback, value, done=True):
+        if done:
+            _running.discard(task)
+        if callback is None:
+            return
+        if owner is not None and sip.isdeleted(owner):
+            return
+        callback(value)
+
+    task.signals.finished.connect(lambda result: deliver(on_result, result))
+    task.signals.failed.connect(lambda error: deliver(on_error, error))
+    if on_progress is not None:
+        task.kwargs["progress"] = task.signals.progress.emit
+        task.signals.progress.connect(lambda value: deliver(on_progress, value, done=False))
+    _running.add(task)
+    thread_pool().start(task)
+    return task